@@ -1,46 +1,197 @@
-from flask import Flask, request, render_template
+from flask import Flask, request, render_template, make_response, Response, stream_with_context, jsonify, g
 import os
-import nltk
+import json
+import pstats
+import logging
+import cProfile
+import threading
+import time
+import uuid
 from utils import (
-    text_extraction,
-    information_extraction,
-    skill_extraction,
-    project_extraction,
-    scoring
+    text_cache, bulk, jd_profile, jobs, candidate_index, semantic_index, near_duplicates,
+    embeddings, metrics, models, profiles, resume_analysis, result_cache, taxonomy
 )
+from utils.pipeline import process_upload, analyze_upload, score_analysis, upload_result_key
 
-# Ensure 'punkt' is available
-try:
-    nltk.data.find('tokenizers/punkt_tab')
-except LookupError:
-    nltk.download('punkt_tab')
+# Leveled logging; RESUME_LOG_LEVEL=WARNING (or higher) silences per-request output
+logging.basicConfig(
+    level=os.environ.get('RESUME_LOG_LEVEL', 'INFO').upper(),
+    format='%(asctime)s %(levelname)s %(name)s: %(message)s'
+)
+logger = logging.getLogger('resume_scanner')
 
 # Flask App Setup
 app = Flask(__name__)
-app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16 MB
+app.config['TEXT_CACHE_DIR'] = os.environ.get('RESUME_TEXT_CACHE_DIR', os.path.join('cache', 'text'))
+app.config['TEXT_CACHE_MAX_BYTES'] = 256 * 1024 * 1024  # 256 MB
+app.config['RESULT_CACHE_DIR'] = os.environ.get('RESUME_RESULT_CACHE_DIR', '')  # empty keeps results in memory only
+app.config['RESULT_CACHE_MAX_BYTES'] = 64 * 1024 * 1024  # 64 MB
+# 'sqlite' or 'memory'; memory jobs are only visible to the worker process that took them
+app.config['JOB_QUEUE'] = os.environ.get('RESUME_JOB_QUEUE', 'sqlite')
+app.config['JOB_DB_PATH'] = os.environ.get('RESUME_JOB_DB', os.path.join('cache', 'jobs.sqlite3'))
+app.config['JOB_WORKERS'] = int(os.environ.get('RESUME_JOB_WORKERS', 2))
+app.config['JOB_MAX_PENDING'] = int(os.environ.get('RESUME_JOB_MAX_PENDING', 100))
+app.config['CANDIDATE_INDEX'] = os.environ.get('RESUME_CANDIDATE_INDEX', os.path.join('cache', 'candidates.sqlite3'))
+app.config['SEMANTIC_INDEX'] = os.environ.get('RESUME_SEMANTIC_INDEX', os.path.join('cache', 'semantic'))
+app.config['DUPLICATE_INDEX'] = os.environ.get('RESUME_DUPLICATE_INDEX', os.path.join('cache', 'duplicates.sqlite3'))
+app.config['JD_DIR'] = os.environ.get('RESUME_JD_DIR', os.path.join('cache', 'jd'))  # empty keeps registered JDs in this process
+app.config['ANALYSIS_DIR'] = os.environ.get('RESUME_ANALYSIS_DIR', os.path.join('cache', 'analyses'))  # empty keeps analyses in this process
+app.config['PROFILE_DIR'] = os.environ.get('RESUME_PROFILE_DIR', '')  # set to enable X-Profile dumps
+app.config['WARMUP'] = os.environ.get('RESUME_WARMUP', 'background')  # 'eager', 'background' or 'off'
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc', 'txt'}
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+text_cache.configure(app.config['TEXT_CACHE_DIR'], app.config['TEXT_CACHE_MAX_BYTES'])
+result_cache.configure(app.config['RESULT_CACHE_DIR'], app.config['RESULT_CACHE_MAX_BYTES'])
+candidate_index.configure(app.config['CANDIDATE_INDEX'])
+semantic_index.configure(app.config['SEMANTIC_INDEX'])
+near_duplicates.configure(app.config['DUPLICATE_INDEX'])
+jd_profile.configure(app.config['JD_DIR'])
+resume_analysis.configure(app.config['ANALYSIS_DIR'])
+
+# Model warmup: 'eager' blocks import until models are loaded (pre-fork master),
+# 'background' serves immediately and flips /ready once loading finishes
+if app.config['WARMUP'] == 'eager':
+    models.warmup()
+elif app.config['WARMUP'] == 'background':
+    threading.Thread(target=models.warmup, name='model-warmup', daemon=True).start()
+
+_job_pool = None
+_job_pool_lock = threading.Lock()
+
+# Job queue + worker threads, created on the first async submission
+def get_job_pool():
+    global _job_pool
+    with _job_pool_lock:
+        if _job_pool is None:
+            if app.config['JOB_QUEUE'] == 'sqlite':
+                os.makedirs(os.path.dirname(app.config['JOB_DB_PATH']) or '.', exist_ok=True)
+                queue = jobs.SQLiteJobQueue(app.config['JOB_DB_PATH'], max_pending=app.config['JOB_MAX_PENDING'])
+            else:
+                queue = jobs.InMemoryJobQueue(max_pending=app.config['JOB_MAX_PENDING'])
+            _job_pool = jobs.WorkerPool(queue, workers=app.config['JOB_WORKERS'])
+            _job_pool.start()
+        return _job_pool
+
+# Metrics: cache stats and queue depth are read at scrape time
+CACHE_STATS = {
+    'embedding': embeddings.cache_stats,
+    'jd_profile': jd_profile.cache_stats,
+    'resume_analysis': resume_analysis.cache_stats,
+    'text': lambda: text_cache.get_cache().stats(),
+    'result': lambda: result_cache.get_cache().stats(),
+}
+metrics.REGISTRY.add_collector(
+    'resume_cache_stats',
+    'Size and hit/miss counters of the in-process caches',
+    metrics.cache_collector(CACHE_STATS)
+)
+metrics.REGISTRY.add_collector(
+    'resume_cache_hit_ratio',
+    'Share of lookups each cache answered since this process started',
+    metrics.hit_ratio_collector(CACHE_STATS)
+)
+metrics.REGISTRY.add_collector(
+    'resume_process_memory_bytes',
+    'Memory of this worker process (rss, pss, shared, private)',
+    lambda: [({'kind': kind}, value) for kind, value in models.memory_usage().items()]
+)
+metrics.REGISTRY.add_collector(
+    'resume_model_load_seconds',
+    'Time taken to load each model in this process tree',
+    lambda: [({'model': name}, seconds) for name, seconds in models.load_seconds.items()]
+)
+metrics.REGISTRY.add_collector(
+    'resume_ready_seconds',
+    'Seconds from process start until models were warm',
+    lambda: [({}, models.ready_seconds)] if models.ready_seconds is not None else []
+)
+metrics.REGISTRY.add_collector(
+    'resume_taxonomy_terms',
+    'Skill terms in the taxonomy this worker currently uses',
+    lambda: [({'version': taxonomy.get_taxonomy().version}, len(taxonomy.get_taxonomy().synonym_lookup))]
+)
+metrics.REGISTRY.add_collector(
+    'resume_jobs_pending',
+    'Analysis jobs waiting in the queue',
+    lambda: [({}, _job_pool.queue.pending())] if _job_pool is not None else []
+)
+
+@app.before_request
+def start_request():
+    g.started = time.perf_counter()
+    metrics.IN_FLIGHT.inc()
+
+    # Opt-in cProfile dump of this request, e.g. for one slow resume
+    g.profiler = None
+    if app.config['PROFILE_DIR'] and request.headers.get('X-Profile'):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            logger.warning("Profiler already active; X-Profile ignored for %s", request.path)
+        else:
+            g.profiler = profiler
+
+@app.after_request
+def record_request(response):
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        os.makedirs(app.config['PROFILE_DIR'], exist_ok=True)
+        path = os.path.join(app.config['PROFILE_DIR'], f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}.prof")
+        pstats.Stats(profiler).dump_stats(path)
+        response.headers['X-Profile-Path'] = path
+        logger.info("Profile of %s written to %s", request.path, path)
+
+    metrics.REQUESTS.inc(endpoint=request.endpoint or 'unknown', status=response.status_code)
+    if 'started' in g:
+        logger.info(
+            "%s %s -> %s in %.1f ms", request.method, request.path,
+            response.status_code, (time.perf_counter() - g.started) * 1000
+        )
+    return response
+
+@app.teardown_request
+def finish_request(error=None):
+    if g.pop('started', None) is not None:
+        metrics.IN_FLIGHT.dec()
 
 # Check file type
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+# Scoring responses carry their result key as a strong ETag. A client that
+# resends the same resume and JD with If-None-Match gets a bare 304.
+def not_modified(key):
+    if key not in request.if_none_match:
+        return None
+    response = Response(status=304)
+    response.set_etag(key)
+    return response
+
+def with_etag(response, key):
+    response = make_response(response)
+    response.set_etag(key)
+    return response
+
+# Analysis profile named by the request's 'profile' field; returns (name, error message)
+def requested_analysis_profile(payload):
+    try:
+        return profiles.get_profile((payload.get('profile') or '').strip()).name, None
+    except ValueError as e:
+        return None, str(e)
+
 # Main Route
 @app.route('/', methods=['GET', 'POST'])
 def upload_resume():
     if request.method == 'POST':
-        print("📥 POST request received")
-
         if 'resume' not in request.files:
-            print("❌ No resume file in request")
             return render_template('upload.html', error="No file uploaded")
 
         resume_file = request.files['resume']
         jd_text = request.form.get('jd', '').strip()
 
-        print(f"📄 Resume file: {resume_file.filename}")
-        print(f"📝 JD text (preview): {jd_text[:60]}...")
+        logger.debug("Resume file %s, JD of %d chars", resume_file.filename, len(jd_text))
 
         if resume_file.filename == '':
             return render_template('upload.html', error="No file selected")
@@ -48,102 +199,302 @@ def upload_resume():
         if not jd_text:
             return render_template('upload.html', error="Job description cannot be empty")
 
+        analysis, error = requested_analysis_profile(request.form)
+        if error:
+            return render_template('upload.html', error=error)
+
         if resume_file and allowed_file(resume_file.filename):
+            # Read the resume content straight from memory; a resubmission
+            # the client already holds is answered before any extraction
+            data = resume_file.read()
+            cached = not_modified(upload_result_key(data, resume_file.filename, jd_text, analysis_profile=analysis))
+            if cached is not None:
+                return cached
             try:
-                file_path = os.path.join(app.config['UPLOAD_FOLDER'], resume_file.filename)
-                resume_file.save(file_path)
-                print(f"✅ File saved at {file_path}")
-
-                # Read the resume content
-                resume_text = text_extraction.extract_text(file_path)
-                print("🔍 Starting resume processing...")
-
-                results = process_resume_and_jd(resume_text, jd_text)
-                print("✅ Processing complete, returning results.")
-                return render_template('results.html', results=results)
+                results = process_upload(data, resume_file.filename, jd_text, analysis_profile=analysis)
+                return with_etag(render_template('results.html', results=results), results['result_id'])
 
             except Exception as e:
-                print(f"❌ Exception: {e}")
+                logger.exception("Analysis of %s failed", resume_file.filename)
                 return render_template('upload.html', error=f"Error: {str(e)}")
         else:
-            print("❌ Invalid file type (only PDF, DOCX, DOC, TXT allowed)")
             return render_template('upload.html', error="Invalid file type. Please upload PDF, DOCX, DOC, or TXT.")
 
-    print("🌐 GET request received")
     return render_template('upload.html')
 
-def process_resume_and_jd(resume_text, jd_text):
-    print(f"Type of resume_text: {type(resume_text)}")
-    print(f"Type of jd_text: {type(jd_text)}")
-
-    lines = [line.strip() for line in resume_text.split('\n') if line.strip()]
-    resume_info = information_extraction.extract_information(resume_text, lines)
-    print(f"Type of resume_info: {type(resume_info)}")
-
-    projects = project_extraction.extract_projects(resume_text)
-    print(f"Type of projects: {type(projects)}")
-
-    # 👉 Collect all skills found inside projects
-    project_skills = []
-    for p in projects:
-        project_skills.extend(p["skills"])
-    project_skills = list(set(project_skills))
-    print(f"✅ Skills found in projects: {project_skills}")
-
-    # 👉 Extract direct resume skills too
-    resume_skills = skill_extraction.extract_all_skills(resume_text)
-    print(f"✅ Resume skills (direct): {resume_skills}")
-
-    # 👉 Merge all for fair matching
-    all_resume_skills = list(set(resume_skills + project_skills))
-    print(f"✅ Merged resume skills (text + projects): {all_resume_skills}")
-
-    # 👉 JD skills extraction
-    jd_skills = skill_extraction.extract_jd_skills(jd_text)
-    if not jd_skills:
-        print("⚠️ No JD skills found with extract_jd_skills, fallback to simple extractor...")
-        jd_skills = skill_extraction.extract_skills(jd_text)
-    print(f"✅ Final JD skills: {jd_skills}")
-
-    # 👉 Compare
-    skill_comparison = skill_extraction.compare_skills(all_resume_skills, jd_skills)
-    print(f"✅ Skill comparison: {skill_comparison}")
-
-    # ✅ REQUIRED: Add jd_skills + raw_resume_text to skill_comparison for final scoring
-    skill_comparison["jd_skills"] = jd_skills
-    skill_comparison["raw_resume_text"] = resume_text  # for experience + soft skills detection
-
-    score = scoring.calculate_score(skill_comparison, projects, jd_text)
-    feedback = scoring.generate_feedback(score, skill_comparison["missing_skills"])
-    project_feedback = project_extraction.evaluate_projects_against_jd(projects, jd_text)
-
-    experience = "experience" in resume_text.lower()
-    has_internship_or_achievements = any(
-        word in resume_text.lower() for word in ["internship", "leetcode", "kaggle"]
-    )
-
-    # ✅ Pass them to scoring
-    score = scoring.calculate_score(
-        skill_comparison,
-        projects,
-        jd_text,
-        experience=experience,
-        has_internship_or_achievements=has_internship_or_achievements
-    )
-
-    return {
-        "resume_info": resume_info,
-        "common_skills": skill_comparison["common_skills"],
-        "missing_skills": skill_comparison["missing_skills"],
-        "projects": projects,
-        "score": min(max(score, 0), 100),
-        "feedback": feedback,
-        "project_feedback": project_feedback
+# Bulk Route: one JD against many resumes, streamed back as NDJSON
+@app.route('/bulk', methods=['POST'])
+def bulk_rank():
+    jd_text = request.form.get('jd', '').strip()
+    jd_id = request.form.get('jd_id', '').strip()
+    profile = None
+    if jd_id:
+        profile = jd_profile.get_jd(jd_id)
+        if profile is None:
+            return jsonify(error=f"Unknown jd_id: {jd_id}"), 404
+    elif not jd_text:
+        return jsonify(error="Job description cannot be empty"), 400
+
+    try:
+        top_k = int(request.form.get('top_k', bulk.DEFAULT_TOP_K))
+    except ValueError:
+        return jsonify(error="top_k must be an integer"), 400
+    analysis, error = requested_analysis_profile(request.form)
+    if error:
+        return jsonify(error=error), 400
+    duplicates = request.form.get('duplicates', bulk.DEFAULT_DUPLICATES)
+    if duplicates not in bulk.DUPLICATE_MODES:
+        return jsonify(error=f"duplicates must be one of: {', '.join(bulk.DUPLICATE_MODES)}"), 400
+
+    # Read uploads up front; the request stream is gone once streaming starts
+    uploads = [(f.filename, f.read()) for f in request.files.getlist('resumes') if f.filename]
+    try:
+        resumes = bulk.collect_resumes(uploads)
+    except bulk.BulkInputError as e:
+        return jsonify(error=str(e)), 400
+    if not resumes:
+        return jsonify(error="No PDF, DOCX, DOC or TXT resumes uploaded"), 400
+
+    logger.info("Bulk request: %d resumes, top_k=%d, profile=%s, duplicates=%s",
+                len(resumes), top_k, analysis, duplicates)
+
+    def generate():
+        for record in bulk.rank_resumes(resumes, jd_text, top_k=top_k, jd_profile=profile,
+                                        analysis_profile=analysis, duplicates=duplicates):
+            yield json.dumps(record) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+# JD Registry: compile a JD once, then score resumes against it by ID
+@app.route('/jd', methods=['POST'])
+def register_jd():
+    payload = request.get_json(silent=True) or request.form
+    jd_text = (payload.get('jd') or '').strip()
+    if not jd_text:
+        return jsonify(error="Job description cannot be empty"), 400
+
+    profile = jd_profile.register_jd(jd_text)
+    return jsonify(jd_id=profile.jd_id, skills=profile.skills), 201
+
+@app.route('/jd/<jd_id>/score', methods=['POST'])
+def score_against_jd(jd_id):
+    profile = jd_profile.get_jd(jd_id)
+    if profile is None:
+        return jsonify(error=f"Unknown jd_id: {jd_id}"), 404
+
+    resume_file = request.files.get('resume')
+    if resume_file is None or resume_file.filename == '':
+        return jsonify(error="No file uploaded"), 400
+    if not allowed_file(resume_file.filename):
+        return jsonify(error="Invalid file type. Please upload PDF, DOCX, DOC, or TXT."), 400
+    analysis, error = requested_analysis_profile(request.form)
+    if error:
+        return jsonify(error=error), 400
+
+    data = resume_file.read()
+    cached = not_modified(upload_result_key(data, resume_file.filename, jd_profile=profile, analysis_profile=analysis))
+    if cached is not None:
+        return cached
+    try:
+        results = process_upload(data, resume_file.filename, jd_profile=profile, analysis_profile=analysis)
+    except Exception as e:
+        logger.exception("Analysis of %s failed", resume_file.filename)
+        return jsonify(error=str(e)), 500
+    return with_etag(jsonify(results), results['result_id'])
+
+# Cached scoring result by the result_id returned with it
+@app.route('/results/<result_id>', methods=['GET'])
+def get_result(result_id):
+    results = result_cache.get_cache().get(result_id)
+    if results is None:
+        return jsonify(error=f"Unknown or expired result_id: {result_id}"), 404
+    return with_etag(jsonify(results), result_id).make_conditional(request)
+
+# Async Route: enqueue an analysis and poll /jobs/<job_id> for the result
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    resume_file = request.files.get('resume')
+    jd_text = request.form.get('jd', '').strip()
+
+    if resume_file is None or resume_file.filename == '':
+        return jsonify(error="No file uploaded"), 400
+    if not jd_text:
+        return jsonify(error="Job description cannot be empty"), 400
+    if not allowed_file(resume_file.filename):
+        return jsonify(error="Invalid file type. Please upload PDF, DOCX, DOC, or TXT."), 400
+    analysis, error = requested_analysis_profile(request.form)
+    if error:
+        return jsonify(error=error), 400
+
+    payload = jobs.make_analysis_payload(resume_file.read(), resume_file.filename, jd_text, analysis)
+    try:
+        job_id = get_job_pool().queue.submit(payload)
+    except jobs.QueueFull as e:
+        logger.warning("Job queue full: %s", e)
+        return jsonify(error="Too many pending analyses, retry shortly"), 503, {'Retry-After': '5'}
+
+    return jsonify(job_id=job_id, status=jobs.QUEUED, status_url=f"/jobs/{job_id}"), 202
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job = get_job_pool().queue.get(job_id)
+    if job is None:
+        return jsonify(error=f"Unknown job_id: {job_id}"), 404
+    return jsonify(job)
+
+# Candidate Search: rank previously analyzed resumes against a JD
+# Resolve the JD of a JSON/form request from 'jd_id' or 'jd'; returns (profile, error response)
+def requested_jd_profile(payload):
+    jd_id = (payload.get('jd_id') or '').strip()
+    jd_text = (payload.get('jd') or '').strip()
+    if jd_id:
+        profile = jd_profile.get_jd(jd_id)
+        if profile is None:
+            return None, (jsonify(error=f"Unknown jd_id: {jd_id}"), 404)
+        return profile, None
+    if jd_text:
+        return jd_profile.compile_jd(jd_text), None
+    return None, (jsonify(error="Job description cannot be empty"), 400)
+
+@app.route('/candidates/search', methods=['POST'])
+def search_candidates():
+    index = candidate_index.get_index()
+    if index is None:
+        return jsonify(error="Candidate index is disabled"), 404
+
+    payload = request.get_json(silent=True) or request.form
+    profile, error = requested_jd_profile(payload)
+    if error:
+        return error
+
+    try:
+        top_n = int(payload.get('top_n', candidate_index.DEFAULT_TOP_N))
+    except (TypeError, ValueError):
+        return jsonify(error="top_n must be an integer"), 400
+
+    started = time.perf_counter()
+    candidates = index.search(profile, top_n=top_n)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    return jsonify(jd_id=profile.jd_id, candidates=candidates, elapsed_ms=round(elapsed_ms, 2))
+
+# Semantic Search: nearest resumes to the JD by embedding similarity
+@app.route('/candidates/semantic', methods=['POST'])
+def semantic_candidates():
+    index = candidate_index.get_index()
+    vectors = semantic_index.get_index()
+    if index is None or vectors is None:
+        return jsonify(error="Semantic index is disabled"), 404
+
+    payload = request.get_json(silent=True) or request.form
+    profile, error = requested_jd_profile(payload)
+    if error:
+        return error
+
+    try:
+        top_k = int(payload.get('top_k', candidate_index.DEFAULT_TOP_N))
+    except (TypeError, ValueError):
+        return jsonify(error="top_k must be an integer"), 400
+
+    started = time.perf_counter()
+    candidates = []
+    for candidate_id, similarity in vectors.search(profile.text, top_k=top_k):
+        candidate = index.get(candidate_id)
+        if candidate is not None:
+            candidate["similarity"] = round(similarity, 4)
+            candidates.append(candidate)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    return jsonify(jd_id=profile.jd_id, candidates=candidates, elapsed_ms=round(elapsed_ms, 2))
+
+# Resume Analyses: analyze a resume once, then score it against any number of JDs
+@app.route('/analyses', methods=['POST'])
+def create_analysis():
+    resume_file = request.files.get('resume')
+    if resume_file is None or resume_file.filename == '':
+        return jsonify(error="No file uploaded"), 400
+    if not allowed_file(resume_file.filename):
+        return jsonify(error="Invalid file type. Please upload PDF, DOCX, DOC, or TXT."), 400
+    analysis_name, error = requested_analysis_profile(request.form)
+    if error:
+        return jsonify(error=error), 400
+
+    try:
+        analysis = analyze_upload(resume_file.read(), resume_file.filename, analysis_name)
+    except Exception as e:
+        logger.exception("Analysis of %s failed", resume_file.filename)
+        return jsonify(error=str(e)), 500
+    return jsonify(analysis_id=analysis.analysis_id, analysis=analysis.to_dict()), 201
+
+@app.route('/analyses/<analysis_id>/score', methods=['POST'])
+def score_existing_analysis(analysis_id):
+    analysis = resume_analysis.get_analysis(analysis_id)
+    if analysis is None:
+        return jsonify(error=f"Unknown analysis_id: {analysis_id}"), 404
+
+    # One JD ('jd' / 'jd_id') or several ('jds' / 'jd_ids'), each scored without re-parsing
+    payload = request.get_json(silent=True) or {}
+    jd_ids = payload.get('jd_ids') or []
+    jd_texts = [text for text in payload.get('jds') or [] if text and text.strip()]
+    if not jd_ids and not jd_texts:
+        profile, error = requested_jd_profile(payload)
+        if error:
+            return error
+        cache = result_cache.get_cache()
+        with taxonomy.pinned():
+            key = result_cache.result_key(
+                analysis.analysis_id, profile.jd_id, analysis.profile, taxonomy.get_taxonomy().version
+            )
+            cached = not_modified(key)
+            if cached is not None:
+                return cached
+            results = cache.get(key)
+            if results is None:
+                results = score_analysis(analysis, jd_profile=profile)
+                results["result_id"] = key
+                cache.put(key, results)
+        return with_etag(jsonify(results), key)
+
+    jd_profiles = []
+    for jd_id in jd_ids:
+        profile = jd_profile.get_jd(jd_id)
+        if profile is None:
+            return jsonify(error=f"Unknown jd_id: {jd_id}"), 404
+        jd_profiles.append(profile)
+    jd_profiles.extend(jd_profile.compile_jd(text) for text in jd_texts)
+
+    results = [score_analysis(analysis, jd_profile=profile) for profile in jd_profiles]
+    return jsonify(analysis_id=analysis_id, results=results)
+
+# Readiness: 200 once models are loaded, 503 while still warming up
+@app.route('/ready', methods=['GET'])
+def ready():
+    status = {
+        'ready': models.is_ready(),
+        'pid': os.getpid(),
+        'ready_seconds': models.ready_seconds,
+        'model_load_seconds': models.load_seconds,
+        'memory_bytes': models.memory_usage()
     }
-
-
-
-
+    return jsonify(status), 200 if status['ready'] else 503
+
+# Skill taxonomy: current version, and an explicit reload in this worker
+# (workers also pick up changes to the source file on their own)
+@app.route('/taxonomy', methods=['GET'])
+def taxonomy_status():
+    return jsonify(taxonomy.get_taxonomy().stats())
+
+@app.route('/taxonomy/reload', methods=['POST'])
+def reload_taxonomy():
+    try:
+        current = taxonomy.reload()
+    except (OSError, ValueError) as e:
+        logger.error("Taxonomy reload failed: %s", e)
+        return jsonify({'error': f'Taxonomy reload failed: {e}'}), 500
+    return jsonify(dict(current.stats(), pid=os.getpid()))
+
+# Metrics: Prometheus text format for this process
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,113 @@
+"""
+Word document extraction benchmark: native readers vs textract.
+
+Times ``text_extraction.extract_text_from_bytes`` (in-process DOCX reader,
+pooled DOC conversion) against the previous ``textract.process`` path on
+every .docx/.doc in ``uploads/`` (plus any extra directories), and reports
+per-file p50 latency, the speed-up and whether both paths produce the same
+words. The textract column is skipped when textract is not installed.
+
+    python -m benchmarks.extract_docs
+    python -m benchmarks.extract_docs --repeat 20 --out extract.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+from typing import Callable, Dict, List, Optional
+
+from utils import text_extraction
+
+WORD_EXTENSIONS = (".docx", ".doc")
+
+
+def textract_extract(data: bytes, filename: str) -> str:
+    """The extraction path used before the native readers."""
+    import textract
+    fd, tmp_path = tempfile.mkstemp(suffix=os.path.splitext(filename)[1])
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        return textract.process(tmp_path).decode("utf-8")
+    finally:
+        os.remove(tmp_path)
+
+
+def time_calls(fn: Callable[[], str], repeat: int) -> List[float]:
+    fn()  # first call pays imports and pool start-up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def word_files(directories: List[str]) -> List[str]:
+    paths = []
+    for directory in directories:
+        for name in sorted(os.listdir(directory)):
+            if name.lower().endswith(WORD_EXTENSIONS):
+                paths.append(os.path.join(directory, name))
+    return paths
+
+
+def run(paths: List[str], repeat: int) -> List[Dict]:
+    try:
+        import textract  # noqa: F401
+        have_textract = True
+    except ImportError:
+        have_textract = False
+
+    results = []
+    for path in paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        filename = os.path.basename(path)
+        native_text = text_extraction.extract_text_from_bytes(data, filename)
+        native = time_calls(lambda: text_extraction.extract_text_from_bytes(data, filename), repeat)
+        row = {
+            "file": filename,
+            "bytes": len(data),
+            "chars": len(native_text),
+            "native_p50_ms": statistics.median(native) * 1e3,
+            "textract_p50_ms": None,
+            "speedup": None,
+            "same_words": None,
+        }
+        if have_textract:
+            try:
+                textract_text = textract_extract(data, filename)
+                legacy = time_calls(lambda: textract_extract(data, filename), repeat)
+            except Exception as e:
+                row["textract_error"] = str(e)
+            else:
+                row["textract_p50_ms"] = statistics.median(legacy) * 1e3
+                row["speedup"] = row["textract_p50_ms"] / row["native_p50_ms"]
+                # textract repeats merged table cells, so compare distinct words
+                row["same_words"] = set(native_text.split()) == set(textract_text.split())
+        results.append(row)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark native DOCX/DOC extraction against textract")
+    parser.add_argument("dirs", nargs="*", default=["uploads"], help="directories with .docx/.doc files")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--out", help="write results as JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = run(word_files(args.dirs), args.repeat)
+    out = open(args.out, "w") if args.out else sys.stdout
+    json.dump(results, out, indent=2)
+    out.write("\n")
+    if args.out:
+        out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
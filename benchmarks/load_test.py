@@ -0,0 +1,417 @@
+"""
+End-to-end HTTP load test of the upload route.
+
+Starts the app under gunicorn once per serving configuration, replays
+multipart uploads of a synthetic resume/JD mix against it and reports
+throughput, p50/p95/p99 latency, error rate and the server's RSS over
+time, one entry per configuration, as JSON.
+
+A configuration is ``name:key=value,...`` with keys ``workers``,
+``threads``, ``mode`` (``sync`` posts to ``/``; ``async`` submits to
+``/jobs`` and polls until the job finishes) and ``warmup`` (``warm``
+loads the models before the first request, ``cold`` leaves that to it).
+
+With ``--rate`` requests arrive open-loop as a Poisson process and
+latency is measured from the scheduled arrival, so time spent waiting
+for a free client slot counts; without it ``--concurrency`` clients send
+back to back.
+
+    python -m benchmarks.load_test --duration 60 --concurrency 50 --out load.json
+    python -m benchmarks.load_test --rate 5 --sizes huge --formats pdf --unique
+    python -m benchmarks.load_test --config w2t8:workers=2,threads=8 --config async:workers=2,mode=async
+    python -m benchmarks.load_test --url http://127.0.0.1:5000 --server-pid 1234
+"""
+import os
+import sys
+import json
+import time
+import random
+import socket
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from benchmarks import synthetic
+from benchmarks.run_stages import percentile, git_revision
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_CONFIGS = [
+    "sync-warm:workers=2,threads=4,mode=sync,warmup=warm",
+    "sync-cold:workers=2,threads=4,mode=sync,warmup=cold",
+    "async-warm:workers=2,threads=4,mode=async,warmup=warm",
+]
+CONFIG_DEFAULTS = {"workers": "2", "threads": "4", "mode": "sync", "warmup": "warm"}
+START_TIMEOUT_SECONDS = 300
+REQUEST_TIMEOUT_SECONDS = 300
+JOB_POLL_SECONDS = 0.2
+
+
+def parse_config(spec: str) -> Dict:
+    name, _, options = spec.partition(":")
+    config = dict(CONFIG_DEFAULTS, name=name)
+    for option in filter(None, options.split(",")):
+        key, sep, value = option.partition("=")
+        if not sep or key not in CONFIG_DEFAULTS:
+            raise ValueError(f"Bad option {option!r} in config {spec!r} (keys: {', '.join(CONFIG_DEFAULTS)})")
+        config[key] = value
+    if config["mode"] not in ("sync", "async") or config["warmup"] not in ("warm", "cold"):
+        raise ValueError(f"Bad mode or warmup in config {spec!r}")
+    config["workers"], config["threads"] = int(config["workers"]), int(config["threads"])
+    return config
+
+
+def build_cases(count: int, sizes, formats, jd_count: int, fixtures: bool) -> List[Tuple[str, bytes, str]]:
+    """(filename, bytes, JD) upload cases: every resume paired with every JD."""
+    files = synthetic.corpus(count, sizes=sizes, formats=formats)
+    if fixtures:
+        files += synthetic.fixtures(os.path.join(ROOT, "uploads"))
+    return [(filename, data, jd) for filename, data in files for jd in synthetic.jds(jd_count)]
+
+
+def unique_case(case: Tuple[str, bytes, str], n: int) -> Tuple[str, bytes, str]:
+    """The case with a numbered JD, so the server's result cache cannot answer it."""
+    filename, data, jd = case
+    return filename, data, f"{jd}\nRequisition {n}"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def process_tree_rss(pid: int) -> Optional[int]:
+    """RSS in bytes of ``pid`` and all its descendants, read from /proc (Linux only)."""
+    total, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children") as f:
+                    pending.extend(int(child) for child in f.read().split())
+        except (OSError, ValueError):
+            if current == pid:
+                return None
+    return total
+
+
+class RSSSampler(threading.Thread):
+    """Samples the server's RSS every ``interval`` seconds into ``samples``."""
+
+    def __init__(self, pid: int, interval: float, started: float):
+        super().__init__(name="rss-sampler", daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.started = started
+        self.samples: List[Tuple[float, int]] = []
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.is_set():
+            rss = process_tree_rss(self.pid)
+            if rss is not None:
+                self.samples.append((round(time.monotonic() - self.started, 2), rss))
+            self._done.wait(self.interval)
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+class Server:
+    """The app under gunicorn with one configuration, in a scratch directory."""
+
+    def __init__(self, config: Dict, workdir: str):
+        self.config = config
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        cache = os.path.join(workdir, config["name"])
+        self.env = dict(
+            os.environ,
+            RESUME_BIND=f"127.0.0.1:{self.port}",
+            RESUME_WEB_WORKERS=str(config["workers"]),
+            RESUME_WEB_THREADS=str(config["threads"]),
+            RESUME_WARMUP="eager" if config["warmup"] == "warm" else "off",
+            RESUME_JOB_DB=os.path.join(cache, "jobs.sqlite3"),
+            RESUME_TEXT_CACHE_DIR=os.path.join(cache, "text"),
+            RESUME_CANDIDATE_INDEX=os.path.join(cache, "candidates.sqlite3"),
+            RESUME_SEMANTIC_INDEX=os.path.join(cache, "semantic"),
+            RESUME_DUPLICATE_INDEX=os.path.join(cache, "duplicates.sqlite3"),
+            RESUME_RESULT_CACHE_DIR=os.path.join(cache, "results"),
+            RESUME_TAXONOMY_SNAPSHOT_DIR=os.path.join(cache, "taxonomy"),
+            RESUME_JD_DIR=os.path.join(cache, "jd"),
+            RESUME_ANALYSIS_DIR=os.path.join(cache, "analyses"),
+            RESUME_LOG_LEVEL=os.environ.get("RESUME_LOG_LEVEL", "WARNING"),
+        )
+        self.process: Optional[subprocess.Popen] = None
+        self.started = 0.0
+        self.startup_s: Optional[float] = None
+
+    def start(self) -> None:
+        self.started = time.monotonic()
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:app"],
+            cwd=ROOT, env=self.env
+        )
+        deadline = self.started + START_TIMEOUT_SECONDS
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Server exited with {self.process.returncode} during start-up")
+            try:
+                # Warm servers answer only after the master loaded the models
+                if requests.get(f"{self.url}/metrics", timeout=1).ok:
+                    self.startup_s = time.monotonic() - self.started
+                    return
+            except requests.RequestException:
+                pass
+            time.sleep(0.2)
+        self.stop()
+        raise RuntimeError(f"Server not up after {START_TIMEOUT_SECONDS}s")
+
+    def stop(self) -> None:
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+def send_sync(session: requests.Session, url: str, case: Tuple[str, bytes, str], profile: str) -> Optional[str]:
+    """POST the upload form; returns an error description or None."""
+    filename, data, jd = case
+    response = session.post(
+        f"{url}/", files={"resume": (filename, data)}, data={"jd": jd, "profile": profile},
+        timeout=REQUEST_TIMEOUT_SECONDS
+    )
+    if response.status_code != 200:
+        return f"HTTP {response.status_code}"
+    # Validation and analysis errors re-render the upload form with a 200
+    if b'class="error"' in response.content:
+        return "analysis error"
+    return None
+
+
+def send_async(session: requests.Session, url: str, case: Tuple[str, bytes, str], profile: str) -> Optional[str]:
+    """Submit a job and poll it until it is done or failed."""
+    filename, data, jd = case
+    response = session.post(
+        f"{url}/jobs", files={"resume": (filename, data)}, data={"jd": jd, "profile": profile},
+        timeout=REQUEST_TIMEOUT_SECONDS
+    )
+    if response.status_code != 202:
+        return f"HTTP {response.status_code}"
+    status_url = url + response.json()["status_url"]
+    deadline = time.monotonic() + REQUEST_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(JOB_POLL_SECONDS)
+        job = session.get(status_url, timeout=REQUEST_TIMEOUT_SECONDS)
+        if job.status_code != 200:
+            return f"HTTP {job.status_code} polling job"
+        status = job.json()["status"]
+        if status == "done":
+            return None
+        if status == "failed":
+            return "job failed"
+    return "job timed out"
+
+
+def run_load(
+    url: str,
+    cases: List[Tuple[str, bytes, str]],
+    mode: str,
+    concurrency: int,
+    rate: float,
+    duration: float,
+    profile: str = "",
+    seed: int = 0,
+    unique: bool = False
+) -> List[Dict]:
+    """Drive load for ``duration`` seconds; one record per completed request."""
+    send = send_async if mode == "async" else send_sync
+    rng = random.Random(seed)
+    records = []
+    lock = threading.Lock()
+    local = threading.local()
+    sequence = iter(range(sys.maxsize))
+
+    def one(case, arrived):
+        if unique:
+            case = unique_case(case, next(sequence))
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        try:
+            error = send(session, url, case, profile)
+        except requests.RequestException as e:
+            error = type(e).__name__
+        finished = time.monotonic()
+        with lock:
+            records.append({
+                "at": finished - started,
+                "latency": finished - arrived,
+                "bytes": len(case[1]),
+                "error": error,
+            })
+
+    started = time.monotonic()
+    stop_at = started + duration
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        if rate:
+            arrival = started
+            while True:
+                arrival += rng.expovariate(rate)
+                if arrival >= stop_at:
+                    break
+                time.sleep(max(0.0, arrival - time.monotonic()))
+                pool.submit(one, rng.choice(cases), arrival)
+        else:
+            def client(client_seed):
+                client_rng = random.Random(client_seed)
+                while time.monotonic() < stop_at:
+                    one(client_rng.choice(cases), time.monotonic())
+            for i in range(concurrency):
+                pool.submit(client, seed * 1000 + i)
+    return records
+
+
+def summarize(records: List[Dict], wall_s: float) -> Dict:
+    latencies = [r["latency"] * 1e3 for r in records if r["error"] is None]
+    errors: Dict[str, int] = {}
+    for r in records:
+        if r["error"] is not None:
+            errors[r["error"]] = errors.get(r["error"], 0) + 1
+    return {
+        "requests": len(records),
+        "ok": len(latencies),
+        "error_rate": (len(records) - len(latencies)) / len(records) if records else 0.0,
+        "errors": errors,
+        "throughput_rps": len(latencies) / wall_s if wall_s else 0.0,
+        "upload_mb_per_s": sum(r["bytes"] for r in records if r["error"] is None) / wall_s / 1e6 if wall_s else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": max(latencies, default=0.0),
+        "first_ms": min(records, key=lambda r: r["at"])["latency"] * 1e3 if records else None,
+    }
+
+
+def run_config(config: Dict, cases, args, workdir: str) -> Dict:
+    server = Server(config, workdir)
+    server.start()
+    try:
+        sampler = RSSSampler(server.process.pid, args.sample_interval, server.started)
+        sampler.start()
+        started = time.monotonic()
+        records = run_load(server.url, cases, config["mode"], args.concurrency, args.rate,
+                           args.duration, args.profile, args.seed, args.unique)
+        wall_s = time.monotonic() - started
+        sampler.stop()
+    finally:
+        server.stop()
+    rss = [value for _, value in sampler.samples]
+    return dict(
+        config,
+        startup_s=server.startup_s,
+        **summarize(records, wall_s),
+        rss_peak_bytes=max(rss, default=None),
+        rss_end_bytes=rss[-1] if rss else None,
+        rss_samples=sampler.samples,
+    )
+
+
+def run_external(url: str, server_pid: Optional[int], cases, args) -> Dict:
+    """Load an already running server; RSS is sampled only with ``--server-pid``."""
+    sampler = None
+    if server_pid:
+        sampler = RSSSampler(server_pid, args.sample_interval, time.monotonic())
+        sampler.start()
+    started = time.monotonic()
+    records = run_load(url, cases, args.mode, args.concurrency, args.rate, args.duration,
+                       args.profile, args.seed, args.unique)
+    wall_s = time.monotonic() - started
+    samples = []
+    if sampler is not None:
+        sampler.stop()
+        samples = sampler.samples
+    rss = [value for _, value in samples]
+    return dict(
+        name="external", url=url, mode=args.mode,
+        **summarize(records, wall_s),
+        rss_peak_bytes=max(rss, default=None),
+        rss_end_bytes=rss[-1] if rss else None,
+        rss_samples=samples,
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", action="append", help="serving configuration (repeatable)")
+    parser.add_argument("--url", help="load this running server instead of starting one per config")
+    parser.add_argument("--server-pid", type=int, help="with --url: sample the RSS of this process tree")
+    parser.add_argument("--mode", default="sync", choices=["sync", "async"], help="with --url: request mode")
+    parser.add_argument("--duration", type=float, default=30, help="seconds of load per configuration")
+    parser.add_argument("--concurrency", type=int, default=8, help="client threads")
+    parser.add_argument("--rate", type=float, default=0, help="open-loop arrivals per second (0: closed loop)")
+    parser.add_argument("--count", type=int, default=3, help="synthetic resumes per size")
+    parser.add_argument("--sizes", default="small,medium,huge")
+    parser.add_argument("--formats", default=",".join(synthetic.FORMATS))
+    parser.add_argument("--jds", type=int, default=3)
+    parser.add_argument("--fixtures", action="store_true", help="also upload the sample files in uploads/")
+    parser.add_argument("--profile", default="", help="analysis profile (accurate or fast)")
+    parser.add_argument("--unique", action="store_true",
+                        help="make every JD distinct so no response comes from the result cache")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="seconds between RSS samples")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write the report JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    cases = build_cases(args.count, args.sizes.split(","), args.formats.split(","), args.jds, args.fixtures)
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cases": len(cases),
+            "duration_s": args.duration,
+            "concurrency": args.concurrency,
+            "rate": args.rate or None,
+            "profile": args.profile or None,
+            "unique": args.unique,
+        },
+    }
+    if args.url:
+        report["configs"] = [run_external(args.url.rstrip("/"), args.server_pid, cases, args)]
+    else:
+        configs = [parse_config(spec) for spec in args.config or DEFAULT_CONFIGS]
+        with tempfile.TemporaryDirectory(prefix="load-test-") as workdir:
+            report["configs"] = [run_config(config, cases, args, workdir) for config in configs]
+
+    out = open(args.out, "w") if args.out else sys.stdout
+    json.dump(report, out, indent=2)
+    out.write("\n")
+    if args.out:
+        out.close()
+    for result in report["configs"]:
+        print(
+            f"{result['name']}: {result['throughput_rps']:.1f} req/s, p50 {result['p50_ms']:.0f} ms, "
+            f"p99 {result['p99_ms']:.0f} ms, errors {result['error_rate']:.1%}",
+            file=sys.stderr
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+"""
+Near-duplicate detection benchmark: precision, recall and speed.
+
+Builds a synthetic applicant stream from ``benchmarks.synthetic`` resumes
+with known duplicate families: edited copies (words changed, contact
+details updated, a line added or dropped, sections reordered) and the
+same resume rendered as PDF and DOCX and read back through
+``text_extraction``. Bootcamp-style cohorts share a long block of template
+text but are different people, so they count as non-duplicates.
+
+Resumes are fed one at a time through ``NearDuplicateIndex`` the way bulk
+ingest does (look up, then add) and every flagged match is checked
+against the families. The same stream is also run through a brute-force
+scan of every stored signature and through exact shingle Jaccard, to
+separate LSH misses from MinHash estimation error.
+
+The resumes in ``uploads/`` are checked too: their one real PDF/DOCX pair
+(a different reading order, line wraps and hyphenation, and a few edits)
+must be flagged and no other pair of them may be.
+
+    python -m benchmarks.near_duplicates
+    python -m benchmarks.near_duplicates --originals 20000 --no-exact --out dedup.json
+"""
+import os
+import sys
+import glob
+import json
+import time
+import random
+import argparse
+import tempfile
+import itertools
+import statistics
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from benchmarks import synthetic
+from benchmarks.run_stages import git_revision, percentile
+from utils import near_duplicates, text_extraction
+
+EDITS = ("words", "contact", "add_line", "drop_line", "reorder", "pdf", "docx")
+
+UPLOADS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "uploads")
+# The same resume saved as PDF and as DOCX
+UPLOAD_PAIRS = {frozenset({"AIML RESUME BABYRANI.pdf", "AIML RESUME BABYRANI.docx"})}
+
+
+def edit(text: str, kind: str, rng: random.Random) -> str:
+    """A copy of ``text`` changed the way candidates resubmit resumes."""
+    lines = text.splitlines()
+    if kind == "words":
+        words = text.split(" ")
+        for _ in range(max(1, len(words) // 50)):
+            words[rng.randrange(len(words))] = rng.choice(synthetic.SKILLS)
+        return " ".join(words)
+    if kind == "contact":
+        lines[1] = f"Email: {rng.choice(synthetic.FIRST_NAMES).lower()}{rng.randint(1, 99)}@example.org"
+        lines[2] = f"Phone: +1 555 {rng.randint(1000000, 9999999)}"
+        return "\n".join(lines)
+    if kind == "add_line":
+        at = rng.randrange(5, len(lines))
+        noun, verb = rng.choice(synthetic.PROJECT_NOUNS), rng.choice(synthetic.VERBS)
+        lines.insert(at, f"- {noun}: {verb} a prototype using {rng.choice(synthetic.SKILLS)}.")
+        return "\n".join(lines)
+    if kind == "drop_line":
+        candidates = [i for i, line in enumerate(lines) if line.startswith("- ")]
+        del lines[rng.choice(candidates)]
+        return "\n".join(lines)
+    if kind == "reorder":
+        # Move Education + Achievements above Skills
+        skills, education = lines.index("Skills"), lines.index("Education")
+        return "\n".join(lines[:skills] + lines[education:] + [""] + lines[skills:education])
+    filename = f"copy.{kind}"
+    return text_extraction.extract_text_from_bytes(synthetic.render(text, kind), filename)
+
+
+def cohort_member(template: str, seed: int, size: str) -> str:
+    """A different person's resume pasted into a shared template's summary and projects."""
+    own = synthetic.resume_text(seed, size).splitlines()
+    shared = template.splitlines()
+    projects = shared[shared.index("Projects"):shared.index("Experience")]
+    return "\n".join(own[:own.index("Projects")] + projects + own[own.index("Experience"):])
+
+
+def build_stream(originals: int, duplicate_rate: float, cohort_size: int, seed: int) -> List[Tuple[str, str, str]]:
+    """Shuffled ``(id, family, text)`` items; items of one family are copies of each other."""
+    rng = random.Random(seed)
+    items = []
+    for i in range(originals):
+        size = "medium" if i % 3 == 0 else "small"
+        text = synthetic.resume_text(seed + i, size)
+        items.append((f"r{i}", f"r{i}", text))
+        if rng.random() < duplicate_rate:
+            for kind in rng.sample(EDITS, rng.randint(1, 3)):
+                items.append((f"r{i}-{kind}", f"r{i}", edit(text, kind, rng)))
+    for c in range(max(originals // 50, 1) if cohort_size else 0):
+        template = synthetic.resume_text(seed + 100_000 + c, "medium")
+        for m in range(cohort_size):
+            member = cohort_member(template, seed + 200_000 + c * cohort_size + m, "small")
+            items.append((f"cohort{c}-{m}", f"cohort{c}-{m}", member))
+    rng.shuffle(items)
+    return items
+
+
+def score(flags: List[Tuple[str, Optional[str]]], families: Dict[str, str]) -> Dict:
+    """Precision/recall of ``(id, matched id)`` decisions given each item's family."""
+    seen = set()
+    tp = fp = fn = 0
+    for item, match in flags:
+        family = families[item]
+        has_earlier_copy = family in seen
+        seen.add(family)
+        if match is not None:
+            if families[match] == family:
+                tp += 1
+            else:
+                fp += 1
+        elif has_earlier_copy:
+            fn += 1
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"true_positives": tp, "false_positives": fp, "false_negatives": fn,
+            "precision": precision, "recall": recall, "f1": f1}
+
+
+def upload_pairs(threshold: float, directory: str = UPLOADS_DIR) -> Dict:
+    """Estimated similarity of every pair of sample resumes and whether it was judged correctly."""
+    signatures = {}
+    for path in sorted(glob.glob(os.path.join(directory, "*"))):
+        name = os.path.basename(path)
+        with open(path, "rb") as f:
+            text = text_extraction.extract_text_from_bytes(f.read(), name)
+        signatures[name] = near_duplicates.signature(text)
+    pairs, errors = [], 0
+    for a, b in itertools.combinations(signatures, 2):
+        if signatures[a] is None or signatures[b] is None:
+            continue
+        score = near_duplicates.similarity(signatures[a], signatures[b])
+        duplicate = frozenset({a, b}) in UPLOAD_PAIRS
+        errors += (score >= threshold) != duplicate
+        if duplicate or score >= threshold:
+            pairs.append({"files": [a, b], "similarity": score, "duplicate": duplicate})
+    return {"files": len(signatures), "errors": errors, "pairs": pairs}
+
+
+def summary_ms(timings: List[float]) -> Dict:
+    timings = sorted(timings)
+    return {"p50_ms": percentile(timings, 50) * 1e3, "p95_ms": percentile(timings, 95) * 1e3,
+            "mean_ms": statistics.mean(timings) * 1e3}
+
+
+def run(originals: int, duplicate_rate: float, cohort_size: int, threshold: float, seed: int,
+        exact: bool = True) -> Dict:
+    stream = build_stream(originals, duplicate_rate, cohort_size, seed)
+    families = {item: family for item, family, _ in stream}
+
+    signatures, shingle_sets, signature_times = [], [], []
+    for _, _, text in stream:
+        started = time.perf_counter()
+        signatures.append(near_duplicates.signature(text))
+        signature_times.append(time.perf_counter() - started)
+        if exact:
+            shingle_sets.append(set(near_duplicates.shingles(text).tolist()))
+
+    with tempfile.TemporaryDirectory() as scratch:
+        path = os.path.join(scratch, "duplicates.sqlite3")
+        index = near_duplicates.NearDuplicateIndex(path)
+        lsh_flags, query_times, add_times, candidates = [], [], [], []
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        for position, ((item, _, _), sig) in enumerate(zip(stream, signatures)):
+            keys = list(enumerate(near_duplicates.band_keys(sig)))
+            candidates.append(len({other for key in keys for other in buckets.get(key, ())}))
+            for key in keys:
+                buckets.setdefault(key, []).append(position)
+
+            started = time.perf_counter()
+            match = index.find(sig, threshold)
+            query_times.append(time.perf_counter() - started)
+            lsh_flags.append((item, match.content_key if match else None))
+            started = time.perf_counter()
+            index.add(item, item, sig)
+            add_times.append(time.perf_counter() - started)
+        index_bytes = sum(os.path.getsize(os.path.join(scratch, name)) for name in os.listdir(scratch))
+
+    # Brute force: best estimated similarity against every earlier signature
+    matrix = np.stack(signatures)
+    brute_flags, brute_times = [], []
+    for position, (item, _, _) in enumerate(stream):
+        started = time.perf_counter()
+        best = None
+        if position:
+            agreement = (matrix[:position] == matrix[position]).mean(axis=1)
+            top = int(agreement.argmax())
+            if agreement[top] >= threshold:
+                best = stream[top][0]
+        brute_times.append(time.perf_counter() - started)
+        brute_flags.append((item, best))
+
+    # Exact Jaccard of shingle sets, the quantity MinHash estimates
+    exact_flags = []
+    for position, (item, _, _) in enumerate(stream if exact else []):
+        best, best_score = None, threshold
+        for other in range(position):
+            a, b = shingle_sets[position], shingle_sets[other]
+            jaccard = len(a & b) / len(a | b)
+            if jaccard >= best_score:
+                best, best_score = stream[other][0], jaccard
+        exact_flags.append((item, best))
+
+    return {
+        "revision": git_revision(),
+        "documents": len(stream),
+        "originals": originals,
+        "duplicates": len(stream) - len(set(families.values())),
+        "cohort_members": sum(1 for item, _, _ in stream if item.startswith("cohort")),
+        "threshold": threshold,
+        "signature": {"shingle_words": near_duplicates.SHINGLE_WORDS, "num_perm": near_duplicates.NUM_PERM,
+                      "bands": near_duplicates.BANDS, "rows": near_duplicates.ROWS},
+        "lsh": score(lsh_flags, families),
+        "brute_force_minhash": score(brute_flags, families),
+        "exact_jaccard": score(exact_flags, families) if exact else None,
+        "signature_time": summary_ms(signature_times),
+        "lsh_query_time": summary_ms(query_times),
+        "lsh_add_time": summary_ms(add_times),
+        "brute_force_query_time": summary_ms(brute_times),
+        "lsh_candidates_per_query": statistics.mean(candidates),
+        "index_bytes": index_bytes,
+        "uploads": upload_pairs(threshold),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark MinHash/LSH near-duplicate detection")
+    parser.add_argument("--originals", type=int, default=1000, help="distinct resumes in the stream")
+    parser.add_argument("--duplicate-rate", type=float, default=0.3,
+                        help="fraction of resumes that get 1-3 edited or re-rendered copies")
+    parser.add_argument("--cohort-size", type=int, default=10,
+                        help="resumes per shared-template cohort (one cohort per 50 originals)")
+    parser.add_argument("--threshold", type=float, default=near_duplicates.DEFAULT_THRESHOLD)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-exact", action="store_true",
+                        help="skip the quadratic exact-Jaccard pass on large streams")
+    parser.add_argument("--out", help="write results as JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = run(args.originals, args.duplicate_rate, args.cohort_size, args.threshold, args.seed,
+                  exact=not args.no_exact)
+    out = open(args.out, "w") if args.out else sys.stdout
+    json.dump(results, out, indent=2)
+    out.write("\n")
+    if args.out:
+        out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""
+Per-stage benchmark of the resume pipeline.
+
+Times each stage of ``process_resume_and_jd`` separately over the synthetic
+corpus plus the sample files in ``uploads/``, and writes p50/p95 latency,
+throughput and peak traced memory per stage as JSON. With ``--baseline``
+the run fails (exit code 1) when a stage's p50 regresses by more than
+``--threshold`` compared to the stored baseline.
+
+    python -m benchmarks.run_stages --out bench.json
+    python -m benchmarks.run_stages --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run_stages --baseline benchmarks/baseline.json --threshold 0.2
+    python -m benchmarks.run_stages --profile fast
+"""
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+import tracemalloc
+from typing import Callable, Dict, List
+
+from benchmarks import synthetic
+from utils import (
+    text_extraction,
+    information_extraction,
+    project_extraction,
+    skill_extraction,
+    sections,
+    scoring
+)
+from utils.document import AnalyzedDocument
+from utils.profiles import AnalysisProfile, get_profile
+
+STAGES = [
+    "extract_text",
+    "segment_sections",
+    "extract_information",
+    "extract_projects",
+    "deduplicate_projects",
+    "extract_all_skills",
+    "compare_skills",
+    "calculate_score",
+]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def build_cases(count: int, sizes, formats, jd_count: int, profile: AnalysisProfile) -> List[Dict]:
+    """Precompute every stage's inputs once so each stage can be timed alone."""
+    files = synthetic.corpus(count, sizes=sizes, formats=formats) + synthetic.fixtures()
+    jd_texts = synthetic.jds(jd_count)
+    jd_skill_lists = [skill_extraction.extract_jd_skills(jd) for jd in jd_texts]
+
+    cases = []
+    for i, (filename, data) in enumerate(files):
+        try:
+            text = text_extraction.extract_text_from_bytes(data, filename)
+        except IOError as e:
+            print(f"skipping {filename}: {e}", file=sys.stderr)
+            continue
+        doc = AnalyzedDocument(text, nlp=profile.nlp(), sectioned=True)
+        candidates = project_extraction.find_project_candidates(text, doc=doc)
+        projects = project_extraction.deduplicate_projects(candidates, semantic=profile.semantic_dedup)
+        resume_skills = skill_extraction.extract_all_skills(text, doc=doc, semantic=profile.semantic_skills)
+        for p in projects:
+            resume_skills.extend(p["skills"])
+        jd = jd_texts[i % len(jd_texts)]
+        jd_skills = jd_skill_lists[i % len(jd_texts)]
+        comparison = skill_extraction.compare_skills(resume_skills, jd_skills)
+        comparison["jd_skills"] = jd_skills
+        cases.append({
+            "filename": filename, "data": data, "text": text, "lines": doc.lines,
+            "candidates": candidates, "projects": projects, "resume_skills": resume_skills,
+            "jd": jd, "jd_skills": jd_skills, "comparison": comparison,
+        })
+    return cases
+
+
+def stage_calls(case: Dict, profile: AnalysisProfile) -> Dict[str, Callable[[], object]]:
+    # Stages that read the spaCy Doc get a fresh one, so parsing is included
+    nlp = profile.nlp()
+    return {
+        "extract_text": lambda: text_extraction.extract_text_from_bytes(case["data"], case["filename"]),
+        "segment_sections": lambda: sections.segment(case["text"]),
+        "extract_information": lambda: information_extraction.extract_information(
+            case["text"], case["lines"], doc=AnalyzedDocument(case["text"], nlp=nlp, sectioned=True)),
+        "extract_projects": lambda: project_extraction.extract_projects(
+            case["text"], doc=AnalyzedDocument(case["text"], nlp=nlp, sectioned=True),
+            semantic_dedup=profile.semantic_dedup),
+        "deduplicate_projects": lambda: project_extraction.deduplicate_projects(
+            case["candidates"], semantic=profile.semantic_dedup),
+        "extract_all_skills": lambda: skill_extraction.extract_all_skills(
+            case["text"], doc=AnalyzedDocument(case["text"], nlp=nlp, sectioned=True),
+            semantic=profile.semantic_skills),
+        "compare_skills": lambda: skill_extraction.compare_skills(case["resume_skills"], case["jd_skills"]),
+        "calculate_score": lambda: scoring.calculate_score(
+            case["comparison"], case["projects"], case["jd"], experience=True),
+    }
+
+
+def run(cases: List[Dict], repeat: int, stages: List[str], profile: AnalysisProfile) -> Dict[str, Dict]:
+    results = {}
+    calls = [stage_calls(case, profile) for case in cases]
+    for stage in stages:
+        samples = []
+        for _ in range(repeat):
+            for call in calls:
+                started = time.perf_counter()
+                call[stage]()
+                samples.append(time.perf_counter() - started)
+
+        # Memory is traced in a separate pass; tracemalloc skews timings
+        tracemalloc.start()
+        peak = 0
+        for call in calls:
+            tracemalloc.reset_peak()
+            call[stage]()
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+        total = sum(samples)
+        results[stage] = {
+            "samples": len(samples),
+            "p50_ms": round(percentile(samples, 50) * 1000, 4),
+            "p95_ms": round(percentile(samples, 95) * 1000, 4),
+            "mean_ms": round(statistics.mean(samples) * 1000, 4),
+            "throughput_per_s": round(len(samples) / total, 2) if total else None,
+            "peak_kib": round(peak / 1024, 1),
+        }
+        print(f"{stage:22s} p50 {results[stage]['p50_ms']:9.3f} ms  p95 {results[stage]['p95_ms']:9.3f} ms  "
+              f"{results[stage]['throughput_per_s']} /s  peak {results[stage]['peak_kib']} KiB")
+    return results
+
+
+def compare(current: Dict, baseline: Dict, threshold: float, metric: str) -> List[str]:
+    regressions = []
+    for stage, stats in baseline.get("stages", {}).items():
+        if stage not in current["stages"] or not stats.get(metric):
+            continue
+        before, after = stats[metric], current["stages"][stage][metric]
+        if after > before * (1 + threshold):
+            regressions.append(f"{stage}: {metric} {before:.3f} -> {after:.3f} ms (+{(after / before - 1):.0%})")
+    return regressions
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=3, help="synthetic resumes per size")
+    parser.add_argument("--sizes", default=",".join(synthetic.SIZES))
+    parser.add_argument("--formats", default=",".join(synthetic.FORMATS))
+    parser.add_argument("--jds", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--stages", default=",".join(STAGES))
+    parser.add_argument("--profile", default=None, help="analysis profile (accurate or fast)")
+    parser.add_argument("--out", help="write the report JSON here")
+    parser.add_argument("--save-baseline", help="write the report JSON as a new baseline")
+    parser.add_argument("--baseline", help="compare against this baseline JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression")
+    parser.add_argument("--metric", default="p50_ms", choices=["p50_ms", "p95_ms", "mean_ms"])
+    args = parser.parse_args(argv)
+
+    profile = get_profile(args.profile)
+    cases = build_cases(args.count, args.sizes.split(","), args.formats.split(","), args.jds, profile)
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "documents": len(cases),
+            "repeat": args.repeat,
+            "profile": profile.name,
+        },
+        "stages": run(cases, args.repeat, args.stages.split(","), profile),
+    }
+
+    for path in filter(None, (args.out, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold, args.metric)
+        if regressions:
+            print("Regressions beyond threshold:\n  " + "\n  ".join(regressions), file=sys.stderr)
+            return 1
+        print(f"No stage regressed more than {args.threshold:.0%} on {args.metric}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""
+Deterministic synthetic resumes and job descriptions for benchmarking.
+
+The same seed always produces byte-identical TXT, DOCX and PDF files, so
+timings can be compared across commits. DOCX and PDF are written by hand
+(no python-docx / reportlab needed).
+"""
+import io
+import os
+import random
+import zipfile
+import argparse
+from typing import List, Tuple
+from xml.sax.saxutils import escape
+
+FIRST_NAMES = ["Asha", "Rahul", "Priya", "Daniel", "Mei", "Carlos", "Fatima", "Liam", "Sara", "Kenji"]
+LAST_NAMES = ["Sharma", "Iyer", "Okafor", "Nguyen", "Garcia", "Smith", "Khan", "Rossi", "Tanaka", "Brown"]
+SKILLS = [
+    "Python", "Flask", "Django", "FastAPI", "TensorFlow", "PyTorch", "Keras", "NLP", "Machine Learning",
+    "Deep Learning", "React", "Node.js", "JavaScript", "TypeScript", "HTML", "CSS", "SQL", "MySQL",
+    "PostgreSQL", "MongoDB", "Docker", "Kubernetes", "AWS", "Azure", "GCP", "Git", "Pandas", "NumPy",
+    "scikit-learn", "Hugging Face", "REST API", "GraphQL", "Linux", "CI/CD", "Tailwind", "Firebase"
+]
+SOFT_SKILLS = ["Communication", "Leadership", "Teamwork", "Problem Solving"]
+PROJECT_NOUNS = ["Resume Parser", "Chat Assistant", "Inventory Tracker", "Image Classifier", "Stock Predictor",
+                 "Weather Dashboard", "Recommendation Engine", "Fraud Detector", "Portfolio Site", "Task Planner"]
+VERBS = ["Built", "Developed", "Designed", "Implemented", "Deployed", "Engineered", "Created"]
+COMPANIES = ["Acme Labs", "Nimbus Tech", "BlueOrbit", "DataForge", "Quantix", "Helios Systems"]
+FILLER = ("Collaborated with cross-functional teams to deliver features on schedule and improved "
+          "reliability through careful testing, code review and monitoring of production systems.")
+
+# Number of projects / experience entries / filler paragraphs per size
+SIZES = {
+    "small": (2, 1, 0),
+    "medium": (6, 3, 4),
+    "huge": (60, 25, 600),
+}
+FORMATS = ("txt", "docx", "pdf")
+
+
+def resume_text(seed: int, size: str = "small") -> str:
+    rng = random.Random(seed)
+    n_projects, n_jobs, n_filler = SIZES[size]
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    handle = name.lower().replace(" ", ".")
+    skills = rng.sample(SKILLS, rng.randint(6, 14))
+
+    lines = [
+        name,
+        f"Email: {handle}@example.com",
+        f"Phone: +91 98{rng.randint(10000000, 99999999)}",
+        f"LinkedIn: linkedin.com/in/{handle.replace('.', '-')}",
+        "",
+        "Summary",
+        f"Software engineer with {rng.randint(1, 9)} years of experience in {skills[0]} and {skills[1]}.",
+        "",
+        "Skills",
+        f"Skills: {', '.join(skills)}",
+        f"Tools: {', '.join(rng.sample(SKILLS, 4))}",
+        "",
+        "Projects",
+    ]
+    for _ in range(n_projects):
+        used = rng.sample(skills, min(3, len(skills)))
+        lines.append(f"- {rng.choice(PROJECT_NOUNS)}: {rng.choice(VERBS)} a system using {', '.join(used)}.")
+    lines += ["", "Experience"]
+    for _ in range(n_jobs):
+        lines.append(f"{rng.choice(['Software Engineer', 'ML Engineer', 'Intern'])} at {rng.choice(COMPANIES)}")
+        lines.append(f"- {rng.choice(VERBS)} services with {rng.choice(skills)} and {rng.choice(skills)}.")
+    for _ in range(n_filler):
+        lines.append(FILLER)
+    lines += [
+        "",
+        "Education",
+        "B.Tech in Computer Science, 2022",
+        "",
+        "Achievements",
+        f"- Solved {rng.randint(100, 900)} problems on LeetCode",
+        f"- {rng.choice(SOFT_SKILLS)} award, Kaggle competitions",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def jd_text(seed: int) -> str:
+    rng = random.Random(10_000 + seed)
+    required = rng.sample(SKILLS, rng.randint(4, 8))
+    nice = rng.sample(SKILLS, 3)
+    return "\n".join([
+        f"We are hiring a {rng.choice(['Backend', 'ML', 'Full Stack', 'Data'])} Engineer.",
+        "Requirements:",
+        *[f"- Experience with {skill}" for skill in required],
+        f"Nice to have: {', '.join(nice)}",
+        f"Good {rng.choice(SOFT_SKILLS).lower()} and a B.Tech degree.",
+    ])
+
+
+def to_docx(text: str) -> bytes:
+    """Minimal WordprocessingML package with one paragraph per line."""
+    paragraphs = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>'
+        for line in text.splitlines()
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{paragraphs}</w:body></w:document>"
+    )
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        "</Types>"
+    )
+    rels = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/></Relationships>'
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, body in (("[Content_Types].xml", content_types), ("_rels/.rels", rels),
+                           ("word/document.xml", document)):
+            info = zipfile.ZipInfo(name, date_time=(2024, 1, 1, 0, 0, 0))
+            archive.writestr(info, body, zipfile.ZIP_DEFLATED)
+    return buffer.getvalue()
+
+
+def to_pdf(text: str, lines_per_page: int = 50, width: int = 95) -> bytes:
+    """Minimal single-font PDF, wrapping long lines at ``width`` characters."""
+    wrapped = []
+    for line in text.splitlines():
+        while len(line) > width:
+            cut = line.rfind(" ", 0, width)
+            cut = cut if cut > 0 else width
+            wrapped.append(line[:cut])
+            line = line[cut:].lstrip()
+        wrapped.append(line)
+    pages = [wrapped[i:i + lines_per_page] for i in range(0, len(wrapped), lines_per_page)] or [[]]
+
+    def pdf_string(value: str) -> str:
+        value = value.encode("latin-1", "replace").decode("latin-1")
+        return value.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    objects = [b"", b""]  # 1: catalog, 2: pages tree, filled in below
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")  # 3
+    page_ids = []
+    for page in pages:
+        body = "BT /F1 10 Tf 14 TL 50 760 Td\n" + "".join(f"({pdf_string(l)}) Tj T*\n" for l in page) + "ET"
+        stream = body.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def render(text: str, fmt: str) -> bytes:
+    if fmt == "txt":
+        return text.encode("utf-8")
+    if fmt == "docx":
+        return to_docx(text)
+    if fmt == "pdf":
+        return to_pdf(text)
+    raise ValueError(f"Unknown format: {fmt}")
+
+
+def corpus(count: int = 3, sizes=tuple(SIZES), formats=FORMATS, seed: int = 0) -> List[Tuple[str, bytes]]:
+    """(filename, bytes) for ``count`` resumes of every size in every format."""
+    files = []
+    for size in sizes:
+        for i in range(count):
+            text = resume_text(seed + i, size)
+            for fmt in formats:
+                files.append((f"synthetic_{size}_{i}.{fmt}", render(text, fmt)))
+    return files
+
+
+def jds(count: int = 3, seed: int = 0) -> List[str]:
+    return [jd_text(seed + i) for i in range(count)]
+
+
+def fixtures(directory: str = "uploads") -> List[Tuple[str, bytes]]:
+    """The real sample resumes shipped in ``uploads/``."""
+    files = []
+    if os.path.isdir(directory):
+        for name in sorted(os.listdir(directory)):
+            if name.rsplit(".", 1)[-1].lower() in ("pdf", "docx", "doc", "txt"):
+                with open(os.path.join(directory, name), "rb") as f:
+                    files.append((name, f.read()))
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic resume/JD corpus to disk")
+    parser.add_argument("out", help="output directory")
+    parser.add_argument("--count", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    for filename, data in corpus(args.count, seed=args.seed):
+        with open(os.path.join(args.out, filename), "wb") as f:
+            f.write(data)
+    for i, text in enumerate(jds(args.count, seed=args.seed)):
+        with open(os.path.join(args.out, f"jd_{i}.txt"), "w") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
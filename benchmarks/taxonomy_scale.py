@@ -0,0 +1,91 @@
+"""
+Skill taxonomy scaling benchmark.
+
+Extends the shipped taxonomy with ``--skills`` synthetic skills (each with
+a few synonyms and related skills) and measures JSON compile time,
+snapshot write/load time, snapshot size and matching throughput over the
+synthetic resume corpus, so growth of the vocabulary can be tracked.
+
+    python -m benchmarks.taxonomy_scale --skills 50000
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+from typing import Dict
+
+from benchmarks import synthetic
+from utils import taxonomy
+
+
+def synthetic_taxonomy(skills: int, seed: int = 0) -> Dict:
+    """The shipped taxonomy plus ``skills`` generated entries."""
+    with open(taxonomy.DEFAULT_SOURCE) as f:
+        source = json.load(f)
+    rng = random.Random(seed)
+    names = []
+    for i in range(skills):
+        stem = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 9)))
+        name = f"{stem}{i}"
+        names.append(name)
+        source["synonyms"][name] = [name, f"{name}.js", f"{stem} {i} framework"]
+    for name in rng.sample(names, min(len(names), skills // 4)):
+        source["related"][name] = rng.sample(names, 3)
+    source["known_skills"] = source["known_skills"] + rng.sample(names, min(len(names), skills // 10))
+    return source
+
+
+def run(skills: int, texts) -> Dict:
+    result = {"skills": skills}
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "skill_taxonomy.json")
+        with open(source, "w") as f:
+            json.dump(synthetic_taxonomy(skills), f)
+
+        started = time.perf_counter()
+        compiled = taxonomy.load(source, snapshot_dir=None)
+        result["compile_s"] = time.perf_counter() - started
+
+        path = taxonomy.snapshot_path(compiled.version, tmp)
+        started = time.perf_counter()
+        taxonomy.write_snapshot(compiled, path)
+        result["snapshot_write_s"] = time.perf_counter() - started
+        result["snapshot_bytes"] = os.path.getsize(path)
+
+        started = time.perf_counter()
+        loaded = taxonomy.load(source, snapshot_dir=tmp)
+        result["snapshot_load_s"] = time.perf_counter() - started
+
+    chars = sum(len(t) for t in texts)
+    started = time.perf_counter()
+    for text in texts:
+        loaded.matcher.find_all(text)
+    elapsed = time.perf_counter() - started
+    result["match_mb_per_s"] = chars / elapsed / 1e6 if elapsed else None
+    result.update(loaded.stats())
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark taxonomy compile, snapshot and match at scale")
+    parser.add_argument("--skills", type=int, nargs="+", default=[0, 10000, 50000])
+    parser.add_argument("--count", type=int, default=50, help="synthetic resumes to match")
+    parser.add_argument("--out", help="write results as JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    texts = [synthetic.resume_text(seed, size) for seed in range(args.count) for size in ("small", "huge")]
+    results = [run(skills, texts) for skills in args.skills]
+
+    out = open(args.out, "w") if args.out else sys.stdout
+    json.dump(results, out, indent=2)
+    out.write("\n")
+    if args.out:
+        out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""
+Pre-fork serving:
+
+    gunicorn -c gunicorn.conf.py app:app
+
+The app is imported once in the master with RESUME_WARMUP=eager, so spaCy
+and the sentence model load a single time; workers are forked afterwards
+and share that memory copy-on-write. GET /ready and /metrics report each
+worker's cold start and RSS/PSS.
+"""
+import gc
+import os
+import logging
+import multiprocessing
+
+os.environ.setdefault('RESUME_WARMUP', 'eager')
+
+bind = os.environ.get('RESUME_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('RESUME_WEB_WORKERS', multiprocessing.cpu_count()))
+# Lets the app split per-worker process pools (bulk scoring) across workers
+os.environ['RESUME_WEB_WORKERS'] = str(workers)
+worker_class = 'gthread'
+threads = int(os.environ.get('RESUME_WEB_THREADS', 4))
+preload_app = True
+timeout = 120
+
+# A job submitted to one worker is polled from whichever worker the next
+# request lands on, so several workers need the shared SQLite queue
+if workers > 1 and os.environ.get('RESUME_JOB_QUEUE') == 'memory':
+    raise RuntimeError("RESUME_JOB_QUEUE=memory only works with a single worker (RESUME_WEB_WORKERS=1)")
+
+
+def when_ready(server):
+    # Move the loaded models out of the collector's reach, so a GC pass in
+    # a worker doesn't touch (and un-share) the pages they live on
+    gc.freeze()
+    from utils import models
+    usage = models.memory_usage()
+    server.log.info("Master ready in %.2fs, rss %.0f MiB", models.ready_seconds or 0, usage['rss'] / 2**20)
+
+
+def post_fork(server, worker):
+    from utils import models
+    models.mark_process_start()
+    usage = models.memory_usage()
+    logging.getLogger('resume_scanner').info(
+        "Worker %d forked: rss %.0f MiB, private %.0f MiB",
+        worker.pid, usage['rss'] / 2**20, usage.get('private', usage['rss']) / 2**20
+    )
@@ -0,0 +1,167 @@
+import threading
+import time
+
+import pytest
+
+from utils.batching import MicroBatcher
+
+
+class Recorder:
+    """``run_batch`` that doubles numbers, records batch sizes and can hold the first batch."""
+
+    def __init__(self, fail_on=None):
+        self.batches = []
+        self.fail_on = fail_on
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, items):
+        self.batches.append(list(items))
+        self.release.wait(5)
+        if self.fail_on in items:
+            raise ValueError(f"bad item {self.fail_on}")
+        return [item * 2 for item in items]
+
+
+def submit_all(batcher, items):
+    """Submit each item from its own thread; returns {item: result or exception}."""
+    results = {}
+
+    def submit(item):
+        try:
+            results[item] = batcher.submit(item)
+        except BaseException as e:
+            results[item] = e
+
+    threads = [threading.Thread(target=submit, args=(item,)) for item in items]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def wait_for_queue(batcher, size):
+    deadline = time.monotonic() + 5
+    while len(batcher._queue) < size:
+        assert time.monotonic() < deadline, "waiters never queued"
+        time.sleep(0.001)
+
+
+def join(threads):
+    for thread in threads:
+        thread.join(5)
+        assert not thread.is_alive(), "a waiter was never woken"
+
+
+def test_lone_item_runs_without_waiting_for_the_window():
+    run = Recorder()
+    batcher = MicroBatcher("test", run, window=5.0, max_batch_size=8)
+    started = time.monotonic()
+    assert batcher.submit(21) == 42
+    assert time.monotonic() - started < 1.0
+    assert run.batches == [[21]]
+
+
+def test_zero_window_runs_every_item_on_its_own():
+    run = Recorder()
+    batcher = MicroBatcher("test", run, window=0, max_batch_size=8)
+    assert [batcher.submit(i) for i in range(3)] == [0, 2, 4]
+    assert run.batches == [[0], [1], [2]]
+
+
+def test_items_queued_behind_a_running_batch_share_the_next_one():
+    run = Recorder()
+    run.release.clear()
+    batcher = MicroBatcher("test", run, window=0.05, max_batch_size=8)
+
+    first, first_results = submit_all(batcher, [0])
+    while not run.batches:
+        time.sleep(0.001)
+    rest, results = submit_all(batcher, range(1, 6))
+    wait_for_queue(batcher, 5)
+    run.release.set()
+    join(first + rest)
+
+    assert first_results == {0: 0}
+    assert results == {i: i * 2 for i in range(1, 6)}
+    assert run.batches[0] == [0]
+    assert sorted(run.batches[1]) == [1, 2, 3, 4, 5]
+
+
+def test_batches_are_capped_at_max_batch_size():
+    run = Recorder()
+    run.release.clear()
+    batcher = MicroBatcher("test", run, window=0.05, max_batch_size=3)
+
+    first, _ = submit_all(batcher, [0])
+    while not run.batches:
+        time.sleep(0.001)
+    rest, results = submit_all(batcher, range(1, 8))
+    wait_for_queue(batcher, 7)
+    run.release.set()
+    join(first + rest)
+
+    assert results == {i: i * 2 for i in range(1, 8)}
+    assert all(len(batch) <= 3 for batch in run.batches)
+    assert sum(len(batch) for batch in run.batches) == 8
+
+
+def test_one_failing_item_only_fails_its_own_waiter():
+    run = Recorder(fail_on=3)
+    run.release.clear()
+    batcher = MicroBatcher("test", run, window=0.05, max_batch_size=8)
+
+    first, _ = submit_all(batcher, [0])
+    while not run.batches:
+        time.sleep(0.001)
+    rest, results = submit_all(batcher, range(1, 6))
+    wait_for_queue(batcher, 5)
+    run.release.set()
+    join(first + rest)
+
+    assert isinstance(results.pop(3), ValueError)
+    assert results == {1: 2, 2: 4, 4: 8, 5: 10}
+    # The failed batch of five, then each item retried alone
+    assert sorted(run.batches[1]) == [1, 2, 3, 4, 5]
+    assert sorted(len(batch) for batch in run.batches[2:]) == [1] * 5
+
+
+def test_a_failing_single_item_raises_in_the_caller():
+    batcher = MicroBatcher("test", Recorder(fail_on=7), window=0.05)
+    with pytest.raises(ValueError, match="bad item 7"):
+        batcher.submit(7)
+    assert batcher.submit(1) == 2
+
+
+class Stop(BaseException):
+    pass
+
+
+def test_base_exception_in_the_leader_wakes_every_waiter():
+    release = threading.Event()
+    calls = []
+
+    def run_batch(items):
+        calls.append(list(items))
+        release.wait(5)
+        raise Stop()
+
+    batcher = MicroBatcher("test", run_batch, window=0.05, max_batch_size=8)
+    first, first_results = submit_all(batcher, [0])
+    while not calls:
+        time.sleep(0.001)
+    rest, results = submit_all(batcher, range(1, 4))
+    wait_for_queue(batcher, 3)
+    release.set()
+    join(first + rest)
+
+    assert isinstance(first_results[0], Stop)
+    assert all(isinstance(error, Stop) for error in results.values())
+    # The batcher is usable again afterwards
+    batcher.run_batch = lambda items: [item + 1 for item in items]
+    assert batcher.submit(1) == 2
+
+
+def test_missing_results_become_errors():
+    batcher = MicroBatcher("test", lambda items: [], window=0.05)
+    with pytest.raises(RuntimeError, match="no result"):
+        batcher.submit(1)
@@ -0,0 +1,146 @@
+import threading
+import time
+
+import pytest
+
+from utils.jobs import (
+    DONE, FAILED, QUEUED, RUNNING, InMemoryJobQueue, JobQueue, QueueFull, SQLiteJobQueue, WorkerPool
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def queue(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryJobQueue(max_pending=2)
+    return SQLiteJobQueue(str(tmp_path / "jobs.sqlite3"), max_pending=2, poll_interval=0.01)
+
+
+def sqlite_queue(tmp_path, **kwargs):
+    return SQLiteJobQueue(str(tmp_path / "jobs.sqlite3"), poll_interval=0.01, **kwargs)
+
+
+def on_thread(fn):
+    """Run ``fn`` on its own thread, as another worker would, and return its result."""
+    results = []
+    thread = threading.Thread(target=lambda: results.append(fn()))
+    thread.start()
+    thread.join(5)
+    return results[0]
+
+
+def test_job_queue_is_abstract():
+    with pytest.raises(TypeError):
+        JobQueue()
+
+
+def test_claim_then_complete(queue):
+    job_id = queue.submit({"n": 1})
+    assert queue.get(job_id) == {"job_id": job_id, "status": QUEUED}
+    assert queue.pending() == 1
+
+    assert queue.claim(timeout=1) == (job_id, {"n": 1})
+    assert queue.pending() == 0
+    assert queue.get(job_id)["status"] == RUNNING
+
+    queue.complete(job_id, {"score": 80})
+    assert queue.get(job_id) == {"job_id": job_id, "status": DONE, "result": {"score": 80}}
+
+
+def test_fail_records_the_error(queue):
+    job_id = queue.submit({"n": 1})
+    queue.claim(timeout=1)
+    queue.fail(job_id, "bad resume")
+    assert queue.get(job_id) == {"job_id": job_id, "status": FAILED, "error": "bad resume"}
+
+
+def test_jobs_are_claimed_oldest_first_and_claim_times_out(queue):
+    first = queue.submit({"n": 1})
+    second = queue.submit({"n": 2})
+    assert [queue.claim(timeout=1)[0], queue.claim(timeout=1)[0]] == [first, second]
+    started = time.monotonic()
+    assert queue.claim(timeout=0.05) is None
+    assert time.monotonic() - started < 1
+
+
+def test_submit_rejects_past_max_pending(queue):
+    queue.submit({"n": 1})
+    queue.submit({"n": 2})
+    with pytest.raises(QueueFull):
+        queue.submit({"n": 3})
+    queue.claim(timeout=1)
+    queue.submit({"n": 3})
+
+
+def test_unknown_job_is_none(queue):
+    assert queue.get("missing") is None
+
+
+def test_expired_lease_is_claimed_again(tmp_path):
+    queue = sqlite_queue(tmp_path, lease_seconds=0.05)
+    job_id = queue.submit({"n": 1})
+    assert on_thread(lambda: queue.claim(timeout=1)) == (job_id, {"n": 1})
+    # Still leased: nobody else gets it
+    assert queue.claim(timeout=0) is None
+    time.sleep(0.1)
+    assert queue.claim(timeout=1) == (job_id, {"n": 1})
+
+
+def test_finish_after_losing_the_lease_is_ignored(tmp_path):
+    queue = sqlite_queue(tmp_path, lease_seconds=0.05)
+    job_id = queue.submit({"n": 1})
+    stale = threading.Event()
+    finished = threading.Event()
+
+    def slow_worker():
+        queue.claim(timeout=1)
+        stale.wait(5)
+        queue.complete(job_id, {"worker": "stale"})
+        finished.set()
+
+    thread = threading.Thread(target=slow_worker)
+    thread.start()
+    time.sleep(0.1)
+    assert queue.claim(timeout=1)[0] == job_id
+    stale.set()
+    finished.wait(5)
+    thread.join(5)
+    assert queue.get(job_id)["status"] == RUNNING
+
+    queue.complete(job_id, {"worker": "current"})
+    assert queue.get(job_id)["result"] == {"worker": "current"}
+
+
+def test_job_fails_after_max_attempts(tmp_path):
+    queue = sqlite_queue(tmp_path, lease_seconds=0.02, max_attempts=2)
+    job_id = queue.submit({"n": 1})
+    for _ in range(2):
+        assert on_thread(lambda: queue.claim(timeout=1))[0] == job_id
+        time.sleep(0.05)
+    assert queue.claim(timeout=0) is None
+    assert queue.get(job_id) == {"job_id": job_id, "status": FAILED, "error": "Worker stopped while running this job"}
+
+
+def test_jobs_survive_reopening_the_queue(tmp_path):
+    job_id = sqlite_queue(tmp_path).submit({"n": 1})
+    assert sqlite_queue(tmp_path).claim(timeout=1) == (job_id, {"n": 1})
+
+
+def test_worker_pool_runs_and_fails_jobs(queue):
+    def handler(payload):
+        if payload["n"] < 0:
+            raise ValueError("negative")
+        return {"double": payload["n"] * 2}
+
+    ok = queue.submit({"n": 4})
+    bad = queue.submit({"n": -1})
+    pool = WorkerPool(queue, handler, workers=2)
+    pool.start()
+    try:
+        deadline = time.monotonic() + 5
+        while {queue.get(ok)["status"], queue.get(bad)["status"]} - {DONE, FAILED}:
+            assert time.monotonic() < deadline, "jobs never finished"
+            time.sleep(0.01)
+    finally:
+        pool.stop(timeout=5)
+    assert queue.get(ok) == {"job_id": ok, "status": DONE, "result": {"double": 8}}
+    assert queue.get(bad) == {"job_id": bad, "status": FAILED, "error": "negative"}
@@ -0,0 +1,186 @@
+import os
+import sqlite3
+
+import numpy as np
+import pytest
+
+from utils import near_duplicates, text_extraction
+from utils.near_duplicates import BANDS, NUM_PERM, ROWS, NearDuplicateIndex
+
+UPLOADS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "uploads")
+
+RESUME = """Jane Doe
+Email: jane.doe@example.com
+Phone: +1 555 0100
+
+Summary
+Backend engineer with six years of experience building data pipelines and REST services in Python.
+
+Skills
+Python, Flask, Django, PostgreSQL, Docker, Kubernetes, AWS, Git
+
+Experience
+- Built a resume parser that extracts skills, projects and contact details from PDF and DOCX files.
+- Led the migration of a monolith to containerised services deployed on Kubernetes with zero downtime.
+- Designed a streaming ingestion pipeline that processes two million events per hour with Kafka.
+
+Education
+B.Tech in Computer Science, 2017
+"""
+
+
+def pair_at(similarity: float, rng: np.random.Generator):
+    """Two random signatures agreeing in ``similarity`` of their positions."""
+    a = rng.integers(0, 2**32, size=NUM_PERM, dtype=np.uint64).astype(np.uint32)
+    b = rng.integers(0, 2**32, size=NUM_PERM, dtype=np.uint64).astype(np.uint32)
+    same = rng.choice(NUM_PERM, int(round(similarity * NUM_PERM)), replace=False)
+    b[same] = a[same]
+    return a, b
+
+
+def banding_probability(similarity: float) -> float:
+    """Chance that two signatures of this similarity share at least one band."""
+    return 1 - (1 - similarity ** ROWS) ** BANDS
+
+
+def test_banding_parameters_catch_pairs_at_the_threshold():
+    assert BANDS * ROWS == NUM_PERM
+    assert banding_probability(near_duplicates.DEFAULT_THRESHOLD) > 0.99
+    # Unrelated resumes (about 0.15) rarely become candidates at all
+    assert banding_probability(0.15) < 0.15
+
+
+def test_lsh_recall_at_the_threshold():
+    rng = np.random.default_rng(0)
+    index = NearDuplicateIndex(":memory:")
+    threshold = near_duplicates.DEFAULT_THRESHOLD
+    queries = []
+    for i in range(300):
+        a, b = pair_at(threshold, rng)
+        index.add(f"r{i}", f"r{i}.pdf", a)
+        queries.append((f"r{i}", b))
+
+    found = sum(1 for key, sig in queries if key in {m.content_key for m in index.query(sig, threshold)})
+    assert found / len(queries) >= 0.99
+
+
+def test_pairs_below_the_threshold_are_not_reported():
+    rng = np.random.default_rng(1)
+    index = NearDuplicateIndex(":memory:")
+    for i in range(100):
+        a, b = pair_at(0.4, rng)
+        index.add(f"r{i}", f"r{i}.pdf", a)
+        assert index.find(b, 0.5) is None
+        # Candidates are confirmed with the full signature, not the band hit
+        for match in index.query(b, 0.3):
+            assert match.content_key == f"r{i}"
+            assert match.similarity == pytest.approx(0.4, abs=1 / NUM_PERM)
+
+
+def test_query_ranks_matches_best_first():
+    rng = np.random.default_rng(2)
+    index = NearDuplicateIndex(":memory:")
+    base = rng.integers(0, 2**32, size=NUM_PERM, dtype=np.uint64).astype(np.uint32)
+    for key, agree in (("far", 0.75), ("near", 0.95), ("exact", 1.0)):
+        sig = rng.integers(0, 2**32, size=NUM_PERM, dtype=np.uint64).astype(np.uint32)
+        same = rng.choice(NUM_PERM, int(agree * NUM_PERM), replace=False)
+        sig[same] = base[same]
+        index.add(key, f"{key}.pdf", sig)
+    assert [m.content_key for m in index.query(base, 0.7)] == ["exact", "near", "far"]
+    assert len(index) == 3
+
+
+def test_text_signatures_ignore_formatting_and_catch_edits():
+    original = near_duplicates.signature(RESUME)
+    reformatted = near_duplicates.signature(RESUME.replace("\n- ", "\n• ").replace(", ", " , ").upper())
+    edited = near_duplicates.signature(RESUME.replace("six years", "seven years"))
+    other = near_duplicates.signature(RESUME.replace("Jane Doe", "John Roe").replace(
+        "Backend engineer with six years", "Frontend developer with two years"
+    ).replace("Built a resume parser", "Shipped a design system").replace(
+        "Led the migration of a monolith", "Rebuilt the checkout flow"
+    ).replace("Designed a streaming ingestion pipeline", "Cut page load time in half"))
+
+    assert near_duplicates.similarity(original, reformatted) == 1.0
+    assert near_duplicates.similarity(original, edited) >= near_duplicates.DEFAULT_THRESHOLD
+    assert near_duplicates.similarity(original, other) < near_duplicates.DEFAULT_THRESHOLD
+
+
+def test_normalize_undoes_pdf_layout():
+    assert near_duplicates.normalize("hands-on learn-\ning, Nov\u2013Dec2024") == \
+        near_duplicates.normalize("hands-on learning Nov - Dec 2024") == \
+        ["hands", "learning", "nov", "dec", "2024"]
+
+
+def upload_signature(name):
+    with open(os.path.join(UPLOADS, name), "rb") as f:
+        return near_duplicates.signature(text_extraction.extract_text_from_bytes(f.read(), name))
+
+
+def test_real_pdf_and_docx_of_one_resume_are_duplicates():
+    pdf = upload_signature("AIML RESUME BABYRANI.pdf")
+    docx = upload_signature("AIML RESUME BABYRANI.docx")
+    assert near_duplicates.similarity(pdf, docx) >= near_duplicates.DEFAULT_THRESHOLD
+
+    index = NearDuplicateIndex(":memory:")
+    index.add("aiml-pdf", "AIML RESUME BABYRANI.pdf", pdf)
+    for name in ("SOFTWARE ROLE RESUME BABYRANI.pdf", "s1resume.docx", "s3resume.docx", "sampleresume2.docx"):
+        assert index.find(upload_signature(name)) is None
+    assert index.find(docx).content_key == "aiml-pdf"
+
+
+def test_short_texts_have_no_signature():
+    assert near_duplicates.signature("Jane Doe") is None
+    assert near_duplicates.signature("Jane and the Doe") is None
+    assert near_duplicates.signature("") is None
+
+
+def test_readding_a_resume_keeps_its_first_filename():
+    rng = np.random.default_rng(3)
+    index = NearDuplicateIndex(":memory:")
+    sig, _ = pair_at(0.0, rng)
+    index.add("r1", "s1resume.docx", sig)
+    index.add("r1", "copy.docx", sig)
+    assert index.find(sig) == ("r1", "s1resume.docx", 1.0)
+    assert len(index) == 1
+
+
+def test_bulk_only_indexes_resumes_that_get_scored(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    from utils import bulk, text_cache
+
+    text_cache.configure(str(tmp_path / "text"))
+    index = near_duplicates.configure(str(tmp_path / "duplicates.sqlite3"))
+    edited = RESUME.replace("six years", "seven years").encode()
+    try:
+        with ThreadPoolExecutor(2) as pool:
+            first = list(bulk._find_duplicates(
+                [("s1resume.txt", RESUME.encode()), ("copy.txt", edited), ("same.txt", RESUME.encode())],
+                pool, near_duplicates.DEFAULT_THRESHOLD
+            ))
+            indexed_after_first = len(index)
+            later = list(bulk._find_duplicates([("again.txt", edited)], pool, near_duplicates.DEFAULT_THRESHOLD))
+    finally:
+        near_duplicates.configure(None)
+        text_cache.configure()
+
+    assert first[0] == (0, None)
+    assert first[1][1]["duplicate_of"] == first[2][1]["duplicate_of"] == "s1resume.txt"
+    assert first[1][1]["in_batch"] and first[2][1]["in_batch"]
+    assert indexed_after_first == 1
+    assert later[0][1]["duplicate_of"] == "s1resume.txt"
+    assert not later[0][1]["in_batch"]
+
+
+def test_index_persists_and_resets_on_a_new_signature_version(tmp_path):
+    path = str(tmp_path / "duplicates.sqlite3")
+    sig = near_duplicates.signature(RESUME)
+    NearDuplicateIndex(path).add("r1", "r1.pdf", sig)
+    assert NearDuplicateIndex(path).find(sig).content_key == "r1"
+
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("UPDATE meta SET value = 'old' WHERE key = 'version'")
+    conn.close()
+    index = NearDuplicateIndex(path)
+    assert len(index) == 0
+    assert index.find(sig) is None
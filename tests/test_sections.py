@@ -0,0 +1,98 @@
+import os
+
+import pytest
+import spacy
+
+from utils import text_extraction
+from utils.document import AnalyzedDocument
+from utils.project_extraction import find_project_candidates
+from utils.sections import (
+    ACHIEVEMENTS, EDUCATION, EXPERIENCE, HEADER, OTHER, PROJECTS, SKILLS, heading_kind, segment
+)
+
+UPLOADS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "uploads")
+
+
+@pytest.fixture(scope="module")
+def nlp():
+    # Rule-based sentences are enough to exercise section handling without a trained model
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+
+def upload_text(name):
+    with open(os.path.join(UPLOADS, name), "rb") as f:
+        return text_extraction.extract_text_from_bytes(f.read(), name)
+
+
+@pytest.mark.parametrize("line, kind", [
+    ("TECHNICAL SKILLS", SKILLS),
+    ("Projects:", PROJECTS),
+    ("💼 Work Experience", EXPERIENCE),
+    ("Education History", EDUCATION),
+    ("Work History", EXPERIENCE),
+    ("Awards & Honors", ACHIEVEMENTS),
+    ("  Summary  ", OTHER),
+    ("Skills: Python, SQL", None),
+    ("Built a Flask API for predictions", None),
+    ("Experience with large data sets", None),
+    ("Éducation", None),
+    ("", None),
+])
+def test_heading_kind(line, kind):
+    assert heading_kind(line) == kind
+
+
+def test_segment_covers_the_text_and_merges_repeated_headings():
+    text = "Jane Doe\nSkills\nPython\nTools\nDocker\nProjects\n- Parser\n"
+    sections = segment(text)
+    assert [(s.kind, s.heading) for s in sections] == [(HEADER, ""), (SKILLS, "Skills"), (PROJECTS, "Projects")]
+    assert sections[0].start == 0 and sections[-1].end == len(text)
+    assert all(a.end == b.start for a, b in zip(sections, sections[1:]))
+    assert text[sections[1].body:sections[2].start] == "Python\nTools\nDocker\n"
+
+
+@pytest.mark.parametrize("name, kinds", [
+    ("AIML RESUME BABYRANI.pdf", [HEADER, OTHER, EDUCATION, SKILLS, EXPERIENCE, PROJECTS, ACHIEVEMENTS]),
+    ("SOFTWARE ROLE RESUME BABYRANI.pdf", [HEADER, EXPERIENCE, PROJECTS, ACHIEVEMENTS, SKILLS, EDUCATION]),
+    ("s1resume.docx", [HEADER, EDUCATION, SKILLS, PROJECTS, ACHIEVEMENTS]),
+    ("s3resume.docx", [HEADER, OTHER, SKILLS, PROJECTS, EXPERIENCE, EDUCATION]),
+    ("sample_resume.pdf", [HEADER, OTHER, SKILLS, EDUCATION, PROJECTS]),
+    ("sampleresume2.docx", [HEADER, OTHER, SKILLS, EXPERIENCE, PROJECTS, EDUCATION]),
+])
+def test_sample_resumes_are_segmented(name, kinds):
+    text = upload_text(name)
+    sections = segment(text)
+    assert [s.kind for s in sections] == kinds
+    assert "".join(text[s.start:s.end] for s in sections) == text
+
+
+@pytest.mark.parametrize("name", [
+    "AIML RESUME BABYRANI.pdf", "AIML RESUME BABYRANI.docx", "SOFTWARE ROLE RESUME BABYRANI.pdf", "s1resume.docx",
+])
+def test_project_candidates_come_from_the_focused_sections(nlp, name):
+    text = upload_text(name)
+    doc = AnalyzedDocument(text, nlp=nlp, sectioned=True)
+    focused = doc.focus(SKILLS, PROJECTS, EXPERIENCE)
+    assert focused is not doc
+    assert focused.text == doc.section_text(SKILLS, PROJECTS, EXPERIENCE)
+
+    candidates = find_project_candidates(text, doc=doc)
+    assert candidates
+    assert all(c["name"] in focused.text and c["skills"] for c in candidates)
+    # The focused document was the only one parsed
+    assert doc._doc is None and focused._doc is not None
+
+
+def test_text_without_those_sections_is_read_whole(nlp):
+    text = (
+        "Jane Doe\njane@example.com\n\nEducation\nB.Tech in Computer Science, 2020.\n\n"
+        "Side projects in Python and Flask.\n- Resume parser with Flask and Docker.\n"
+    )
+    doc = AnalyzedDocument(text, nlp=nlp, sectioned=True)
+    assert doc.structured and doc.focus(SKILLS, PROJECTS, EXPERIENCE) is doc
+    # Same as unsectioned text: the "projects" line opens the projects run and is not a project itself
+    expected = find_project_candidates(text, doc=AnalyzedDocument(text, nlp=nlp))
+    assert find_project_candidates(text, doc=doc) == expected
+    assert [c["name"] for c in expected] == ["- Resume parser with Flask and Docker."]
@@ -0,0 +1,31 @@
+import pytest
+
+from utils.skill_extraction import extract_skills
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Must have strong experience with React, TypeScript and Git.", {"react", "typescript", "git"}),
+    ("Looking for a Node developer who knows Express and REST APIs.",
+     {"node.js", "express.js", "rest", "rest api", "api"}),
+    ("You will build ML models and deploy them with Docker on AWS.",
+     {"Machine Learning", "docker", "aws"}),
+    ("Familiarity with JS tooling and TS is a plus; we use Bootstrap for the admin UI.",
+     {"javascript", "typescript", "bootstrap"}),
+])
+def test_jd_prose_keeps_named_skills(text, expected):
+    assert set(extract_skills(text)) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "I would like to express my interest in this role.",
+    "You will mentor the rest of the team and react quickly to incidents.",
+    "Rest assured, we will get back to you soon.",
+    "Express yourself. PY scripts are not needed.",
+])
+def test_ordinary_words_are_not_skills(text):
+    assert extract_skills(text) == []
+
+
+def test_lists_accept_ambiguous_synonyms_in_any_case():
+    skills = extract_skills("Skills: react, express, rest\n- bootstrap")
+    assert {"react", "express.js", "rest", "bootstrap"} <= set(skills)
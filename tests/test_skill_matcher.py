@@ -0,0 +1,65 @@
+import pickle
+
+from utils.skill_matcher import SkillMatcher
+
+
+def spans(matcher, text):
+    return sorted((start, end, pattern) for start, end, pattern in matcher.finditer(text))
+
+
+def test_patterns_are_case_insensitive_and_deduplicated():
+    matcher = SkillMatcher(["Python", "python ", "FLASK", ""])
+    assert matcher.patterns == ["python", "flask"]
+    assert matcher.find_all("Built APIs in PYTHON with Flask.") == {"python", "flask"}
+
+
+def test_match_needs_word_boundaries():
+    matcher = SkillMatcher(["ts", "node", "java", "sql"])
+    assert matcher.find_all("Results with nodes in javascript and mysql") == set()
+    assert matcher.find_all("TS, Node and Java; SQL") == {"ts", "node", "java", "sql"}
+
+
+def test_joined_punctuation_belongs_to_the_word():
+    matcher = SkillMatcher(["js", "node", "node.js", "c", "c++", "c#"])
+    assert matcher.find_all("Node.js services") == {"node.js"}
+    assert matcher.find_all("C++ and C# but not C.") == {"c++", "c#", "c"}
+    # A sentence-ending period does not glue words together
+    assert matcher.find_all("I use node. JS too") == {"node", "js"}
+
+
+def test_overlapping_and_nested_patterns_are_all_reported():
+    matcher = SkillMatcher(["machine learning", "learning", "deep learning", "machine"])
+    assert spans(matcher, "deep learning and machine learning") == [
+        (0, 13, "deep learning"),
+        (5, 13, "learning"),
+        (18, 25, "machine"),
+        (18, 34, "machine learning"),
+        (26, 34, "learning"),
+    ]
+
+
+def test_failure_links_recover_after_a_partial_match():
+    # "he"/"she"/"his"/"hers", the classic Aho-Corasick example; "he" inside
+    # "hers" is glued to the rest of the word
+    matcher = SkillMatcher(["he", "she", "his", "hers"])
+    assert spans(matcher, "ushers") == []
+    assert spans(matcher, "u she hers his") == [(2, 5, "she"), (6, 10, "hers"), (11, 14, "his")]
+
+    matcher = SkillMatcher(["data science", "science fair", "data"])
+    assert spans(matcher, "data science fair") == [
+        (0, 4, "data"), (0, 12, "data science"), (5, 17, "science fair")
+    ]
+    assert spans(matcher, "data scientist at a science fair") == [(0, 4, "data"), (20, 32, "science fair")]
+
+
+def test_repeated_mentions_yield_every_position():
+    matcher = SkillMatcher(["go"])
+    assert [start for start, _, _ in matcher.finditer("Go, go and go-to")] == [0, 4, 11]
+
+
+def test_tables_round_trip_gives_the_same_matches():
+    matcher = SkillMatcher(["python", "node.js", "machine learning", "learning", "c++"])
+    restored = SkillMatcher.from_tables(pickle.loads(pickle.dumps(matcher.tables())))
+    text = "Python, Node.js, C++ and machine learning"
+    assert len(restored) == len(matcher)
+    assert spans(restored, text) == spans(matcher, text)
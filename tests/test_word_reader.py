@@ -0,0 +1,209 @@
+import io
+import struct
+import zipfile
+
+import pytest
+
+from utils import word_reader
+from utils.word_reader import UnsupportedWordDocument
+
+_ENDOFCHAIN = 0xFFFFFFFE
+_FREESECT = 0xFFFFFFFF
+_FATSECT = 0xFFFFFFFD
+_NOSTREAM = 0xFFFFFFFF
+_SECTOR = 512
+_MINI_CUTOFF = 4096
+
+_TEXT_OFFSET = 1024   # where the fixtures put text inside WordDocument, past the FIB
+
+
+def _dir_entry(name: str, kind: int, start: int, size: int, left=_NOSTREAM, right=_NOSTREAM, child=_NOSTREAM):
+    encoded = (name + "\0").encode("utf-16-le") if name else b""
+    return struct.pack(
+        "<64sHBBIII16sIQQIQ",
+        encoded, len(encoded), kind, 1, left, right, child, b"\0" * 16, 0, 0, 0, start, size
+    )
+
+
+def compound_file(streams):
+    """
+    A minimal version 3 compound file holding ``streams`` ({name: bytes}).
+    Streams are padded past the mini-stream cutoff so that everything lives
+    in regular sectors: sector 0 is the FAT, sector 1 the directory.
+    """
+    names = list(streams)
+    data = [streams[name].ljust(_MINI_CUTOFF, b"\0") for name in names]
+    fat = [_FATSECT, _ENDOFCHAIN]
+    starts = []
+    for blob in data:
+        sectors = -(-len(blob) // _SECTOR)
+        starts.append(len(fat))
+        fat.extend(range(len(fat) + 1, len(fat) + sectors))
+        fat.append(_ENDOFCHAIN)
+    assert len(fat) <= _SECTOR // 4
+    fat += [_FREESECT] * (_SECTOR // 4 - len(fat))
+
+    header = struct.pack(
+        "<8s16sHHHHH6sIIIIIIIII",
+        bytes.fromhex("D0CF11E0A1B11AE1"), b"\0" * 16, 0x3E, 3, 0xFFFE, 9, 6, b"\0" * 6,
+        0, 1, 1, 0, _MINI_CUTOFF, _ENDOFCHAIN, 0, _ENDOFCHAIN, 0
+    )
+    header += struct.pack("<109I", 0, *([_FREESECT] * 108))
+
+    # Root -> first stream, the others chained as right siblings
+    entries = [_dir_entry("Root Entry", 5, _ENDOFCHAIN, 0, child=1)]
+    for i, (name, blob, start) in enumerate(zip(names, data, starts), start=1):
+        right = i + 1 if i < len(names) else _NOSTREAM
+        entries.append(_dir_entry(name, 2, start, len(blob), right=right))
+    entries += [_dir_entry("", 0, 0, 0)] * (4 - len(entries) % 4 or 0)
+    directory = b"".join(entries)
+    assert len(directory) == _SECTOR
+
+    body = b"".join(blob.ljust(-(-len(blob) // _SECTOR) * _SECTOR, b"\0") for blob in data)
+    return header + struct.pack(f"<{_SECTOR // 4}I", *fat) + directory + body
+
+
+def piece_table(pieces, prc: bytes = b""):
+    """Clx of ``pieces`` [(cp_start, cp_stop, fc)], optionally preceded by a Prc."""
+    cps = [pieces[0][0]] + [stop for _, stop, _ in pieces]
+    plc = struct.pack(f"<{len(cps)}I", *cps)
+    plc += b"".join(struct.pack("<HIH", 0, fc, 0) for _, _, fc in pieces)
+    clx = b""
+    if prc:
+        clx += struct.pack("<Bh", 0x01, len(prc)) + prc
+    return clx + struct.pack("<BI", 0x02, len(plc)) + plc
+
+
+def word_document(text_bytes: bytes, ccp_text: int, lcb_clx: int, flags: int = 0x0200, nfib: int = 0x00C1):
+    """WordDocument stream: a Word 97 FIB followed by the text at ``_TEXT_OFFSET``."""
+    fib = bytearray(_TEXT_OFFSET)
+    struct.pack_into("<HH", fib, 0, 0xA5EC, nfib)
+    struct.pack_into("<H", fib, 0x0A, flags)
+    pos = 32
+    struct.pack_into("<H", fib, pos, 14)               # csw
+    pos += 2 + 2 * 14
+    struct.pack_into("<H", fib, pos, 22)               # cslw
+    struct.pack_into("<i", fib, pos + 2 + 4 * 3, ccp_text)
+    pos += 2 + 4 * 22
+    struct.pack_into("<H", fib, pos, 93)               # cbRgFcLcb
+    struct.pack_into("<II", fib, pos + 2 + 8 * 33, 0, lcb_clx)   # Clx at the start of the table stream
+    return bytes(fib) + text_bytes
+
+
+def doc_file(pieces_text, ccp_text=None, prc: bytes = b"", flags: int = 0x0200, nfib: int = 0x00C1):
+    """
+    A .doc whose main text is ``pieces_text``, a list of (text, compressed)
+    pieces stored back to back in WordDocument, as cp1252 or UTF-16.
+    """
+    text_bytes, pieces, cp = b"", [], 0
+    for text, compressed in pieces_text:
+        offset = _TEXT_OFFSET + len(text_bytes)
+        if compressed:
+            text_bytes += text.encode("cp1252")
+            fc = (offset * 2) | 0x40000000
+        else:
+            text_bytes += text.encode("utf-16-le")
+            fc = offset
+        pieces.append((cp, cp + len(text), fc))
+        cp += len(text)
+    clx = piece_table(pieces, prc)
+    table_name = "1Table" if flags & 0x0200 else "0Table"
+    word = word_document(text_bytes, cp if ccp_text is None else ccp_text, len(clx), flags, nfib)
+    return compound_file({"WordDocument": word, table_name: clx})
+
+
+def test_read_doc_joins_compressed_and_unicode_pieces():
+    data = doc_file([
+        ("Jane Doe\rPython developer\r", True),
+        ("Café résumé – łódź\r", False),
+        ("Skills\x07Flask\x07\r", True),
+    ])
+    # Cell marks and paragraph marks both end a paragraph
+    assert word_reader.read_doc(data) == "Jane Doe\n\nPython developer\n\nCafé résumé – łódź\n\nSkills\n\nFlask"
+
+
+def test_compressed_piece_fc_is_a_byte_offset_times_two():
+    # The same text stored both ways reads back identically
+    compressed = word_reader.read_doc(doc_file([("Senior engineer, 5 years\r", True)]))
+    unicode = word_reader.read_doc(doc_file([("Senior engineer, 5 years\r", False)]))
+    assert compressed == unicode == "Senior engineer, 5 years"
+
+
+def test_cp1252_specific_characters_in_compressed_pieces():
+    text = "“Quoted” • bullet €5k\r"
+    assert word_reader.read_doc(doc_file([(text, True)])) == text.strip()
+
+
+def test_text_past_ccp_text_is_not_main_text():
+    # Footnotes and headers follow the main text in the same pieces
+    data = doc_file([("Main body\r", True), ("Header text\r", False)], ccp_text=len("Main body\r") + 4)
+    assert word_reader.read_doc(data) == "Main body\n\nHead"
+    data = doc_file([("Main body\r", True), ("Header text\r", False)], ccp_text=len("Main body\r"))
+    assert word_reader.read_doc(data) == "Main body"
+
+
+def test_property_modifiers_before_the_piece_table_are_skipped():
+    data = doc_file([("After a Prc\r", False)], prc=b"\x01\x02\x03\x04\x05")
+    assert word_reader.read_doc(data) == "After a Prc"
+
+
+def test_field_instructions_are_dropped_and_results_kept():
+    text = 'See \x13 HYPERLINK "https://example.org" \x14my site\x15 and \x13 PAGE \x15done\r'
+    assert word_reader.read_doc(doc_file([(text, True)])) == "See my site and done"
+
+
+def test_special_characters_are_translated():
+    text = "co\x1eoperate\x0bnext\x1fline\x01\x08\x0cpage two\r"
+    assert word_reader.read_doc(doc_file([(text, False)])) == "co-operate\n\nnextline\n\npage two"
+
+
+def test_zero_table_stream_is_used_when_fwhichtblstm_is_clear():
+    assert word_reader.read_doc(doc_file([("From 0Table\r", True)], flags=0)) == "From 0Table"
+
+
+def test_max_chars_cuts_the_text():
+    assert word_reader.read_doc(doc_file([("Python developer\r", True)]), max_chars=6) == "Python"
+
+
+@pytest.mark.parametrize("kwargs, message", [
+    ({"flags": 0x0200 | 0x0100}, "Encrypted"),
+    ({"nfib": 0x0065}, "Word 97"),
+])
+def test_unsupported_documents_are_rejected(kwargs, message):
+    with pytest.raises(UnsupportedWordDocument, match=message):
+        word_reader.read_doc(doc_file([("text\r", True)], **kwargs))
+
+
+def test_non_ole_input_is_rejected():
+    with pytest.raises(UnsupportedWordDocument):
+        word_reader.read_doc(b"%PDF-1.4 not a word file" * 40)
+
+
+def test_missing_word_document_stream_is_rejected():
+    with pytest.raises(UnsupportedWordDocument, match="WordDocument"):
+        word_reader.read_doc(compound_file({"Other": b"x"}))
+
+
+def test_unexpected_clx_entry_is_rejected():
+    with pytest.raises(UnsupportedWordDocument, match="Clx"):
+        list(word_reader._doc_pieces(b"", b"\x05\x00\x00", 0, 0, 3))
+    with pytest.raises(UnsupportedWordDocument, match="piece table"):
+        list(word_reader._doc_pieces(b"", b"", 0, 0, 0))
+
+
+def test_read_docx_streams_paragraphs_in_order():
+    w = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    document = (
+        f'<w:document {w}><w:body>'
+        '<w:p><w:r><w:t>Jane</w:t></w:r><w:r><w:tab/><w:t>Doe</w:t></w:r></w:p>'
+        '<w:tbl><w:tr><w:tc><w:p><w:r><w:t>Python</w:t></w:r></w:p></w:tc></w:tr></w:tbl>'
+        '<w:p><w:r><w:t>a</w:t><w:br/><w:t>b</w:t></w:r></w:p>'
+        '</w:body></w:document>'
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", document)
+    data = buffer.getvalue()
+    assert list(word_reader.iter_docx_paragraphs(data)) == ["Jane\tDoe", "Python", "a\nb"]
+    assert word_reader.read_docx(data) == "Jane\tDoe\n\nPython\n\na\nb"
+    assert word_reader.read_docx(data, max_chars=4) == "Jane"
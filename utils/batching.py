@@ -0,0 +1,181 @@
+import os
+import time
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.metrics import BATCH_QUEUE_SECONDS, BATCH_SIZE, count_inference
+
+logger = logging.getLogger(__name__)
+
+# How long the first request of a batch waits for others to join it; 0 runs
+# every call on its own, as before batching existed
+BATCH_WINDOW_MS = float(os.environ.get('RESUME_BATCH_WINDOW_MS', '5'))
+MAX_BATCH_SIZE = int(os.environ.get('RESUME_BATCH_MAX_SIZE', '16'))
+
+
+_PENDING = object()
+
+
+class _Waiter:
+    __slots__ = ("item", "enqueued", "result", "error", "done")
+
+    def __init__(self, item):
+        self.item = item
+        self.enqueued = time.monotonic()
+        self.result = _PENDING
+        self.error: Optional[BaseException] = None
+        self.done = False
+
+
+class MicroBatcher:
+    """
+    Merges model calls from concurrent requests into batches.
+
+    ``submit`` queues an item and blocks until its result is ready. The
+    first caller to find no batch in progress becomes the leader. Alone in
+    the queue it runs at once, so an idle batcher adds no latency;
+    otherwise it waits until ``max_batch_size`` items are queued or
+    ``window`` seconds passed since the oldest one arrived. It runs
+    ``run_batch`` on them in its own thread and hands each waiter its
+    result. Items that arrive while a batch runs form the next one. There is no background thread, so a
+    batcher created before a fork keeps working in the children.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run_batch: Callable[[List], List],
+        window: float = BATCH_WINDOW_MS / 1000,
+        max_batch_size: int = MAX_BATCH_SIZE
+    ):
+        self.name = name
+        self.run_batch = run_batch
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._queue: List[_Waiter] = []
+        self._leading = False
+        self._cond = threading.Condition()
+
+    def submit(self, item):
+        if self.window <= 0 or self.max_batch_size <= 1:
+            BATCH_SIZE.observe(1, model=self.name)
+            return self.run_batch([item])[0]
+
+        waiter = _Waiter(item)
+        with self._cond:
+            self._queue.append(waiter)
+            self._cond.notify_all()
+            while not waiter.done:
+                if self._leading:
+                    self._cond.wait()
+                    continue
+                self._leading = True
+                deadline = self._queue[0].enqueued + self.window
+                while 1 < len(self._queue) < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._queue[:self.max_batch_size]
+                del self._queue[:self.max_batch_size]
+                self._cond.release()
+                try:
+                    self._run(batch)
+                finally:
+                    self._cond.acquire()
+                    self._leading = False
+                    self._cond.notify_all()
+
+        if waiter.error is not None:
+            raise waiter.error
+        return waiter.result
+
+    def _run(self, batch: List[_Waiter]) -> None:
+        started = time.monotonic()
+        for waiter in batch:
+            BATCH_QUEUE_SECONDS.observe(started - waiter.enqueued, model=self.name)
+        BATCH_SIZE.observe(len(batch), model=self.name)
+        fatal: Optional[BaseException] = None
+        try:
+            results = self.run_batch([waiter.item for waiter in batch])
+            for waiter, result in zip(batch, results):
+                waiter.result = result
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0].error = e
+            else:
+                # Don't fail every request for one bad input: retry them one by one
+                logger.warning("%s batch of %d failed (%s), retrying items separately", self.name, len(batch), e)
+                for waiter in batch:
+                    try:
+                        waiter.result = self.run_batch([waiter.item])[0]
+                    except Exception as item_error:
+                        waiter.error = item_error
+        except BaseException as e:
+            fatal = e
+            raise
+        finally:
+            # Every waiter must wake up, with a result or an error
+            for waiter in batch:
+                if waiter.result is _PENDING and waiter.error is None:
+                    waiter.error = fatal or RuntimeError(f"{self.name} batch returned no result for this item")
+                waiter.done = True
+
+
+def _grouped(items: Sequence[Tuple[object, object]]) -> Dict[int, Tuple[object, List[int]]]:
+    """Indexes of ``(model, payload)`` items grouped by model instance."""
+    groups: Dict[int, Tuple[object, List[int]]] = {}
+    for i, (model, _) in enumerate(items):
+        groups.setdefault(id(model), (model, []))[1].append(i)
+    return groups
+
+
+def _parse_batch(items: List[Tuple[object, str]]) -> List:
+    docs = [None] * len(items)
+    for nlp, indexes in _grouped(items).values():
+        texts = [items[i][1] for i in indexes]
+        for i, doc in zip(indexes, nlp.pipe(texts, batch_size=len(texts))):
+            docs[i] = doc
+        count_inference("spacy", len(texts))
+    return docs
+
+
+def _encode_batch(items: List[Tuple[object, List[str]]]) -> List[np.ndarray]:
+    arrays: List[Optional[np.ndarray]] = [None] * len(items)
+    for model, indexes in _grouped(items).values():
+        texts = [text for i in indexes for text in items[i][1]]
+        encoded = np.asarray(model.encode(texts), dtype=np.float32)
+        count_inference("sentence_transformer", len(texts))
+        offset = 0
+        for i in indexes:
+            arrays[i] = encoded[offset:offset + len(items[i][1])]
+            offset += len(items[i][1])
+    return arrays
+
+
+# One batcher per kind of model; items carry the pipeline / model they need,
+# so requests using different analysis profiles still share a batcher
+_parser = MicroBatcher("spacy", _parse_batch)
+_encoder = MicroBatcher("sentence_transformer", _encode_batch)
+
+
+def parse(nlp, text: str):
+    """``nlp(text)``, batched with concurrent parses through ``nlp.pipe``."""
+    return _parser.submit((nlp, text))
+
+
+def encode(model, texts: List[str]) -> np.ndarray:
+    """``model.encode(texts)`` as float32, batched with concurrent encodes."""
+    return _encoder.submit((model, list(texts)))
+
+
+def configure(window_ms: Optional[float] = None, max_batch_size: Optional[int] = None) -> None:
+    """Change the batching window and size limit, e.g. 0 ms for single-threaded workers."""
+    for batcher in (_parser, _encoder):
+        if window_ms is not None:
+            batcher.window = window_ms / 1000
+        if max_batch_size is not None:
+            batcher.max_batch_size = max_batch_size
@@ -0,0 +1,246 @@
+import io
+import os
+import zipfile
+import atexit
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from utils import near_duplicates, text_extraction
+from utils.jd_profile import JDProfile, compile_jd
+from utils.metrics import DUPLICATES
+from utils.pipeline import process_upload
+
+RESUME_EXTENSIONS = {'pdf', 'docx', 'doc', 'txt'}
+MAX_BULK_FILES = 500
+MAX_ARCHIVE_BYTES = 256 * 1024 * 1024  # uncompressed size limit for zip uploads
+DEFAULT_TOP_K = 10
+# What to do with a resume whose text nearly matches one seen before:
+# 'collapse' folds copies within the batch into the first one's ranking
+#   entry and still scores copies of resumes from earlier batches,
+# 'skip' scores neither, 'keep' turns detection off
+DUPLICATE_MODES = ('collapse', 'skip', 'keep')
+DEFAULT_DUPLICATES = 'collapse'
+# Bulk scoring processes for the whole host; every web worker owns a pool,
+# so each gets its share (RESUME_WEB_WORKERS is set by gunicorn.conf.py)
+BULK_WORKERS = int(os.environ.get('RESUME_BULK_WORKERS', os.cpu_count() or 1))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class BulkInputError(ValueError):
+    pass
+
+
+def _extension(filename: str) -> str:
+    return filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+
+
+def collect_resumes(uploads: List[Tuple[str, bytes]]) -> List[Tuple[str, bytes]]:
+    """
+    Expand uploaded (filename, bytes) pairs into individual resumes.
+    Zip archives are unpacked in memory; unsupported members are skipped.
+    """
+    resumes = []
+    for filename, data in uploads:
+        ext = _extension(filename)
+        if ext == 'zip':
+            resumes.extend(_read_archive(filename, data))
+        elif ext in RESUME_EXTENSIONS:
+            resumes.append((filename, data))
+
+        if len(resumes) > MAX_BULK_FILES:
+            raise BulkInputError(f"A batch can contain at most {MAX_BULK_FILES} resumes")
+    return resumes
+
+
+def _read_archive(filename: str, data: bytes) -> List[Tuple[str, bytes]]:
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(data))
+    except zipfile.BadZipFile:
+        raise BulkInputError(f"{filename} is not a valid zip archive")
+
+    with archive:
+        members = [
+            info for info in archive.infolist()
+            if not info.is_dir() and _extension(info.filename) in RESUME_EXTENSIONS
+            and not os.path.basename(info.filename).startswith('.')
+        ]
+        if sum(info.file_size for info in members) > MAX_ARCHIVE_BYTES:
+            raise BulkInputError(f"{filename} is too large once uncompressed")
+        return [(info.filename, archive.read(info)) for info in members]
+
+
+def _warm_worker():
+    # Load the models once per worker process instead of once per resume;
+    # a forked worker inherits them from the parent when already loaded
+    from utils.models import warmup
+    from utils import batching
+    warmup()
+    # One resume at a time per process: nothing to batch with, don't wait
+    batching.configure(window_ms=0)
+
+
+def _fingerprint(filename: str, data: bytes) -> Tuple[Optional[str], Optional[np.ndarray]]:
+    """
+    Runs in a pool worker: extract the text into the text cache, where
+    scoring finds it again, and return its content key and MinHash signature.
+    """
+    try:
+        text, key = text_extraction.extract_text_cached(data, filename)
+    except Exception:
+        return None, None  # scoring reports the error
+    return key, near_duplicates.signature(text)
+
+
+def _score_resume(filename: str, data: bytes, jd_profile: JDProfile, analysis_profile: Optional[str] = None) -> Dict:
+    """Runs in a pool worker: extract text, then score it against the JD."""
+    try:
+        results = process_upload(data, filename, jd_profile=jd_profile, analysis_profile=analysis_profile)
+        return {"filename": filename, "score": results["score"], "results": results}
+    except Exception as e:
+        return {"filename": filename, "score": None, "error": str(e)}
+
+
+def pool_size() -> int:
+    """This process's share of ``BULK_WORKERS``, at least one."""
+    web_workers = max(1, int(os.environ.get('RESUME_WEB_WORKERS', 1)))
+    return max(1, BULK_WORKERS // web_workers)
+
+
+def get_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Shared process pool, created on first use and reused across batches."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=max_workers or pool_size(),
+                initializer=_warm_worker
+            )
+            atexit.register(_pool.shutdown, wait=False)
+        return _pool
+
+
+def _find_duplicates(
+    resumes: List[Tuple[str, bytes]],
+    pool: ProcessPoolExecutor,
+    threshold: float
+) -> Iterator[Tuple[int, Optional[Dict]]]:
+    """
+    Yields ``(position, duplicate)`` for every resume in batch order, where
+    ``duplicate`` is None for the first copy of a text and otherwise
+    describes the resume it copies (``in_batch`` tells whether that one is
+    part of this batch). Signatures are added to the process-wide index so
+    later batches are checked against this one; without an index the
+    batch is only checked against itself. Copies of a resume earlier in
+    the batch are not added: they are never scored on their own, so later
+    matches must point at the first copy.
+    """
+    index = near_duplicates.get_index()
+    if index is None:
+        index = near_duplicates.NearDuplicateIndex(":memory:")
+    fingerprints = [pool.submit(_fingerprint, filename, data) for filename, data in resumes]
+    first_copy: Dict[str, str] = {}  # content key -> filename of its first copy in this batch
+    for position, ((filename, _), future) in enumerate(zip(resumes, fingerprints)):
+        key, sig = future.result()
+        if sig is None:
+            yield position, None
+            continue
+        match = index.find(sig, threshold)
+        in_batch = match is not None and match.content_key in first_copy
+        first_copy.setdefault(key, first_copy[match.content_key] if in_batch else filename)
+        if not in_batch:
+            index.add(key, filename, sig)
+        if match is None:
+            yield position, None
+        else:
+            yield position, {
+                "duplicate_of": first_copy[match.content_key] if in_batch else match.filename,
+                "similarity": match.similarity,
+                "in_batch": in_batch
+            }
+
+
+def rank_resumes(
+    resumes: List[Tuple[str, bytes]],
+    jd_text: Optional[str] = None,
+    top_k: int = DEFAULT_TOP_K,
+    max_workers: Optional[int] = None,
+    jd_profile: Optional[JDProfile] = None,
+    analysis_profile: Optional[str] = None,
+    duplicates: str = DEFAULT_DUPLICATES,
+    threshold: float = near_duplicates.DEFAULT_THRESHOLD
+) -> Iterator[Dict]:
+    """
+    Score every resume against one JD in the process pool.
+
+    Yields one ``{"event": "result", ...}`` record per scored resume as
+    soon as it finishes, then a final ``{"event": "ranking", ...}`` record
+    with the top ``top_k`` resumes by score. The JD is compiled once for
+    the batch, or ``jd_profile`` is used as-is when given.
+    ``analysis_profile`` applies to every resume of the batch.
+
+    Unless ``duplicates`` is 'keep', every resume's text is first MinHashed
+    and checked against the near-duplicate index; copies that are not
+    scored (see ``DUPLICATE_MODES``) get a ``{"event": "duplicate", ...}``
+    record instead, and collapsed ones are listed under the ranking entry
+    of their first copy.
+    """
+    if duplicates not in DUPLICATE_MODES:
+        raise ValueError(f"duplicates must be one of: {', '.join(DUPLICATE_MODES)}")
+    if jd_profile is None:
+        jd_profile = compile_jd(jd_text)
+    pool = get_pool(max_workers)
+
+    futures: Dict[Future, Optional[Dict]] = {}
+    copies: Dict[str, List[str]] = {}
+    if duplicates == 'keep':
+        found = ((position, None) for position in range(len(resumes)))
+    else:
+        found = _find_duplicates(resumes, pool, threshold)
+    for position, duplicate in found:
+        filename, data = resumes[position]
+        if duplicate is not None and (duplicates == 'skip' or duplicate["in_batch"]):
+            action = 'skipped' if duplicates == 'skip' else 'collapsed'
+            DUPLICATES.inc(action=action)
+            if action == 'collapsed':
+                copies.setdefault(duplicate["duplicate_of"], []).append(filename)
+            yield {"event": "duplicate", "filename": filename, "action": action, **duplicate}
+            continue
+        if duplicate is not None:
+            DUPLICATES.inc(action='scored')
+        futures[pool.submit(_score_resume, filename, data, jd_profile, analysis_profile)] = duplicate
+
+    scored = []
+    failed = 0
+    for future in as_completed(futures):
+        record = future.result()
+        duplicate = futures[future]
+        if duplicate is not None:
+            record.update(duplicate_of=duplicate["duplicate_of"], similarity=duplicate["similarity"])
+        if record["score"] is not None:
+            scored.append(record)
+        else:
+            failed += 1
+        yield {"event": "result", **record}
+
+    scored.sort(key=lambda r: r["score"], reverse=True)
+    yield {
+        "event": "ranking",
+        "processed": len(resumes),
+        "failed": failed,
+        "duplicates": len(resumes) - len(futures),
+        "top_k": [
+            {
+                "rank": rank,
+                "filename": r["filename"],
+                "name": r["results"]["resume_info"].get("name"),
+                "score": r["score"],
+                "duplicates": copies.get(r["filename"], [])
+            }
+            for rank, r in enumerate(scored[:top_k], start=1)
+        ]
+    }
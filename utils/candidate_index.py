@@ -0,0 +1,177 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+from utils import skill_extraction, scoring
+
+DEFAULT_INDEX_PATH = os.environ.get('RESUME_CANDIDATE_INDEX', os.path.join('cache', 'candidates.sqlite3'))
+DEFAULT_TOP_N = 20
+
+
+class CandidateIndex:
+    """
+    On-disk index of analyzed resumes.
+
+    Each candidate row keeps contact info, merged skills, projects and the
+    experience/internship flags that ``scoring.calculate_score`` needs. The
+    ``postings`` table maps every normalised skill term to the candidates
+    that have it, so a JD query only touches candidates sharing at least
+    one skill with it and never re-parses a document.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connect()
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS candidates (
+                id INTEGER PRIMARY KEY,
+                content_key TEXT UNIQUE NOT NULL,
+                filename TEXT,
+                name TEXT,
+                email TEXT,
+                phone TEXT,
+                skills TEXT NOT NULL,
+                projects TEXT NOT NULL,
+                experience INTEGER NOT NULL,
+                has_internship_or_achievements INTEGER NOT NULL,
+                updated REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                candidate_id INTEGER NOT NULL,
+                PRIMARY KEY (term, candidate_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_candidate ON postings (candidate_id);
+            """
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread, and never one inherited across a fork
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def add(self, content_key: str, filename: str, results: Dict) -> int:
+        """Insert or refresh the candidate for one processed resume."""
+        info = results.get("resume_info") or {}
+        skills = results["resume_skills"]
+        terms = skill_extraction.SKILL_INDEX.vector_terms(skill_extraction.skill_vector(skills))
+
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                """INSERT INTO candidates (content_key, filename, name, email, phone, skills, projects,
+                                           experience, has_internship_or_achievements, updated)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (content_key) DO UPDATE SET
+                       filename = excluded.filename, name = excluded.name, email = excluded.email,
+                       phone = excluded.phone, skills = excluded.skills, projects = excluded.projects,
+                       experience = excluded.experience,
+                       has_internship_or_achievements = excluded.has_internship_or_achievements,
+                       updated = excluded.updated""",
+                (
+                    content_key, filename, info.get("name"), info.get("email"), info.get("phone"),
+                    json.dumps(skills), json.dumps(results["projects"]),
+                    int(results["experience"]), int(results["has_internship_or_achievements"]),
+                    time.time()
+                )
+            )
+            (candidate_id,) = conn.execute(
+                "SELECT id FROM candidates WHERE content_key = ?", (content_key,)
+            ).fetchone()
+            conn.execute("DELETE FROM postings WHERE candidate_id = ?", (candidate_id,))
+            conn.executemany(
+                "INSERT INTO postings (term, candidate_id) VALUES (?, ?)",
+                [(term, candidate_id) for term in terms]
+            )
+        return candidate_id
+
+    def get(self, candidate_id: int) -> Optional[Dict]:
+        row = self._connect().execute(
+            "SELECT id, filename, name, email, phone FROM candidates WHERE id = ?", (candidate_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("id", "filename", "name", "email", "phone"), row))
+
+    def __len__(self) -> int:
+        (count,) = self._connect().execute("SELECT COUNT(*) FROM candidates").fetchone()
+        return count
+
+    def search(self, jd_profile, top_n: int = DEFAULT_TOP_N) -> List[Dict]:
+        """
+        Rank indexed candidates against a compiled JD with the same
+        ``compare_skills``/``calculate_score`` logic as the upload route.
+        """
+        jd_terms = sorted(skill_extraction.SKILL_INDEX.vector_terms(jd_profile.vector))
+        if not jd_terms:
+            return []
+
+        conn = self._connect()
+        placeholders = ",".join("?" * len(jd_terms))
+        rows = conn.execute(
+            f"""SELECT c.id, c.filename, c.name, c.email, c.phone, c.skills, c.projects,
+                       c.experience, c.has_internship_or_achievements
+                FROM candidates c
+                JOIN (SELECT candidate_id FROM postings WHERE term IN ({placeholders})
+                      GROUP BY candidate_id) hits ON hits.candidate_id = c.id""",
+            jd_terms
+        ).fetchall()
+
+        ranked = []
+        for cid, filename, name, email, phone, skills, projects, experience, internship in rows:
+            projects = json.loads(projects)
+            comparison = skill_extraction.compare_skills(
+                json.loads(skills), jd_profile.skills, jd_vector=jd_profile.vector
+            )
+            comparison["jd_skills"] = jd_profile.skills
+            score = scoring.calculate_score(
+                comparison,
+                projects,
+                jd_profile.text,
+                experience=bool(experience),
+                has_internship_or_achievements=bool(internship)
+            )
+            ranked.append({
+                "id": cid,
+                "filename": filename,
+                "name": name,
+                "email": email,
+                "phone": phone,
+                "score": min(max(score, 0), 100),
+                "common_skills": comparison["common_skills"],
+                "missing_skills": sorted(comparison["missing_skills"])
+            })
+
+        ranked.sort(key=lambda c: (c["score"], len(c["common_skills"])), reverse=True)
+        return ranked[:top_n]
+
+
+_default_index: Optional[CandidateIndex] = None
+_default_lock = threading.Lock()
+
+
+def configure(path: Optional[str]) -> Optional[CandidateIndex]:
+    """Point the process-wide index at ``path``; an empty path disables it."""
+    global _default_index
+    with _default_lock:
+        if path:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            _default_index = CandidateIndex(path)
+        else:
+            _default_index = None
+    return _default_index
+
+
+def get_index() -> Optional[CandidateIndex]:
+    return _default_index
@@ -0,0 +1,118 @@
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from utils import batching
+from utils.profiles import get_profile
+from utils.metrics import span
+from utils.sections import HEADER, Section, segment
+
+
+class AnalyzedDocument:
+    """
+    Per-request view of a text that is parsed by spaCy at most once.
+
+    Extractors read sentences, noun chunks and entities from the shared
+    ``Doc`` instead of calling ``nlp()`` on the text themselves. ``nlp``
+    defaults to the trimmed pipeline of the default analysis profile.
+
+    With ``sectioned=True`` (resumes) the text is also split into typed
+    sections, and ``focus`` gives a separately parsed document of just the
+    sections an extractor needs, so spaCy never sees the rest.
+    """
+
+    def __init__(self, text: str, nlp=None, sectioned: bool = False):
+        if not isinstance(text, str):
+            raise ValueError("Expected text to be a string")
+
+        self.text = text
+        self._nlp = nlp
+        self._doc = None
+        self._sectioned = sectioned
+        self._sections: Optional[List[Section]] = None
+        self._focused: Dict[Tuple[str, ...], "AnalyzedDocument"] = {}
+
+        # Non-empty stripped lines plus the offset where each one ends in text
+        self.lines: List[str] = []
+        self._line_ends: List[int] = []
+        offset = 0
+        for raw in text.split('\n'):
+            stripped = raw.strip()
+            if stripped:
+                self.lines.append(stripped)
+                self._line_ends.append(offset + len(raw))
+            offset += len(raw) + 1
+
+    @property
+    def doc(self):
+        if self._doc is None:
+            nlp = self._nlp or get_profile().nlp()
+            # Parsed together with concurrent requests' documents
+            with span("spacy_parse"):
+                self._doc = batching.parse(nlp, self.text)
+        return self._doc
+
+    @property
+    def sents(self):
+        return self.doc.sents
+
+    @property
+    def noun_chunks(self):
+        return self.doc.noun_chunks
+
+    @property
+    def ents(self):
+        return self.doc.ents
+
+    def line_end(self, count: int) -> Optional[int]:
+        """Character offset in ``text`` just past the first ``count`` lines."""
+        if not self._line_ends or count <= 0:
+            return None
+        return self._line_ends[min(count, len(self._line_ends)) - 1]
+
+    @property
+    def sections(self) -> List[Section]:
+        """Typed sections covering the text; empty unless created with ``sectioned=True``."""
+        if self._sections is None:
+            self._sections = segment(self.text) if self._sectioned else []
+        return self._sections
+
+    @property
+    def structured(self) -> bool:
+        """True when at least one section heading was recognised."""
+        return any(section.kind != HEADER for section in self.sections)
+
+    def has_section(self, kind: str) -> bool:
+        return any(section.kind == kind for section in self.sections)
+
+    def section_text(self, *kinds: str) -> str:
+        return "".join(self.text[s.start:s.end] for s in self.sections if s.kind in kinds)
+
+    def section_at(self, offset: int) -> Optional[Section]:
+        """The section containing character ``offset``."""
+        sections = self.sections
+        i = bisect_right([s.start for s in sections], offset) - 1
+        return sections[i] if i >= 0 else None
+
+    def focus(self, *kinds: str) -> "AnalyzedDocument":
+        """
+        Document of only the ``kinds`` sections, in text order, parsed on
+        its own the first time its ``doc`` is read. Text with none of those
+        sections gives this document itself, so callers fall back to
+        reading everything.
+        """
+        focused = self._focused.get(kinds)
+        if focused is None:
+            parts = [s for s in self.sections if s.kind in kinds]
+            if not parts:
+                focused = self
+            else:
+                rebased, offset = [], 0
+                for section in parts:
+                    rebased.append(section.rebase(offset))
+                    offset += section.end - section.start
+                focused = AnalyzedDocument(
+                    "".join(self.text[s.start:s.end] for s in parts), nlp=self._nlp, sectioned=True
+                )
+                focused._sections = rebased
+            self._focused[kinds] = focused
+        return focused
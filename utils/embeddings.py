@@ -0,0 +1,48 @@
+import numpy as np
+from typing import List
+
+from utils import batching
+from utils.cache import LRUCache
+from utils.models import get_sentence_model
+from utils.metrics import span
+
+EMBEDDING_CACHE_SIZE = 4096
+
+# Normalised sentence embeddings keyed by the exact input text
+_embedding_cache = LRUCache(maxsize=EMBEDDING_CACHE_SIZE)
+
+
+def encode(texts: List[str], model=None) -> np.ndarray:
+    """
+    Return L2-normalised embeddings for ``texts`` as a (len(texts), dim) array.
+
+    Texts already in the cache are not sent to the model; the rest are
+    encoded in a single call, batched with concurrent requests' texts.
+    """
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    vectors = {}
+    pending = []
+    for text in dict.fromkeys(texts):
+        cached = _embedding_cache.get(text)
+        if cached is None:
+            pending.append(text)
+        else:
+            vectors[text] = cached
+
+    if pending:
+        model = model or get_sentence_model()
+        with span("sentence_encode"):
+            encoded = batching.encode(model, pending)
+        norms = np.linalg.norm(encoded, axis=1, keepdims=True)
+        encoded = encoded / np.where(norms == 0, 1.0, norms)
+        for text, vector in zip(pending, encoded):
+            _embedding_cache.put(text, vector)
+            vectors[text] = vector
+
+    return np.stack([vectors[text] for text in texts])
+
+
+def cache_stats():
+    return _embedding_cache.stats()
@@ -1,19 +1,25 @@
 import re
-import spacy
 from typing import List, Dict, Optional
 
-nlp = spacy.load("en_core_web_sm")
+from utils.document import AnalyzedDocument
+from utils.sections import HEADER
 
-def extract_information(text: str, lines: List[str]) -> Dict[str, Optional[str]]:
+def extract_information(
+    text: str,
+    lines: List[str],
+    doc: Optional[AnalyzedDocument] = None
+) -> Dict[str, Optional[str]]:
     if not isinstance(text, str):
         raise ValueError("Expected text to be a string")
     if not isinstance(lines, list):
         raise ValueError("Expected lines to be a list of strings")
 
+    # Contact details live in the header; the rest is searched only without one
+    header = doc.section_text(HEADER) if doc is not None and doc.structured else ""
     return {
-        "name": extract_name(lines),
-        "email": extract_email(text),
-        "phone": extract_phone(text)
+        "name": extract_name(lines, doc=doc),
+        "email": (header and extract_email(header)) or extract_email(text),
+        "phone": (header and extract_phone(header)) or extract_phone(text)
     }
 
 def extract_email(text: str) -> Optional[str]:
@@ -40,14 +46,21 @@ def extract_phone(text: str) -> Optional[str]:
             return match.group(0)
     return None
 
-def extract_name(lines: List[str]) -> Optional[str]:
+def extract_name(lines: List[str], doc: Optional[AnalyzedDocument] = None) -> Optional[str]:
     """
     Improved name extraction:
     Accept 1–4 words, skip lines with email/phone/linkedin
+    Falls back to PERSON entities from the first 50 lines, reusing the
+    already parsed ``doc`` when one is given. A sectioned ``doc`` is read
+    from its header only, which is all that gets parsed for the fallback.
     """
     if not isinstance(lines, list):
         raise ValueError("Expected lines to be a list of strings")
 
+    if doc is not None and doc.structured:
+        doc = doc.focus(HEADER)
+        lines = doc.lines
+
     for line in lines[:10]:
         line = line.strip()
         if line and not any(keyword in line.lower() for keyword in ['email', '@', 'phone', 'mobile', 'linkedin']):
@@ -55,8 +68,12 @@ def extract_name(lines: List[str]) -> Optional[str]:
                 if any(c.isalpha() for c in line):
                     return line
 
-    doc = nlp(" ".join(lines[:50]))
+    if doc is None:
+        doc = AnalyzedDocument(" ".join(lines[:50]))
+    limit = doc.line_end(50)
     for ent in doc.ents:
+        if limit is not None and ent.start_char >= limit:
+            break
         if ent.label_ == "PERSON":
             return ent.text
 
@@ -0,0 +1,183 @@
+import os
+import re
+import hashlib
+import logging
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from utils.cache import LRUCache
+from utils.document import AnalyzedDocument
+from utils.skill_index import SkillVector
+from utils.metrics import span
+from utils.profiles import get_profile
+from utils.taxonomy import get_taxonomy, pinned
+from utils import skill_extraction, project_extraction
+
+logger = logging.getLogger(__name__)
+
+JD_CACHE_SIZE = 1024
+# Registered JD texts; empty keeps them in this process only
+DEFAULT_REGISTRY_DIR = os.environ.get('RESUME_JD_DIR', os.path.join('cache', 'jd'))
+
+_JD_ID = re.compile(r'^[0-9a-f]{32}$')
+
+# Compiled profiles keyed by jd_id, registered or not
+_profiles = LRUCache(maxsize=JD_CACHE_SIZE)
+
+
+@dataclass
+class JDProfile:
+    """Everything the pipeline derives from a JD, computed once per JD text."""
+    jd_id: str
+    text: str
+    skills: List[str]                       # canonical JD skills
+    vector: SkillVector                     # expanded skills used by compare_skills
+    keywords: Set[str] = field(default_factory=set)  # KNOWN_SKILLS + RELATED_SKILLS hits
+    taxonomy: str = ""                      # taxonomy version it was compiled with
+
+
+def normalize_jd(text: str) -> str:
+    """Strip and collapse whitespace per line and drop blank lines."""
+    lines = (re.sub(r'[ \t]+', ' ', line).strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def jd_hash(text: str) -> str:
+    return hashlib.sha256(normalize_jd(text).encode('utf-8')).hexdigest()[:32]
+
+
+def extract_jd_skills(jd_text: str, jd_doc: Optional[AnalyzedDocument] = None) -> List[str]:
+    """
+    JD skills with the fallback extractor used when nothing is found. JDs
+    are matched with the default analysis profile's settings, so a cached
+    profile is valid for resumes analyzed with any profile.
+    """
+    profile = get_profile()
+    if jd_doc is None:
+        jd_doc = AnalyzedDocument(jd_text, nlp=profile.nlp())
+    jd_skills = skill_extraction.extract_jd_skills(jd_text, doc=jd_doc, semantic=profile.semantic_skills)
+    if not jd_skills:
+        logger.info("No JD skills found with extract_jd_skills, falling back to extract_skills")
+        jd_skills = skill_extraction.extract_skills(jd_text, doc=jd_doc)
+    return jd_skills
+
+
+def compile_jd(jd_text: str) -> JDProfile:
+    """
+    Return the cached profile for this JD, compiling it on a miss or when
+    it was compiled with an older skill taxonomy.
+    """
+    jd_id = jd_hash(jd_text)
+    profile = _profiles.get(jd_id)
+    if profile is not None and profile.taxonomy == get_taxonomy().version:
+        return profile
+
+    with span("compile_jd"), pinned() as taxonomy:
+        text = normalize_jd(jd_text)
+        skills = extract_jd_skills(text)
+        profile = JDProfile(
+            jd_id=jd_id,
+            text=text,
+            skills=skills,
+            vector=skill_extraction.skill_vector(skills),
+            keywords=project_extraction.get_all_jd_skills(text),
+            taxonomy=taxonomy.version
+        )
+    _profiles.put(jd_id, profile)
+    return profile
+
+
+class JDRegistry:
+    """
+    Normalized text of every registered JD keyed by ``jd_id``.
+
+    Entries are never evicted. With a directory each JD is one text file,
+    written through a temp file and ``os.replace``, so a JD registered by
+    one worker is known to all of them and survives restarts; without one
+    they live in a dict of this process. Compiled profiles are not stored:
+    they are rebuilt from the text through the ``_profiles`` LRU.
+    """
+
+    def __init__(self, directory: Optional[str] = DEFAULT_REGISTRY_DIR):
+        self.directory = directory or None
+        self._texts: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, jd_id: str) -> str:
+        return os.path.join(self.directory, f"{jd_id}.txt")
+
+    def get(self, jd_id: str) -> Optional[str]:
+        if not _JD_ID.match(jd_id):
+            return None
+        if not self.directory:
+            with self._lock:
+                return self._texts.get(jd_id)
+        try:
+            with open(self._path(jd_id), 'r', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, jd_id: str, text: str) -> None:
+        if not self.directory:
+            with self._lock:
+                self._texts[jd_id] = text
+            return
+        if os.path.exists(self._path(jd_id)):
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(text.encode('utf-8'))
+        os.replace(tmp_path, self._path(jd_id))
+
+    def __len__(self) -> int:
+        if not self.directory:
+            return len(self._texts)
+        return sum(1 for name in os.listdir(self.directory) if name.endswith('.txt'))
+
+
+_default_registry: Optional[JDRegistry] = None
+_default_lock = threading.Lock()
+
+
+def configure(directory: Optional[str] = DEFAULT_REGISTRY_DIR) -> JDRegistry:
+    """Replace the process-wide registry, e.g. with the app's configured directory."""
+    global _default_registry
+    with _default_lock:
+        _default_registry = JDRegistry(directory)
+    return _default_registry
+
+
+def get_registry() -> JDRegistry:
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = JDRegistry()
+        return _default_registry
+
+
+def register_jd(jd_text: str) -> JDProfile:
+    """Compile a JD and record it so resumes can later be scored against it by ``jd_id``."""
+    profile = compile_jd(jd_text)
+    get_registry().put(profile.jd_id, profile.text)
+    return profile
+
+
+def get_jd(jd_id: str) -> Optional[JDProfile]:
+    """
+    Registered profile for ``jd_id``, or None if it was never registered.
+    The registry decides; ``_profiles`` also holds ad-hoc JDs compiled for
+    a single request, so it only saves recompiling a registered one.
+    """
+    text = get_registry().get(jd_id)
+    if text is None:
+        return None
+    return compile_jd(text)
+
+
+def cache_stats():
+    return _profiles.stats()
@@ -0,0 +1,368 @@
+import os
+import json
+import time
+import logging
+import uuid
+import base64
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.pipeline import process_upload
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+DEFAULT_MAX_PENDING = 100
+DEFAULT_RESULT_TTL = 60 * 60  # seconds finished jobs stay retrievable
+# A claimed job whose worker hasn't finished it within the lease is assumed
+# lost (killed or crashed process) and handed out again, at most
+# DEFAULT_MAX_ATTEMPTS times in total
+DEFAULT_LEASE_SECONDS = 10 * 60
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+class QueueFull(Exception):
+    pass
+
+
+class JobQueue(ABC):
+    """
+    Interface shared by the job queue backends. Payloads and results are
+    JSON-serialisable dicts; ``get`` returns the public view of a job.
+    """
+
+    def __init__(self, max_pending: int = DEFAULT_MAX_PENDING, result_ttl: float = DEFAULT_RESULT_TTL):
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+
+    @abstractmethod
+    def submit(self, payload: Dict) -> str:
+        ...
+
+    @abstractmethod
+    def claim(self, timeout: float = 1.0) -> Optional[Tuple[str, Dict]]:
+        ...
+
+    @abstractmethod
+    def complete(self, job_id: str, result: Dict) -> None:
+        ...
+
+    @abstractmethod
+    def fail(self, job_id: str, error: str) -> None:
+        ...
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    def pending(self) -> int:
+        ...
+
+
+class InMemoryJobQueue(JobQueue):
+    """Jobs held in this process; lost on restart."""
+
+    def __init__(self, max_pending: int = DEFAULT_MAX_PENDING, result_ttl: float = DEFAULT_RESULT_TTL):
+        super().__init__(max_pending, result_ttl)
+        self._jobs = OrderedDict()
+        self._queue = deque()
+        self._cond = threading.Condition()
+
+    def submit(self, payload: Dict) -> str:
+        with self._cond:
+            self._expire()
+            if len(self._queue) >= self.max_pending:
+                raise QueueFull(f"{len(self._queue)} jobs already waiting")
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {
+                "status": QUEUED, "payload": payload, "result": None,
+                "error": None, "updated": time.time()
+            }
+            self._queue.append(job_id)
+            self._cond.notify()
+            return job_id
+
+    def claim(self, timeout: float = 1.0) -> Optional[Tuple[str, Dict]]:
+        with self._cond:
+            if not self._queue and not self._cond.wait_for(lambda: self._queue, timeout):
+                return None
+            job_id = self._queue.popleft()
+            job = self._jobs[job_id]
+            job["status"] = RUNNING
+            job["updated"] = time.time()
+            return job_id, job["payload"]
+
+    def _finish(self, job_id: str, status: str, result: Optional[Dict], error: Optional[str]) -> None:
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.update(status=status, result=result, error=error, payload=None, updated=time.time())
+            self._jobs.move_to_end(job_id)
+
+    def complete(self, job_id: str, result: Dict) -> None:
+        self._finish(job_id, DONE, result, None)
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._finish(job_id, FAILED, None, error)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return _public_view(job_id, job["status"], job["result"], job["error"])
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def _expire(self) -> None:
+        # Finished jobs are kept in completion order, oldest first
+        cutoff = time.time() - self.result_ttl
+        for job_id in list(self._jobs):
+            job = self._jobs[job_id]
+            if job["status"] in (DONE, FAILED) and job["updated"] < cutoff:
+                del self._jobs[job_id]
+
+
+class SQLiteJobQueue(JobQueue):
+    """Jobs persisted in a SQLite file, so they survive restarts and can be
+    shared by several worker processes on the same machine.
+
+    A claim leases the job for ``lease_seconds``. Jobs still running when
+    their lease runs out belonged to a worker that died, and are claimed
+    again; after ``max_attempts`` claims they are marked failed instead.
+    A worker can only finish a job under the lease it claimed it with, so a
+    late finish from a worker that lost its lease is ignored."""
+
+    def __init__(
+        self,
+        path: str,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        result_ttl: float = DEFAULT_RESULT_TTL,
+        poll_interval: float = 0.2,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    ):
+        super().__init__(max_pending, result_ttl)
+        self.path = path
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                payload TEXT,
+                result TEXT,
+                error TEXT,
+                created REAL NOT NULL,
+                updated REAL NOT NULL,
+                lease_until REAL,
+                attempts INTEGER NOT NULL DEFAULT 0
+            )"""
+        )
+        # Queue files created before leases existed
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+        if "lease_until" not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN lease_until REAL")
+        if "attempts" not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+        conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread, and never one inherited across a fork
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def submit(self, payload: Dict) -> str:
+        conn = self._connect()
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated < ?",
+                (DONE, FAILED, now - self.result_ttl)
+            )
+            (waiting,) = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()
+            if waiting >= self.max_pending:
+                raise QueueFull(f"{waiting} jobs already waiting")
+            conn.execute(
+                "INSERT INTO jobs (id, status, payload, created, updated) VALUES (?, ?, ?, ?, ?)",
+                (job_id, QUEUED, json.dumps(payload), now, now)
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return job_id
+
+    def claim(self, timeout: float = 1.0) -> Optional[Tuple[str, Dict]]:
+        conn = self._connect()
+        deadline = time.monotonic() + timeout
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                conn.execute(
+                    """UPDATE jobs SET status = ?, error = ?, payload = NULL, updated = ?
+                       WHERE status = ? AND COALESCE(lease_until, 0) < ? AND attempts >= ?""",
+                    (FAILED, "Worker stopped while running this job", now, RUNNING, now, self.max_attempts)
+                )
+                row = conn.execute(
+                    """SELECT id, payload FROM jobs
+                       WHERE status = ? OR (status = ? AND COALESCE(lease_until, 0) < ?)
+                       ORDER BY created LIMIT 1""",
+                    (QUEUED, RUNNING, now)
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        """UPDATE jobs SET status = ?, updated = ?, lease_until = ?, attempts = attempts + 1
+                           WHERE id = ?""",
+                        (RUNNING, now, now + self.lease_seconds, row[0])
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            if row is not None:
+                self._leases()[row[0]] = now + self.lease_seconds
+                return row[0], json.loads(row[1])
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+
+    def _leases(self) -> Dict[str, float]:
+        # Leases this thread claimed, by job ID; finished on the claiming thread
+        leases = getattr(self._local, "leases", None)
+        if leases is None:
+            leases = self._local.leases = {}
+        return leases
+
+    def _finish(self, job_id: str, status: str, result: Optional[Dict], error: Optional[str]) -> None:
+        lease_until = self._leases().pop(job_id, None)
+        cursor = self._connect().execute(
+            """UPDATE jobs SET status = ?, result = ?, error = ?, payload = NULL, updated = ?
+               WHERE id = ? AND status = ? AND lease_until IS ?""",
+            (status, json.dumps(result) if result is not None else None, error, time.time(),
+             job_id, RUNNING, lease_until)
+        )
+        if cursor.rowcount == 0:
+            logger.warning("Ignoring %s for job %s: its lease ran out and it was claimed again", status, job_id)
+
+    def complete(self, job_id: str, result: Dict) -> None:
+        self._finish(job_id, DONE, result, None)
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._finish(job_id, FAILED, None, error)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        row = self._connect().execute(
+            "SELECT status, result, error FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        status, result, error = row
+        return _public_view(job_id, status, json.loads(result) if result else None, error)
+
+    def pending(self) -> int:
+        (waiting,) = self._connect().execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)
+        ).fetchone()
+        return waiting
+
+
+def _public_view(job_id: str, status: str, result: Optional[Dict], error: Optional[str]) -> Dict:
+    view = {"job_id": job_id, "status": status}
+    if status == DONE:
+        view["result"] = result
+    elif status == FAILED:
+        view["error"] = error
+    return view
+
+
+def make_analysis_payload(data: bytes, filename: str, jd_text: str, analysis_profile: Optional[str] = None) -> Dict:
+    return {
+        "filename": filename,
+        "resume": base64.b64encode(data).decode("ascii"),
+        "jd": jd_text,
+        "profile": analysis_profile
+    }
+
+
+def run_analysis_job(payload: Dict) -> Dict:
+    """Default job handler: the same work the synchronous upload route does."""
+    data = base64.b64decode(payload["resume"])
+    return process_upload(data, payload["filename"], payload["jd"], analysis_profile=payload.get("profile"))
+
+
+class WorkerPool:
+    """Threads that claim jobs from a queue and run ``handler`` on them.
+
+    Threads share the models already loaded in this process."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handler: Callable[[Dict], Dict] = run_analysis_job,
+        workers: int = 2
+    ):
+        self.queue = queue
+        self.handler = handler
+        self.workers = workers
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self, warmup: Optional[Callable[[], None]] = None) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            if warmup is not None:
+                warmup()
+            self._stop.clear()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._threads)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            claimed = self.queue.claim(timeout=0.5)
+            if claimed is None:
+                continue
+            job_id, payload = claimed
+            try:
+                result = self.handler(payload)
+            except Exception as e:
+                logger.exception("Job %s failed", job_id)
+                self.queue.fail(job_id, str(e))
+            else:
+                self.queue.complete(job_id, result)
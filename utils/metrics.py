@@ -0,0 +1,235 @@
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds; covers sub-millisecond skill comparison up to multi-second PDFs
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+SIZE_BUCKETS = (1_000, 2_500, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000, 1_000_000, 5_000_000)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._sample_lines(key, value))
+        return lines
+
+    def _sample_lines(self, key: Tuple, value) -> List[str]:
+        return [f"{self.name}{_labels(self.labelnames, key)} {value}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        if not self.labelnames:
+            self._values[()] = 0
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+            state[1] += 1
+            state[2] += value
+
+    def _sample_lines(self, key: Tuple, state) -> List[str]:
+        counts, count, total = state
+        lines = []
+        for bound, n in zip(self.buckets, counts):
+            le = 'le="%g"' % bound
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {n}")
+        le = 'le="+Inf"'
+        lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {count}")
+        lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {total}")
+        return lines
+
+
+class Registry:
+    """
+    Metrics of this process in Prometheus text exposition format.
+
+    Collectors are callables run at scrape time that yield
+    ``(labels, value)`` gauge samples, for numbers owned by other modules
+    (cache hit counts, queue depth) rather than pushed here.
+    """
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Tuple[str, str, Callable]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, name: str, documentation: str, collect: Callable[[], Iterable[Tuple[Dict, float]]]):
+        self._collectors = [c for c in self._collectors if c[0] != name]
+        self._collectors.append((name, documentation, collect))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for name, documentation, collect in self._collectors:
+            try:
+                samples = list(collect())
+            except Exception:
+                logger.exception("Metrics collector %s failed", name)
+                continue
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in samples:
+                lines.append(f"{name}{_labels(tuple(labels), tuple(labels.values()))} {value}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "resume_stage_seconds", "Time spent in each pipeline stage", ["stage"]
+))
+DOCUMENT_SIZE = REGISTRY.register(Histogram(
+    "resume_document_size", "Size of analyzed documents (bytes for uploads, characters for text)",
+    ["kind"], buckets=SIZE_BUCKETS
+))
+MODEL_CALLS = REGISTRY.register(Counter(
+    "resume_model_calls_total", "Model inference calls", ["model"]
+))
+MODEL_ITEMS = REGISTRY.register(Counter(
+    "resume_model_items_total", "Texts sent to a model for inference", ["model"]
+))
+BATCH_SIZE = REGISTRY.register(Histogram(
+    "resume_inference_batch_size", "Requests merged into one model call by the micro-batcher",
+    ["model"], buckets=BATCH_BUCKETS
+))
+BATCH_QUEUE_SECONDS = REGISTRY.register(Histogram(
+    "resume_inference_queue_seconds", "Time a request waited for its micro-batch to start", ["model"]
+))
+DUPLICATES = REGISTRY.register(Counter(
+    "resume_bulk_duplicates_total", "Bulk resumes nearly duplicating an earlier one, by what was done with them",
+    ["action"]
+))
+REQUESTS = REGISTRY.register(Counter(
+    "resume_http_requests_total", "HTTP requests handled", ["endpoint", "status"]
+))
+IN_FLIGHT = REGISTRY.register(Gauge(
+    "resume_http_requests_in_flight", "HTTP requests currently being handled"
+))
+
+
+@contextmanager
+def span(stage: str):
+    """Time a block into ``resume_stage_seconds{stage=...}`` and the debug log."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        logger.debug("stage %s took %.2f ms", stage, elapsed * 1000)
+
+
+def count_inference(model: str, items: int = 1) -> None:
+    MODEL_CALLS.inc(model=model)
+    MODEL_ITEMS.inc(items, model=model)
+
+
+def cache_collector(caches: Dict[str, Callable[[], Optional[Dict]]]):
+    """Collector exposing ``stats()`` dicts of named caches as labelled samples."""
+    def collect():
+        for cache, stats in caches.items():
+            values = stats()
+            if not values:
+                continue
+            for stat, value in values.items():
+                yield {"cache": cache, "stat": stat}, value
+    return collect
+
+
+def hit_ratio_collector(caches: Dict[str, Callable[[], Optional[Dict]]]):
+    """
+    Collector exposing the share of lookups each named cache answered;
+    hits on the disk tier of two-tier caches count as hits.
+    """
+    def collect():
+        for cache, stats in caches.items():
+            values = stats()
+            lookups = (values or {}).get("hits", 0) + (values or {}).get("misses", 0)
+            if lookups:
+                yield {"cache": cache}, (values["hits"] + values.get("disk_hits", 0)) / lookups
+    return collect
+
+
+def render() -> str:
+    return REGISTRY.render()
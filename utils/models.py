@@ -0,0 +1,178 @@
+import os
+import time
+import logging
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+import spacy
+
+logger = logging.getLogger(__name__)
+
+SPACY_MODEL = "en_core_web_sm"
+SENTENCE_MODEL = "all-MiniLM-L6-v2"
+NLTK_RESOURCES = ("tokenizers/punkt_tab",)
+
+# One loaded model per name, shared by every extractor module and thread.
+# Loading is serialised so concurrent first requests never load twice.
+_pipelines = {}
+_views = {}
+_sentence_models = {}
+_load_lock = threading.Lock()
+load_seconds: Dict[str, float] = {}
+
+_process_started = (os.getpid(), time.monotonic())
+_ready = threading.Event()
+ready_seconds: Optional[float] = None
+
+
+class PipelineView:
+    """
+    A shared spaCy pipeline run with some components switched off for each
+    call, so callers that need less annotation reuse the one loaded model
+    instead of loading a trimmed copy of their own.
+    """
+
+    def __init__(self, nlp, disable: Tuple[str, ...]):
+        self.nlp = nlp
+        self.disable = disable
+
+    @property
+    def pipe_names(self):
+        return [name for name in self.nlp.pipe_names if name not in self.disable]
+
+    def __call__(self, text):
+        return self.nlp(text, disable=self.disable)
+
+    def pipe(self, texts, **kwargs):
+        return self.nlp.pipe(texts, disable=self.disable, **kwargs)
+
+
+def _load_spacy(name: str):
+    nlp = _pipelines.get(name)
+    if nlp is None:
+        with _load_lock:
+            nlp = _pipelines.get(name)
+            if nlp is None:
+                started = time.perf_counter()
+                nlp = spacy.load(name)
+                # Rule-based sentence splitting for views that skip the parser
+                nlp.add_pipe("sentencizer", first=True)
+                _pipelines[name] = nlp
+                load_seconds[f"spacy:{name}"] = time.perf_counter() - started
+                logger.info("Loaded spaCy pipeline %s in %.2fs", name, load_seconds[f"spacy:{name}"])
+    return nlp
+
+
+def get_nlp(name: str = SPACY_MODEL, exclude: Tuple[str, ...] = (), sentencizer: bool = False) -> PipelineView:
+    """
+    Return a view of the shared spaCy pipeline, loading the model once on
+    first use. ``exclude`` switches components off and ``sentencizer``
+    turns on rule-based sentence splitting; every combination shares the
+    same loaded model.
+    """
+    disable = tuple(sorted(set(exclude) | (set() if sentencizer else {"sentencizer"})))
+    key = (name, disable)
+    view = _views.get(key)
+    if view is None:
+        view = _views.setdefault(key, PipelineView(_load_spacy(name), disable))
+    return view
+
+
+def get_sentence_model(name: str = SENTENCE_MODEL):
+    """Return the shared SentenceTransformer, loading it on first use."""
+    model = _sentence_models.get(name)
+    if model is None:
+        with _load_lock:
+            model = _sentence_models.get(name)
+            if model is None:
+                from sentence_transformers import SentenceTransformer
+                started = time.perf_counter()
+                model = _sentence_models[name] = SentenceTransformer(name)
+                load_seconds[f"sentence:{name}"] = time.perf_counter() - started
+                logger.info("Loaded sentence model %s in %.2fs", name, load_seconds[f"sentence:{name}"])
+    return model
+
+
+def warmup() -> float:
+    """
+    Load the skill taxonomy and every model and run one tiny inference
+    through each model, so the first real request pays no load or
+    lazy-initialisation cost. Returns the seconds since this process
+    started (its cold start time).
+    """
+    global ready_seconds
+    from utils.profiles import get_profile
+    from utils.taxonomy import get_taxonomy
+    get_taxonomy()
+    # Every profile runs on the same loaded pipeline
+    profile = get_profile()
+    profile.nlp()("Warmup sentence for Python developers.")
+    get_sentence_model().encode(["warmup"])
+    # Other profiles build the semantic matcher on first use
+    if profile.semantic_skills:
+        from utils import semantic_skills
+        semantic_skills.get_matcher()
+    check_nltk_data()
+
+    pid, started = _process_started
+    ready_seconds = time.monotonic() - started
+    _ready.set()
+    logger.info("Models ready in %.2fs (pid %d, rss %.0f MiB)", ready_seconds, pid, rss_bytes() / 2**20)
+    return ready_seconds
+
+
+def is_ready() -> bool:
+    """True once warmed up, or once spaCy and the sentence model were loaded lazily."""
+    return _ready.is_set() or (bool(_pipelines) and SENTENCE_MODEL in _sentence_models)
+
+
+def mark_process_start() -> None:
+    """Reset the cold start clock in a freshly forked worker; models loaded
+    in the parent are inherited, so the worker is ready immediately."""
+    global _process_started, ready_seconds
+    _process_started = (os.getpid(), time.monotonic())
+    if _ready.is_set():
+        ready_seconds = 0.0
+
+
+def check_nltk_data(resources: Iterable[str] = NLTK_RESOURCES) -> Dict[str, bool]:
+    """Report which NLTK resources are installed. Never downloads; install
+    missing ones at build time with ``python -m nltk.downloader <name>``."""
+    import nltk
+    found = {}
+    for resource in resources:
+        try:
+            nltk.data.find(resource)
+            found[resource] = True
+        except LookupError:
+            found[resource] = False
+            logger.warning("NLTK resource %s is not installed", resource)
+    return found
+
+
+def memory_usage() -> Dict[str, int]:
+    """
+    Resident memory of this process in bytes. On Linux ``pss`` and
+    ``private`` show how much of it is really owned by this worker rather
+    than shared copy-on-write with the pre-fork master.
+    """
+    usage = {"rss": rss_bytes()}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+    except OSError:
+        return usage
+    kib = lambda key: int(fields.get(key, "0 kB").split()[0]) * 1024
+    usage["pss"] = kib("Pss")
+    usage["shared"] = kib("Shared_Clean") + kib("Shared_Dirty")
+    usage["private"] = kib("Private_Clean") + kib("Private_Dirty")
+    return usage
+
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
@@ -0,0 +1,228 @@
+import os
+import re
+import sqlite3
+import hashlib
+import threading
+import time
+import zlib
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+DEFAULT_INDEX_PATH = os.environ.get('RESUME_DUPLICATE_INDEX', os.path.join('cache', 'duplicates.sqlite3'))
+# Estimated Jaccard similarity of word shingles above which two resumes count
+# as copies. An edited copy scores 0.85+ against its original, the PDF and
+# DOCX of one resume (different reading order, line wraps, hyphenation) about
+# 0.5 and up; unrelated resumes stay under 0.2, resumes pasted into the same
+# template under 0.45
+DEFAULT_THRESHOLD = float(os.environ.get('RESUME_DUPLICATE_THRESHOLD', '0.5'))
+
+SHINGLE_WORDS = 3
+NUM_PERM = 120
+BANDS = 40                     # LSH bands of NUM_PERM // BANDS rows; pairs at 0.5 share a bucket 99.5% of the time
+ROWS = NUM_PERM // BANDS
+_SEED = 1
+_NORMALIZATION = 2             # bump when normalize() changes
+
+# Changing any of these makes stored signatures incomparable with new ones
+SIGNATURE_VERSION = f"{SHINGLE_WORDS}-{NUM_PERM}-{BANDS}-{_SEED}-{_NORMALIZATION}"
+
+_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.RandomState(_SEED)
+_A = _rng.randint(1, int(_PRIME), size=(NUM_PERM, 1)).astype(np.uint64)
+_B = _rng.randint(0, int(_PRIME), size=(NUM_PERM, 1)).astype(np.uint64)
+
+# Runs of letters or of digits only, so the PDF and DOCX text of one resume,
+# which differ in bullets, punctuation, spacing ("Dec2024") and line breaks,
+# give the same words
+_WORD = re.compile(r"[a-z]+|[0-9]+")
+# A word split across a line break by PDF hyphenation ("learn-\ning")
+_HYPHENATED = re.compile(r"([a-z])-[ \t]*\r?\n[ \t]*([a-z])")
+# Filler words that PDF line wraps and edits shuffle around without changing content
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it its of on or that the this to using via was were with".split()
+)
+
+
+class Match(NamedTuple):
+    content_key: str
+    filename: str
+    similarity: float
+
+
+def normalize(text: str) -> List[str]:
+    """The content words of ``text`` in reading order, independent of layout."""
+    text = _HYPHENATED.sub(r"\1\2", text.lower())
+    return [word for word in _WORD.findall(text) if word not in _STOPWORDS]
+
+
+def shingles(text: str, size: int = SHINGLE_WORDS) -> np.ndarray:
+    """Distinct 32-bit hashes of every run of ``size`` consecutive content words."""
+    words = normalize(text)
+    if len(words) < size:
+        return np.empty(0, dtype=np.uint64)
+    hashes = {
+        zlib.crc32(" ".join(words[i:i + size]).encode('utf-8'))
+        for i in range(len(words) - size + 1)
+    }
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+
+def signature(text: str) -> Optional[np.ndarray]:
+    """
+    MinHash signature of ``text``: for each of ``NUM_PERM`` hash functions
+    the smallest hash over its shingles. The fraction of positions where two
+    signatures agree estimates the Jaccard similarity of their shingle sets.
+    Texts too short to shingle (e.g. scanned PDFs) have no signature.
+    """
+    hashes = shingles(text)
+    if not len(hashes):
+        return None
+    return ((_A * (hashes % _PRIME) + _B) % _PRIME).min(axis=1).astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+def band_keys(sig: np.ndarray) -> List[int]:
+    """One bucket id per band; two signatures sharing any bucket are candidates."""
+    keys = []
+    for band in range(BANDS):
+        digest = hashlib.blake2b(sig[band * ROWS:(band + 1) * ROWS].tobytes(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'little', signed=True))
+    return keys
+
+
+class NearDuplicateIndex:
+    """
+    On-disk MinHash/LSH index of resume texts.
+
+    Each resume's signature is split into ``BANDS`` bands and every band is
+    hashed into a bucket. A query only compares against resumes sharing at
+    least one bucket, so it costs a few index lookups however many resumes
+    were ingested, and candidates are confirmed by their full signature.
+    ``":memory:"`` gives a throwaway index for a single batch.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._memory = None
+        if path == ":memory:":
+            self._memory = sqlite3.connect(path, check_same_thread=False)
+        conn = self._connect()
+        with conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS signatures (
+                    content_key TEXT PRIMARY KEY,
+                    filename TEXT,
+                    signature BLOB NOT NULL,
+                    updated REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS buckets (
+                    band INTEGER NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    content_key TEXT NOT NULL,
+                    PRIMARY KEY (band, bucket, content_key)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS buckets_content_key ON buckets (content_key);
+                """
+            )
+            row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != SIGNATURE_VERSION:
+                # Signatures from other parameters can't be compared: start over
+                conn.execute("DELETE FROM signatures")
+                conn.execute("DELETE FROM buckets")
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (SIGNATURE_VERSION,)
+                )
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._memory is not None:
+            return self._memory
+        # One connection per thread, and never one inherited across a fork
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def add(self, content_key: str, filename: str, sig: np.ndarray) -> None:
+        """
+        Index the signature of one resume. A text that is already indexed
+        keeps the filename it was first seen under, the one matches report.
+        """
+        conn = self._connect()
+        with conn:
+            inserted = conn.execute(
+                """INSERT INTO signatures (content_key, filename, signature, updated) VALUES (?, ?, ?, ?)
+                   ON CONFLICT (content_key) DO NOTHING""",
+                (content_key, filename, sig.astype(np.uint32).tobytes(), time.time())
+            ).rowcount
+            if not inserted:
+                return
+            conn.executemany(
+                "INSERT OR IGNORE INTO buckets (band, bucket, content_key) VALUES (?, ?, ?)",
+                [(band, bucket, content_key) for band, bucket in enumerate(band_keys(sig))]
+            )
+
+    def query(self, sig: np.ndarray, threshold: float = DEFAULT_THRESHOLD) -> List[Match]:
+        """Indexed resumes whose estimated similarity to ``sig`` is at least ``threshold``, best first."""
+        conn = self._connect()
+        clauses = " OR ".join(["(band = ? AND bucket = ?)"] * BANDS)
+        params = [value for band, bucket in enumerate(band_keys(sig)) for value in (band, bucket)]
+        rows = conn.execute(
+            f"""SELECT s.content_key, s.filename, s.signature FROM signatures s
+                JOIN (SELECT DISTINCT content_key FROM buckets WHERE {clauses}) hits
+                  ON hits.content_key = s.content_key""",
+            params
+        ).fetchall()
+
+        matches = []
+        for content_key, filename, blob in rows:
+            score = similarity(sig, np.frombuffer(blob, dtype=np.uint32))
+            if score >= threshold:
+                matches.append(Match(content_key, filename, score))
+        matches.sort(key=lambda m: m.similarity, reverse=True)
+        return matches
+
+    def find(self, sig: np.ndarray, threshold: float = DEFAULT_THRESHOLD) -> Optional[Match]:
+        """The closest indexed resume above ``threshold``, or None."""
+        matches = self.query(sig, threshold)
+        return matches[0] if matches else None
+
+    def __len__(self) -> int:
+        (count,) = self._connect().execute("SELECT COUNT(*) FROM signatures").fetchone()
+        return count
+
+
+_default_index: Optional[NearDuplicateIndex] = None
+_default_lock = threading.Lock()
+
+
+def configure(path: Optional[str]) -> Optional[NearDuplicateIndex]:
+    """
+    Point the process-wide index at ``path``; an empty path disables it,
+    and bulk batches are then only checked against themselves.
+    """
+    global _default_index
+    with _default_lock:
+        if path:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            _default_index = NearDuplicateIndex(path)
+        else:
+            _default_index = None
+    return _default_index
+
+
+def get_index() -> Optional[NearDuplicateIndex]:
+    return _default_index
@@ -0,0 +1,168 @@
+import os
+import logging
+from typing import Dict, Optional, Union
+
+from utils.jd_profile import JDProfile, compile_jd, jd_hash
+from utils.profiles import AnalysisProfile, get_profile
+from utils.resume_analysis import ResumeAnalysis, analyze_resume
+from utils import (
+    candidate_index,
+    semantic_index,
+    result_cache,
+    text_cache,
+    text_extraction,
+    skill_extraction,
+    project_extraction,
+    scoring
+)
+from utils.metrics import span, DOCUMENT_SIZE
+from utils.taxonomy import get_taxonomy, pinned
+
+logger = logging.getLogger(__name__)
+
+def score_analysis(
+    analysis: ResumeAnalysis,
+    jd_text: Optional[str] = None,
+    jd_profile: Optional[JDProfile] = None
+) -> Dict:
+    """
+    Score an already analyzed resume against one JD. Only the JD-dependent
+    steps run here (skill comparison, scoring, feedback), so scoring one
+    resume against N JDs costs one analysis plus N of these calls.
+    """
+    if jd_profile is None or jd_profile.taxonomy != get_taxonomy().version:
+        jd_profile = compile_jd(jd_text if jd_profile is None else jd_profile.text)
+    jd_skills = jd_profile.skills
+    logger.debug("%d resume skills, %d JD skills", len(analysis.skills), len(jd_skills))
+
+    # 👉 Compare
+    with span("compare_skills"):
+        skill_comparison = skill_extraction.compare_skills(
+            analysis.skills, jd_skills, jd_vector=jd_profile.vector
+        )
+    skill_comparison["jd_skills"] = jd_skills
+
+    with span("calculate_score"):
+        score = scoring.calculate_score(
+            skill_comparison,
+            analysis.projects,
+            jd_profile.text,
+            experience=analysis.experience,
+            has_internship_or_achievements=analysis.has_internship_or_achievements
+        )
+    score = min(max(score, 0), 100)
+    feedback = scoring.generate_feedback(score, skill_comparison["missing_skills"])
+    with span("evaluate_projects"):
+        project_feedback = project_extraction.evaluate_projects_against_jd(
+            analysis.projects, jd_profile.text, jd_keywords=jd_profile.keywords
+        )
+
+    return {
+        "resume_info": analysis.resume_info,
+        "common_skills": skill_comparison["common_skills"],
+        "missing_skills": skill_comparison["missing_skills"],
+        "projects": analysis.projects,
+        "score": score,
+        "feedback": feedback,
+        "project_feedback": project_feedback,
+        # Score inputs, kept so the candidate index can re-score without re-parsing
+        "resume_skills": analysis.skills,
+        "experience": analysis.experience,
+        "has_internship_or_achievements": analysis.has_internship_or_achievements,
+        "analysis_profile": analysis.profile,
+        "analysis_id": analysis.analysis_id,
+        "jd_id": jd_profile.jd_id
+    }
+
+def process_resume_and_jd(
+    resume_text,
+    jd_text=None,
+    jd_profile: Optional[JDProfile] = None,
+    analysis_profile: Union[str, AnalysisProfile, None] = None
+):
+    """
+    Analyze one resume against one JD and return the dict rendered by
+    results.html. Pass ``jd_profile`` to reuse an already compiled JD;
+    otherwise ``jd_text`` is compiled (or fetched from the profile cache).
+    ``analysis_profile`` ("accurate" or "fast") selects the spaCy pipeline
+    and whether projects are de-duplicated by embedding similarity.
+    """
+    DOCUMENT_SIZE.observe(len(resume_text), kind="resume_chars")
+    # One taxonomy for the whole request, even if a reload lands midway
+    with pinned():
+        with span("analyze_resume"):
+            analysis = analyze_resume(resume_text, analysis_profile)
+        return score_analysis(analysis, jd_text, jd_profile=jd_profile)
+
+def analyze_upload(
+    data: bytes,
+    filename: str,
+    analysis_profile: Union[str, AnalysisProfile, None] = None
+) -> ResumeAnalysis:
+    """
+    Extract (or fetch cached) text from uploaded resume bytes and analyze
+    it (or fetch the cached analysis), with no JD involved.
+    """
+    DOCUMENT_SIZE.observe(len(data), kind="upload_bytes")
+    with span("extract_text"):
+        resume_text, content_key = text_extraction.extract_text_cached(data, filename)
+    DOCUMENT_SIZE.observe(len(resume_text), kind="resume_chars")
+    with span("analyze_resume"):
+        return analyze_resume(resume_text, analysis_profile, content_key=content_key)
+
+def upload_result_key(
+    data: bytes,
+    filename: str,
+    jd_text: Optional[str] = None,
+    jd_profile: Optional[JDProfile] = None,
+    analysis_profile: Union[str, AnalysisProfile, None] = None
+) -> str:
+    """
+    Result cache key ``process_upload`` uses for these arguments, computed
+    from hashes alone; nothing is extracted or analyzed.
+    """
+    return result_cache.result_key(
+        text_cache.content_key(data, os.path.splitext(filename)[1]),
+        jd_profile.jd_id if jd_profile is not None else jd_hash(jd_text),
+        get_profile(analysis_profile).name,
+        get_taxonomy().version
+    )
+
+def process_upload(
+    data: bytes,
+    filename: str,
+    jd_text: Optional[str] = None,
+    jd_profile: Optional[JDProfile] = None,
+    analysis_profile: Union[str, AnalysisProfile, None] = None
+) -> Dict:
+    """
+    Analyze uploaded resume bytes, score them against the JD and record
+    the candidate in the candidate index (and its embeddings in the
+    semantic index, when both are enabled). Results are cached under
+    ``upload_result_key``, returned as ``result_id``; a resubmitted
+    (resume, JD) pair is answered from the cache without any of that work.
+    """
+    cache = result_cache.get_cache()
+    content_key = text_cache.content_key(data, os.path.splitext(filename)[1])
+    with pinned():
+        key = upload_result_key(data, filename, jd_text, jd_profile, analysis_profile)
+        results = cache.get(key)
+        if results is not None:
+            return results
+
+        analysis = analyze_upload(data, filename, analysis_profile)
+        with span("score_analysis"):
+            results = score_analysis(analysis, jd_text, jd_profile=jd_profile)
+        results["result_id"] = key
+
+    index = candidate_index.get_index()
+    if index is not None:
+        with span("index_candidate"):
+            candidate_id = index.add(content_key, filename, results)
+        vectors = semantic_index.get_index()
+        if vectors is not None and candidate_id not in vectors:
+            with span("index_embeddings"):
+                resume_text, _ = text_extraction.extract_text_cached(data, filename)
+                vectors.add(candidate_id, resume_text)
+    cache.put(key, results)
+    return results
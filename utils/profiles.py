@@ -0,0 +1,61 @@
+from dataclasses import dataclass
+from typing import FrozenSet, Optional, Tuple
+
+from utils.models import SPACY_MODEL, get_nlp
+
+# en_core_web_sm components each Doc annotation depends on
+SPACY_COMPONENTS = ("tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner")
+FEATURE_COMPONENTS = {
+    "sents": ("tok2vec", "parser"),
+    "ents": ("ner",),
+    "noun_chunks": ("tok2vec", "tagger", "attribute_ruler", "parser"),
+}
+
+
+@dataclass(frozen=True)
+class AnalysisProfile:
+    """
+    How much NLP work one analysis does.
+
+    ``features`` lists the Doc annotations the downstream extractors read
+    (``sents`` for project lines, ``ents`` for the name fallback,
+    ``noun_chunks`` for semantic skill matching); only the spaCy components
+    those need are run; every profile shares one loaded pipeline.
+    """
+    name: str
+    features: FrozenSet[str]
+    rule_sentences: bool = False   # sentencizer instead of the dependency parser
+    semantic_dedup: bool = True    # embedding-based project de-duplication
+    semantic_skills: bool = False  # embedding-based fuzzy skill matching
+
+    def components(self) -> Tuple[str, ...]:
+        needed = set()
+        for feature in self.features:
+            if feature == "sents" and self.rule_sentences:
+                continue
+            needed.update(FEATURE_COMPONENTS[feature])
+        return tuple(c for c in SPACY_COMPONENTS if c in needed)
+
+    def nlp(self):
+        """The shared spaCy pipeline with only this profile's components switched on."""
+        exclude = tuple(c for c in SPACY_COMPONENTS if c not in self.components())
+        return get_nlp(SPACY_MODEL, exclude=exclude, sentencizer=self.rule_sentences)
+
+
+ACCURATE = AnalysisProfile("accurate", frozenset({"sents", "ents"}))
+FAST = AnalysisProfile("fast", frozenset({"sents"}), rule_sentences=True, semantic_dedup=False)
+# Opt-in: accurate plus fuzzy skill matching, one extra encode per resume
+SEMANTIC = AnalysisProfile("semantic", frozenset({"sents", "ents", "noun_chunks"}), semantic_skills=True)
+
+PROFILES = {profile.name: profile for profile in (ACCURATE, FAST, SEMANTIC)}
+DEFAULT_PROFILE = ACCURATE.name
+
+
+def get_profile(name: Optional[str] = None) -> AnalysisProfile:
+    """Profile by name; None or an empty name gives the default profile."""
+    if isinstance(name, AnalysisProfile):
+        return name
+    try:
+        return PROFILES[name or DEFAULT_PROFILE]
+    except KeyError:
+        raise ValueError(f"Unknown analysis profile: {name} (expected one of {', '.join(PROFILES)})")
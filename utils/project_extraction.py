@@ -1,11 +1,12 @@
 import re
-import spacy
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from typing import List, Dict
+from typing import List, Dict, Optional
 
-nlp = spacy.load("en_core_web_sm")
-model = SentenceTransformer("all-MiniLM-L6-v2")
+from utils import embeddings
+from utils.document import AnalyzedDocument
+from utils.models import get_sentence_model
+from utils.sections import EXPERIENCE, PROJECTS, SKILLS
+from utils.taxonomy import get_taxonomy
 
 PROJECT_KEYWORDS = [
     "project", "developed", "built", "created", "implemented",
@@ -15,29 +16,48 @@ PROJECT_KEYWORDS = [
 
 EXCLUDE_SECTION_KEYWORDS = ["education", "mentor", "activities"]
 
-KNOWN_SKILLS = [
-    "python", "flask", "django", "tensorflow", "nlp",
-    "react", "node.js", "machine learning", "deep learning",
-    "data analysis", "pandas", "numpy", "sql", "html", "css",
-    "javascript", "transformers", "scikit-learn", "hugging face",
-    "google colab", "mysql", "mongodb"
-]
-
-RELATED_SKILLS = {
-    # unchanged - same mappings
-    # your original RELATED_SKILLS block here
-}
-
-def extract_projects(text: str) -> List[Dict[str, List[str]]]:
+def extract_projects(
+    text: str,
+    doc: Optional[AnalyzedDocument] = None,
+    semantic_dedup: bool = True
+) -> List[Dict[str, List[str]]]:
+    return deduplicate_projects(find_project_candidates(text, doc=doc), semantic=semantic_dedup)
+
+def find_project_candidates(text: str, doc: Optional[AnalyzedDocument] = None) -> List[Dict[str, List[str]]]:
+    """
+    Project-like sentences with their skills, before de-duplication. When
+    the resume has skills, projects or experience sections only those are
+    parsed (skills included so semantic skill matching shares the parse),
+    and the projects section comes from the segmenter rather than from
+    sentences that mention "projects". Without any of them the whole text
+    is read as before, even if it has other headings.
+    """
     projects = []
-    doc = nlp(text)
+    if doc is None:
+        doc = AnalyzedDocument(text, sectioned=True)
+    focused = doc.focus(SKILLS, PROJECTS, EXPERIENCE)
+    structured = focused is not doc
+    doc = focused
     inside_projects_section = False
 
     for sentence in doc.sents:
         line = sentence.text.strip()
         lower_line = line.lower()
 
-        if "projects" in lower_line:
+        if structured:
+            # Sentences may open with the blank lines that end the previous section
+            start = sentence.start_char + len(sentence.text) - len(sentence.text.lstrip())
+            section = doc.section_at(start)
+            if section.kind == SKILLS:
+                continue
+            inside_projects_section = section.kind == PROJECTS
+            # The parser may glue the heading line onto the first sentence
+            if start < section.body and line.startswith(section.heading):
+                line = line[len(section.heading):].strip()
+                lower_line = line.lower()
+                if not line:
+                    continue
+        elif "projects" in lower_line:
             inside_projects_section = True
             continue
 
@@ -63,27 +83,51 @@ def extract_projects(text: str) -> List[Dict[str, List[str]]]:
             if skills:
                 projects.append({"name": name, "skills": skills})
 
-    return deduplicate_projects(projects)
+    return projects
+
+def deduplicate_projects(
+    projects: List[Dict[str, List[str]]],
+    threshold: float = 0.75,
+    semantic: bool = True
+) -> List[Dict[str, List[str]]]:
+    """
+    Drop projects whose name is a repeat or semantically close (> threshold)
+    to an earlier kept project. All names are embedded in one batched call
+    and compared through a single cosine-similarity matrix; with
+    ``semantic=False`` only exact (case-insensitive) repeats are dropped.
+    """
+    if not projects:
+        return []
+
+    if semantic:
+        vectors = embeddings.encode([p["name"] for p in projects])
+        similarity = vectors @ vectors.T
 
-def deduplicate_projects(projects: List[Dict[str, List[str]]], threshold: float = 0.75) -> List[Dict[str, List[str]]]:
     unique = []
+    kept = []
     seen_names = set()
-    for p1 in projects:
+    for i, p1 in enumerate(projects):
         name_clean = p1["name"].lower().strip()
         if name_clean in seen_names:
             continue
-        if not any(calculate_project_similarity(p1["name"], p2["name"]) > threshold for p2 in unique):
+        if not semantic or not kept or not np.any(similarity[i, kept] > threshold):
             unique.append(p1)
+            kept.append(i)
             seen_names.add(name_clean)
     return unique
 
 def calculate_project_similarity(p1: str, p2: str) -> float:
-    emb = model.encode([p1, p2])
-    return np.dot(emb[0], emb[1]) / (np.linalg.norm(emb[0]) * np.linalg.norm(emb[1]))
-
-def evaluate_projects_against_jd(projects: List[Dict[str, List[str]]], job_description: str) -> List[str]:
+    emb = embeddings.encode([p1, p2])
+    return float(np.dot(emb[0], emb[1]))
+
+def evaluate_projects_against_jd(
+    projects: List[Dict[str, List[str]]],
+    job_description: str,
+    jd_keywords: Optional[set] = None
+) -> List[str]:
     results = []
-    jd_keywords = get_all_jd_skills(job_description)
+    if jd_keywords is None:
+        jd_keywords = get_all_jd_skills(job_description)
 
     for project in projects:
         project_skills = set(project["skills"])
@@ -93,23 +137,29 @@ def evaluate_projects_against_jd(projects: List[Dict[str, List[str]]], job_descr
             results.append(f"❌ The project '{project['name']}' does not directly match the JD.")
     return results
 
-def extract_skills(text: str) -> List[str]:
+def _match_known_skills(text: str) -> set:
+    """KNOWN_SKILLS mentioned in text plus their RELATED_SKILLS, in one pass."""
+    taxonomy = get_taxonomy()
     found = set()
-    lower_text = text.lower()
-    for skill in KNOWN_SKILLS:
-        if skill in lower_text:
-            found.add(skill)
-            related = RELATED_SKILLS.get(skill, [])
-            for rel in related:
-                found.add(rel)
-    return list(found)
+    for skill in taxonomy.matcher.find_all(text) & taxonomy.known_skill_set:
+        found.add(skill)
+        found.update(taxonomy.project_related.get(skill, []))
+    return found
+
+def extract_skills(text: str) -> List[str]:
+    return list(_match_known_skills(text))
 
 def get_all_jd_skills(jd_text: str) -> set:
-    jd_skills = set()
-    jd_lower = jd_text.lower()
-    for skill in KNOWN_SKILLS:
-        if skill in jd_lower:
-            jd_skills.add(skill)
-            related = RELATED_SKILLS.get(skill, [])
-            jd_skills.update(related)
-    return jd_skills
+    return _match_known_skills(jd_text)
+
+
+def __getattr__(name):
+    # ``model`` used to be loaded at import time; keep it reachable, lazily
+    if name == "model":
+        return get_sentence_model()
+    # The skill tables moved to data/skill_taxonomy.json
+    if name == "KNOWN_SKILLS":
+        return get_taxonomy().known_skills
+    if name == "RELATED_SKILLS":
+        return get_taxonomy().project_related
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,113 @@
+import os
+import json
+import hashlib
+import threading
+from functools import lru_cache
+from typing import Dict, Optional
+
+from utils.cache import LRUCache
+from utils.text_cache import TextCache
+
+# Empty keeps results in memory only; set a directory to share them across
+# workers and restarts
+DEFAULT_CACHE_DIR = os.environ.get('RESUME_RESULT_CACHE_DIR', '')
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # on-disk budget
+DEFAULT_MEMORY_ITEMS = 1024
+
+# Modules whose code decides what a results dict contains, from text
+# extraction through matching to scoring. Their source is part of every
+# result key, so editing any of them retires old entries.
+SCORER_MODULES = (
+    "scoring",
+    "pipeline",
+    "resume_analysis",
+    "information_extraction",
+    "project_extraction",
+    "skill_extraction",
+    "profiles",
+    "document",
+    "sections",
+    "jd_profile",
+    "taxonomy",
+    "skill_matcher",
+    "skill_index",
+    "semantic_skills",
+    "embeddings",
+    "models",
+    "text_extraction",
+    "word_reader",
+)
+
+
+@lru_cache(maxsize=None)
+def scorer_version() -> str:
+    """Hash of the source of ``SCORER_MODULES`` as deployed in this process."""
+    digest = hashlib.sha256()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in SCORER_MODULES:
+        with open(os.path.join(here, f"{name}.py"), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def result_key(resume_key: str, jd_id: str, analysis_profile: str, taxonomy_version: str) -> str:
+    """
+    Key of one scoring result: the resume's content key, the normalized JD
+    hash, the analysis profile, the skill taxonomy version and the scorer
+    version. Identical inputs scored by identical code share a key.
+    """
+    material = "|".join((resume_key, jd_id, analysis_profile, taxonomy_version, scorer_version()))
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()[:32]
+
+
+class ResultCache:
+    """
+    Final results dicts keyed by ``result_key``, stored as JSON.
+
+    Without a directory this is a plain in-memory LRU. With one, entries
+    also go to a size-bounded ``TextCache`` directory behind its memory
+    LRU, so a result computed by one worker is served by all of them.
+    Every lookup returns a fresh dict that callers may modify.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        memory_items: int = DEFAULT_MEMORY_ITEMS
+    ):
+        self.directory = directory or None
+        if self.directory:
+            self._store = TextCache(self.directory, max_bytes, memory_items)
+        else:
+            self._store = LRUCache(maxsize=memory_items)
+
+    def get(self, key: str) -> Optional[Dict]:
+        data = self._store.get(key)
+        return json.loads(data) if data is not None else None
+
+    def put(self, key: str, results: Dict) -> None:
+        self._store.put(key, json.dumps(results))
+
+    def stats(self) -> Dict[str, int]:
+        return self._store.stats()
+
+
+_default_cache: Optional[ResultCache] = None
+_default_lock = threading.Lock()
+
+
+def configure(directory: Optional[str] = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES) -> ResultCache:
+    """Replace the process-wide cache, e.g. with the app's configured directory."""
+    global _default_cache
+    with _default_lock:
+        _default_cache = ResultCache(directory, max_bytes)
+    return _default_cache
+
+
+def get_cache() -> ResultCache:
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache()
+        return _default_cache
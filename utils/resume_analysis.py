@@ -0,0 +1,183 @@
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+from dataclasses import asdict, dataclass, field, replace
+from typing import Dict, List, Optional, Union
+
+from utils.cache import LRUCache
+from utils.text_cache import TextCache
+from utils.document import AnalyzedDocument
+from utils.profiles import AnalysisProfile, get_profile
+from utils.metrics import span
+from utils.taxonomy import get_taxonomy, pinned
+from utils import (
+    information_extraction,
+    skill_extraction,
+    project_extraction
+)
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_CACHE_SIZE = 512
+ANALYSIS_VERSION = 2  # bump when the fields below change meaning
+# Serialized analyses shared by all workers; empty keeps them in this process only
+DEFAULT_STORE_DIR = os.environ.get('RESUME_ANALYSIS_DIR', os.path.join('cache', 'analyses'))
+DEFAULT_STORE_MAX_BYTES = 256 * 1024 * 1024  # on-disk budget
+
+_ANALYSIS_ID = re.compile(r'^[0-9a-f]{32}-[a-z_]+$')
+
+# Analyses keyed by analysis_id, so re-scoring a resume never re-parses it
+_analyses = LRUCache(maxsize=ANALYSIS_CACHE_SIZE)
+
+
+@dataclass
+class ResumeAnalysis:
+    """
+    Everything the pipeline derives from a resume alone: it does not depend
+    on any JD, so one analysis can be scored against any number of JDs.
+    """
+    analysis_id: str
+    profile: str                          # analysis profile that produced it
+    resume_info: Dict[str, Optional[str]]
+    projects: List[Dict]
+    skills: List[str]                     # text + project skills, sorted
+    experience: bool
+    has_internship_or_achievements: bool
+    content_key: Optional[str] = None     # text cache key of the source file
+    taxonomy: str = ""                    # skill taxonomy version used
+    version: int = field(default=ANALYSIS_VERSION)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ResumeAnalysis":
+        if data.get("version", ANALYSIS_VERSION) != ANALYSIS_VERSION:
+            raise ValueError(f"Unsupported resume analysis version: {data.get('version')}")
+        return cls(**data)
+
+
+def analysis_id(resume_text: str, profile: str) -> str:
+    digest = hashlib.sha256(resume_text.encode('utf-8')).hexdigest()[:32]
+    return f"{digest}-{profile}"
+
+
+def analyze_resume(
+    resume_text: str,
+    analysis_profile: Union[str, AnalysisProfile, None] = None,
+    content_key: Optional[str] = None
+) -> ResumeAnalysis:
+    """
+    Return the cached analysis of this text, running the extractors on a
+    miss or when the cached one used an older skill taxonomy. The cached
+    analysis is shared, so a different ``content_key`` is set on a copy.
+    """
+    if not isinstance(resume_text, str):
+        raise ValueError("Expected text to be a string")
+    profile = get_profile(analysis_profile)
+    key = analysis_id(resume_text, profile.name)
+    analysis = get_analysis(key)
+    if analysis is not None and analysis.taxonomy == get_taxonomy().version:
+        if content_key is not None and analysis.content_key != content_key:
+            return replace(analysis, content_key=content_key)
+        return analysis
+
+    with pinned() as taxonomy:
+        analysis = _analyze(resume_text, profile, key, content_key)
+        analysis.taxonomy = taxonomy.version
+    _analyses.put(key, analysis)
+    store = get_store()
+    if store is not None:
+        store.put(key, json.dumps(analysis.to_dict()))
+    return analysis
+
+
+def _analyze(resume_text: str, profile: AnalysisProfile, key: str, content_key: Optional[str]) -> ResumeAnalysis:
+    # 👉 Segment once; each extractor reads (and parses) only its sections
+    resume_doc = AnalyzedDocument(resume_text, nlp=profile.nlp(), sectioned=True)
+
+    with span("extract_information"):
+        resume_info = information_extraction.extract_information(resume_text, resume_doc.lines, doc=resume_doc)
+
+    with span("extract_projects"):
+        projects = project_extraction.extract_projects(
+            resume_text, doc=resume_doc, semantic_dedup=profile.semantic_dedup
+        )
+
+    # 👉 Skills found inside projects plus the ones stated directly
+    project_skills = set()
+    for p in projects:
+        project_skills.update(p["skills"])
+
+    with span("extract_all_skills"):
+        resume_skills = skill_extraction.extract_all_skills(
+            resume_text, doc=resume_doc, semantic=profile.semantic_skills
+        )
+
+    lower_text = resume_text.lower()
+    return ResumeAnalysis(
+        analysis_id=key,
+        profile=profile.name,
+        resume_info=resume_info,
+        projects=projects,
+        skills=sorted(set(resume_skills) | project_skills),
+        experience="experience" in lower_text,
+        has_internship_or_achievements=any(
+            word in lower_text for word in ["internship", "leetcode", "kaggle"]
+        ),
+        content_key=content_key
+    )
+
+
+def get_analysis(key: str) -> Optional[ResumeAnalysis]:
+    """
+    Analysis for ``key`` from this process or, on a miss, from the on-disk
+    store written by any worker. None if unknown or evicted from both.
+    """
+    analysis = _analyses.get(key)
+    if analysis is not None:
+        return analysis
+    store = get_store()
+    if store is None or not _ANALYSIS_ID.match(key):
+        return None
+    data = store.get(key)
+    if data is None:
+        return None
+    try:
+        analysis = ResumeAnalysis.from_dict(json.loads(data))
+    except (ValueError, TypeError) as e:
+        logger.warning("Ignoring stored analysis %s: %s", key, e)
+        return None
+    _analyses.put(key, analysis)
+    return analysis
+
+
+_default_store: Optional[TextCache] = None
+_store_configured = False
+_default_lock = threading.Lock()
+
+
+def configure(
+    directory: Optional[str] = DEFAULT_STORE_DIR,
+    max_bytes: int = DEFAULT_STORE_MAX_BYTES
+) -> Optional[TextCache]:
+    """Point the process-wide analysis store at ``directory``; an empty one disables it."""
+    global _default_store, _store_configured
+    with _default_lock:
+        # _analyses already keeps decoded analyses in memory
+        _default_store = TextCache(directory, max_bytes, memory_items=1) if directory else None
+        _store_configured = True
+    return _default_store
+
+
+def get_store() -> Optional[TextCache]:
+    if not _store_configured:
+        configure()
+    return _default_store
+
+
+def cache_stats():
+    return _analyses.stats()
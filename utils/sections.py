@@ -0,0 +1,101 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+HEADER = "header"              # everything before the first heading: name, contact
+SKILLS = "skills"
+PROJECTS = "projects"
+EXPERIENCE = "experience"
+EDUCATION = "education"
+ACHIEVEMENTS = "achievements"
+OTHER = "other"                # summary, objective, interests, ...
+
+# The word of a heading that gives its type; the first one found wins, so
+# "Education History" is education and "Work History" is experience
+HEADING_KEYWORDS: Dict[str, str] = {
+    **dict.fromkeys(["skills", "skill", "technologies", "tools", "competencies",
+                     "expertise", "stack", "proficiencies"], SKILLS),
+    **dict.fromkeys(["projects", "project"], PROJECTS),
+    **dict.fromkeys(["experience", "experiences", "employment", "internships",
+                     "internship", "history"], EXPERIENCE),
+    **dict.fromkeys(["education", "academics", "qualifications", "coursework"], EDUCATION),
+    **dict.fromkeys(["achievements", "awards", "honors", "honours", "certifications",
+                     "certificates", "accomplishments", "activities", "extracurricular",
+                     "extracurriculars", "publications", "societies", "volunteering"], ACHIEVEMENTS),
+    **dict.fromkeys(["summary", "objective", "profile", "about", "interests", "hobbies",
+                     "languages", "references", "declaration"], OTHER),
+}
+# Words allowed next to a keyword, e.g. "Technical Skills", "Work Experience"
+HEADING_QUALIFIERS = frozenset([
+    "technical", "work", "professional", "relevant", "academic", "personal", "key",
+    "core", "selected", "other", "soft", "industry", "research", "notable", "major",
+    "additional", "career", "and", "me", "my", "tech", "software",
+])
+MAX_HEADING_WORDS = 4
+
+_WORD = re.compile(r"[a-z]+")
+
+
+@dataclass(frozen=True)
+class Section:
+    """A typed span of a resume: ``text[start:end]``, heading line included."""
+    kind: str
+    start: int
+    end: int
+    heading: str = ""
+    body: int = 0       # offset just past the heading line
+
+    def rebase(self, start: int) -> "Section":
+        """The same section moved to begin at ``start``."""
+        shift = start - self.start
+        return Section(self.kind, start, self.end + shift, self.heading, self.body + shift)
+
+
+def heading_kind(line: str) -> Optional[str]:
+    """
+    Section type of a heading line such as "TECHNICAL SKILLS", "💼 Work
+    Experience" or "Projects:", or None if the line is not a heading. Lines
+    with content after the colon ("Skills: Python, SQL") are not headings.
+    """
+    line = line.strip()
+    if not line or len(line) > 60:
+        return None
+    head, _, rest = line.partition(":")
+    if rest.strip():
+        return None
+    words = _WORD.findall(head.lower())
+    if not words or len(words) > MAX_HEADING_WORDS:
+        return None
+    # Nothing but letters, spacing, "&" and decoration (emoji, bullets, numbering)
+    if any(c.isalpha() and not c.isascii() for c in head):
+        return None
+    kind = None
+    for word in words:
+        if word in HEADING_KEYWORDS:
+            kind = kind or HEADING_KEYWORDS[word]
+        elif word not in HEADING_QUALIFIERS:
+            return None
+    return kind
+
+
+def segment(text: str) -> List[Section]:
+    """
+    Split ``text`` into consecutive typed sections in one pass over its
+    lines. The sections cover the whole text; a heading starts a section
+    that runs to the next heading of another type. Text before the first
+    heading is the header.
+    """
+    sections: List[Section] = []
+    kind, start, heading, body = HEADER, 0, "", 0
+    offset = 0
+    for line in text.split("\n"):
+        found = heading_kind(line)
+        if found is not None and found != kind:
+            if offset > start:
+                sections.append(Section(kind, start, offset, heading, body))
+            kind, start, heading = found, offset, line.strip()
+            body = min(offset + len(line) + 1, len(text))
+        offset += len(line) + 1
+    if len(text) > start:
+        sections.append(Section(kind, start, len(text), heading, body))
+    return sections
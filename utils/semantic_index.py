@@ -0,0 +1,251 @@
+import os
+import json
+import fcntl
+import threading
+import numpy as np
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from utils import embeddings
+
+DEFAULT_INDEX_DIR = os.environ.get('RESUME_SEMANTIC_INDEX', os.path.join('cache', 'semantic'))
+CHUNK_CHARS = 600            # resume text is embedded in chunks of about this size
+BLOCK_ROWS = 65536           # rows scored per vectorized block during search
+ANN_THRESHOLD = 200_000      # build the approximate index past this many rows
+ANN_SAMPLE = 20_000
+ANN_ITERATIONS = 8
+ANN_NPROBE = 8
+
+VECTOR_DTYPE = np.float16
+ID_DTYPE = np.int64
+
+
+def chunk_text(text: str, size: int = CHUNK_CHARS) -> List[str]:
+    """Split text on line boundaries into chunks of roughly ``size`` characters."""
+    chunks = []
+    current = []
+    length = 0
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if current and length + len(line) > size:
+            chunks.append(" ".join(current))
+            current, length = [], 0
+        current.append(line)
+        length += len(line) + 1
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+class SemanticIndex:
+    """
+    Resume chunk embeddings in an append-only, memory-mapped float16 matrix.
+
+    ``vectors.f16`` holds one L2-normalised row per chunk and ``ids.i64`` the
+    candidate ID of each row. Search streams the matrix in blocks, so memory
+    use stays flat however many resumes are indexed; a candidate's score is
+    its best chunk's cosine similarity to the query. Past ``ANN_THRESHOLD``
+    rows a coarse inverted-file index (k-means centroids) is built in the
+    background and only the closest ``ANN_NPROBE`` lists are scanned.
+    """
+
+    def __init__(self, directory: str = DEFAULT_INDEX_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._vectors_path = os.path.join(directory, "vectors.f16")
+        self._ids_path = os.path.join(directory, "ids.i64")
+        self._meta_path = os.path.join(directory, "meta.json")
+        self._lock_path = os.path.join(directory, ".lock")
+        self._ann_lock = threading.Lock()
+        self._ann = None  # (centroids, assignments, rows covered)
+
+        self.dim = None
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path) as f:
+                self.dim = json.load(f)["dim"]
+        self._indexed = set()
+        self._seen_rows = 0  # rows whose ids are in _indexed
+        self._refresh_indexed()
+        self._load_ann()
+
+    @contextmanager
+    def _file_lock(self):
+        # Appends may come from several worker processes
+        with open(self._lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def __len__(self) -> int:
+        if self.dim is None or not os.path.exists(self._ids_path):
+            return 0
+        rows = os.path.getsize(self._vectors_path) // (self.dim * np.dtype(VECTOR_DTYPE).itemsize)
+        ids = os.path.getsize(self._ids_path) // np.dtype(ID_DTYPE).itemsize
+        return min(rows, ids)
+
+    def _ids(self) -> np.ndarray:
+        count = len(self)
+        if count == 0:
+            return np.zeros(0, dtype=ID_DTYPE)
+        return np.memmap(self._ids_path, dtype=ID_DTYPE, mode="r", shape=(count,))
+
+    def _vectors(self, count: int) -> np.ndarray:
+        return np.memmap(self._vectors_path, dtype=VECTOR_DTYPE, mode="r", shape=(count, self.dim))
+
+    def __contains__(self, candidate_id: int) -> bool:
+        return candidate_id in self._indexed
+
+    def _refresh_indexed(self) -> None:
+        """Pick up candidates appended since the last call, e.g. by other workers."""
+        count = len(self)
+        if count < self._seen_rows:
+            self._indexed, self._seen_rows = set(), 0
+        if count > self._seen_rows:
+            self._indexed.update(self._ids()[self._seen_rows:count].tolist())
+            self._seen_rows = count
+
+    def _truncate(self) -> int:
+        """
+        Cut both files back to the rows present in both, dropping what a
+        crash between the two appends left behind. Call under the file lock.
+        """
+        count = len(self)
+        for path, row_bytes in ((self._vectors_path, self.dim * np.dtype(VECTOR_DTYPE).itemsize),
+                                (self._ids_path, np.dtype(ID_DTYPE).itemsize)):
+            if os.path.exists(path) and os.path.getsize(path) != count * row_bytes:
+                os.truncate(path, count * row_bytes)
+        return count
+
+    def add(self, candidate_id: int, text: str) -> int:
+        """Embed ``text`` chunk by chunk and append it under ``candidate_id``."""
+        if candidate_id in self._indexed:
+            return 0
+        chunks = chunk_text(text)
+        if not chunks:
+            return 0
+
+        vectors = embeddings.encode(chunks).astype(VECTOR_DTYPE)
+        with self._file_lock():
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                with open(self._meta_path, "w") as f:
+                    json.dump({"dim": self.dim, "dtype": np.dtype(VECTOR_DTYPE).name}, f)
+            # Another worker may have indexed this candidate since the check above
+            self._refresh_indexed()
+            if candidate_id in self._indexed:
+                return 0
+            count = self._truncate()
+            with open(self._vectors_path, "ab") as f:
+                f.write(vectors.tobytes())
+            with open(self._ids_path, "ab") as f:
+                f.write(np.full(len(chunks), candidate_id, dtype=ID_DTYPE).tobytes())
+            self._indexed.add(candidate_id)
+            self._seen_rows = count + len(chunks)
+
+        count = len(self)
+        covered = self._ann[2] if self._ann else 0
+        if count >= ANN_THRESHOLD and count >= 2 * covered and not self._ann_lock.locked():
+            threading.Thread(target=self.build_ann, daemon=True).start()
+        return len(chunks)
+
+    def search(self, query: str, top_k: int = 20) -> List[Tuple[int, float]]:
+        """Top ``top_k`` (candidate_id, similarity) pairs for a query text."""
+        count = len(self)
+        if count == 0 or not query.strip():
+            return []
+
+        q = embeddings.encode([query])[0].astype(np.float32)
+        vectors = self._vectors(count)
+        ids = self._ids()
+        best: Dict[int, float] = {}
+
+        if self._ann is not None:
+            centroids, assignments, covered = self._ann
+            probes = np.argsort(centroids @ q)[::-1][:ANN_NPROBE]
+            rows = np.flatnonzero(np.isin(assignments, probes))
+            self._score_rows(vectors[rows], ids[rows], q, top_k, best)
+            start = covered  # rows appended after the build are scanned exhaustively
+        else:
+            start = 0
+
+        for block_start in range(start, count, BLOCK_ROWS):
+            block_end = min(block_start + BLOCK_ROWS, count)
+            self._score_rows(vectors[block_start:block_end], ids[block_start:block_end], q, top_k, best)
+
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        return [(int(cid), float(score)) for cid, score in ranked]
+
+    @staticmethod
+    def _score_rows(block: np.ndarray, block_ids: np.ndarray, q: np.ndarray, top_k: int, best: Dict) -> None:
+        if len(block) == 0:
+            return
+        sims = np.asarray(block, dtype=np.float32) @ q
+        keep = min(len(sims), top_k * 8)
+        top = np.argpartition(-sims, keep - 1)[:keep]
+        if len(np.unique(block_ids[top])) < top_k and keep < len(sims):
+            top = np.arange(len(sims))
+
+        # Best row per candidate: first occurrence in descending-similarity order
+        order = top[np.argsort(-sims[top])]
+        cids, first = np.unique(block_ids[order], return_index=True)
+        scores = sims[order[first]]
+        for i in np.argsort(-scores)[:top_k]:
+            cid = int(cids[i])
+            if scores[i] > best.get(cid, -1.0):
+                best[cid] = float(scores[i])
+
+    def build_ann(self) -> None:
+        """(Re)build the coarse k-means inverted index over all current rows."""
+        with self._ann_lock:
+            count = len(self)
+            if count == 0:
+                return
+            vectors = self._vectors(count)
+            nlist = int(min(1024, max(16, 4 * np.sqrt(count))))
+            rng = np.random.default_rng(0)
+            sample = np.asarray(vectors[np.sort(rng.choice(count, min(ANN_SAMPLE, count), replace=False))],
+                                dtype=np.float32)
+            centroids = sample[rng.choice(len(sample), min(nlist, len(sample)), replace=False)]
+            for _ in range(ANN_ITERATIONS):
+                assign = np.argmax(sample @ centroids.T, axis=1)
+                for c in range(len(centroids)):
+                    members = sample[assign == c]
+                    if len(members):
+                        centroid = members.mean(axis=0)
+                        centroids[c] = centroid / (np.linalg.norm(centroid) or 1.0)
+
+            assignments = np.empty(count, dtype=np.int32)
+            for block_start in range(0, count, BLOCK_ROWS):
+                block = np.asarray(vectors[block_start:block_start + BLOCK_ROWS], dtype=np.float32)
+                assignments[block_start:block_start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+
+            np.save(os.path.join(self.directory, "ann_centroids.npy"), centroids)
+            np.save(os.path.join(self.directory, "ann_assignments.npy"), assignments)
+            self._ann = (centroids, assignments, count)
+
+    def _load_ann(self) -> None:
+        centroids_path = os.path.join(self.directory, "ann_centroids.npy")
+        assignments_path = os.path.join(self.directory, "ann_assignments.npy")
+        if os.path.exists(centroids_path) and os.path.exists(assignments_path):
+            assignments = np.load(assignments_path, mmap_mode="r")
+            self._ann = (np.load(centroids_path), assignments, len(assignments))
+
+
+_default_index: Optional[SemanticIndex] = None
+_default_lock = threading.Lock()
+
+
+def configure(directory: Optional[str]) -> Optional[SemanticIndex]:
+    """Point the process-wide index at ``directory``; an empty value disables it."""
+    global _default_index
+    with _default_lock:
+        _default_index = SemanticIndex(directory) if directory else None
+    return _default_index
+
+
+def get_index() -> Optional[SemanticIndex]:
+    return _default_index
@@ -0,0 +1,167 @@
+import os
+import sys
+import logging
+import argparse
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from utils import embeddings
+from utils.models import SENTENCE_MODEL, get_sentence_model
+from utils.metrics import span, count_inference
+from utils.taxonomy import DEFAULT_SNAPSHOT_DIR, Taxonomy, get_taxonomy, normalize_skill
+
+logger = logging.getLogger(__name__)
+
+# Cosine similarity a noun chunk needs to count as a mention of a skill
+SIMILARITY_THRESHOLD = float(os.environ.get('RESUME_SEMANTIC_SKILL_THRESHOLD', '0.7'))
+MAX_CHUNK_WORDS = 4
+ENCODE_BATCH_SIZE = 256
+
+
+class SemanticSkillMatcher:
+    """
+    Fuzzy skill lookup by embedding similarity.
+
+    Holds one L2-normalised embedding per canonical skill of a taxonomy, so
+    every noun chunk of a document is matched against every skill with a
+    single matrix product. Catches phrasings such as "PyTorch Lightning" or
+    "React Native apps" that no synonym lists verbatim.
+    """
+
+    def __init__(self, skills: List[str], matrix: np.ndarray, version: str = ""):
+        self.skills = skills
+        self.matrix = matrix
+        self.version = version
+
+    @classmethod
+    def build(cls, taxonomy: Taxonomy, model=None) -> "SemanticSkillMatcher":
+        skills = list(dict.fromkeys(taxonomy.synonym_lookup.values()))
+        model = model or get_sentence_model()
+        with span("encode_skills"):
+            matrix = np.asarray(model.encode(skills, batch_size=ENCODE_BATCH_SIZE), dtype=np.float32)
+        count_inference("sentence_transformer", len(skills))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return cls(skills, matrix / np.where(norms == 0, 1.0, norms), taxonomy.version)
+
+    def match(self, phrases: List[str], threshold: float = SIMILARITY_THRESHOLD) -> Dict[str, Tuple[str, float]]:
+        """Best skill and its similarity for each phrase that reaches ``threshold``."""
+        if not phrases or not self.skills:
+            return {}
+        vectors = embeddings.encode(phrases)
+        with span("match_skills"):
+            similarity = vectors @ self.matrix.T
+            best = similarity.argmax(axis=1)
+            scores = similarity[np.arange(len(phrases)), best]
+        return {
+            phrase: (self.skills[index], float(score))
+            for phrase, index, score in zip(phrases, best, scores)
+            if score >= threshold
+        }
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+
+def matrix_path(version: str, snapshot_dir: str = DEFAULT_SNAPSHOT_DIR, model: str = SENTENCE_MODEL) -> str:
+    return os.path.join(snapshot_dir, f"{version}-{model.replace('/', '_')}.npy")
+
+
+def load(taxonomy: Taxonomy, snapshot_dir: Optional[str] = DEFAULT_SNAPSHOT_DIR) -> SemanticSkillMatcher:
+    """
+    Matcher for ``taxonomy``, reading the skill matrix saved next to its
+    snapshot when there is one and saving it when there is not.
+    """
+    skills = list(dict.fromkeys(taxonomy.synonym_lookup.values()))
+    path = matrix_path(taxonomy.version, snapshot_dir) if snapshot_dir else None
+    if path and os.path.exists(path):
+        try:
+            matrix = np.load(path)
+            if matrix.shape[0] == len(skills):
+                return SemanticSkillMatcher(skills, matrix, taxonomy.version)
+            logger.warning("Skill matrix %s has %d rows for %d skills, rebuilding", path, matrix.shape[0], len(skills))
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable skill matrix %s: %s", path, e)
+
+    matcher = SemanticSkillMatcher.build(taxonomy)
+    logger.info("Encoded %d taxonomy skills for semantic matching", len(matcher))
+    if path:
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp.npy"
+            np.save(tmp, matcher.matrix)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning("Could not write skill matrix %s: %s", path, e)
+    return matcher
+
+
+# Matcher of the most recent taxonomy; rebuilt when a reload changes the version
+_matcher: Optional[SemanticSkillMatcher] = None
+_matcher_lock = threading.Lock()
+
+
+def get_matcher() -> SemanticSkillMatcher:
+    global _matcher
+    taxonomy = get_taxonomy()
+    matcher = _matcher
+    if matcher is None or matcher.version != taxonomy.version:
+        with _matcher_lock:
+            matcher = _matcher
+            if matcher is None or matcher.version != taxonomy.version:
+                matcher = _matcher = load(taxonomy)
+    return matcher
+
+
+def chunk_phrases(chunks: Iterable, ignore: Iterable[str] = ()) -> List[str]:
+    """
+    Candidate phrases from spaCy noun chunks: lower-cased, without leading
+    stop words ("the", "our", ...), short enough to name a skill and not
+    ignorable terms.
+    """
+    phrases = {}
+    for chunk in chunks:
+        start = chunk.start
+        while start < chunk.end and (chunk.doc[start].is_stop or chunk.doc[start].is_punct):
+            start += 1
+        if start == chunk.end or chunk.end - start > MAX_CHUNK_WORDS:
+            continue
+        phrase = chunk.doc[start:chunk.end].text.strip().lower()
+        norm = normalize_skill(phrase)
+        if not norm or norm in ignore or norm.isdigit():
+            continue
+        phrases[phrase] = None
+    return list(phrases)
+
+
+def match_chunks(chunks: Iterable, threshold: float = SIMILARITY_THRESHOLD) -> List[str]:
+    """Canonical skills that noun ``chunks`` semantically refer to."""
+    taxonomy = get_taxonomy()
+    phrases = [
+        p for p in chunk_phrases(chunks, taxonomy.ignore)
+        if p not in taxonomy.synonym_lookup
+    ]
+    if not phrases:
+        return []
+    matches = get_matcher().match(phrases, threshold)
+    for phrase, (skill, score) in matches.items():
+        logger.debug("Semantic skill match %r -> %s (%.2f)", phrase, skill, score)
+    return sorted({skill for skill, _ in matches.values()})
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Precompute the skill embedding matrix of the current taxonomy."
+    )
+    parser.add_argument("--snapshot-dir", default=DEFAULT_SNAPSHOT_DIR, help="Where the matrix is saved")
+    args = parser.parse_args(argv)
+
+    matcher = load(get_taxonomy(), args.snapshot_dir)
+    print(f"{len(matcher)} skills, dim {matcher.matrix.shape[1]}: {matrix_path(matcher.version, args.snapshot_dir)}")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
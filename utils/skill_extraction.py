@@ -1,186 +1,150 @@
 import re
-import spacy
-from typing import List, Dict
-
-nlp = spacy.load("en_core_web_sm")
-
-TECH_SKILL_SYNONYMS = {
-     "python": ["python", "py"],
-    "javascript": ["javascript", "js"],
-    "typescript": ["typescript", "ts"],
-    "react": ["react", "react.js", "reactjs"],
-    "node.js": ["node.js", "nodejs", "node"],
-    "express.js": ["express.js", "express"],
-    "html": ["html"],
-    "css": ["css"],
-    "sass": ["sass", "scss"],
-    "bootstrap": ["bootstrap"],
-    "tailwind": ["tailwindcss", "tailwind"],
-    "rest api": ["rest api", "restful api", "rest apis"],
-    "graphql": ["graphql"],
-    "sql": ["sql"],
-    "mysql": ["mysql"],
-    "postgresql": ["postgresql", "postgres"],
-    "mongodb": ["mongodb"],
-    "firebase": ["firebase"],
-    "aws": ["aws", "amazon web services"],
-    "azure": ["azure"],
-    "gcp": ["gcp", "google cloud"],
-    "docker": ["docker"],
-    "kubernetes": ["kubernetes", "k8s"],
-    "tensorflow": ["tensorflow"],
-    "pytorch": ["pytorch"],
-    "keras": ["keras"],
-    "Natural Language Processing": ["nlp", "natural language processing"],
-    "Machine Learning": ["machine learning", "ml"],
-    "deep learning": ["deep learning", "dl"],
-    "ci/cd": ["ci/cd", "continuous integration", "continuous deployment"],
-    "git": ["git", "github", "gitlab"],
-    "jira": ["jira"],
-    "fastapi": ["fastapi"],
-    "flask": ["flask"],
-    "django": ["django"],
-    "rest": ["rest", "restful"],
-    "api": ["api", "apis"],
-    "linux": ["linux"],
-    "unix": ["unix"],
-    "pandas": ["pandas"],
-    "numpy": ["numpy"],
-    "scikit-learn": ["scikit-learn", "sklearn"],
-    "hugging face": ["hugging face", "huggingface"],
-
+from typing import List, Dict, Optional
+
+from utils import semantic_skills
+from utils.document import AnalyzedDocument
+from utils.metrics import span
+from utils.sections import EXPERIENCE, PROJECTS, SKILLS
+from utils.skill_index import SkillVector
+from utils.taxonomy import get_taxonomy, normalize_skill
+
+# The vocabulary lives in data/skill_taxonomy.json; these names map to the
+# current taxonomy for code that still reads them as module attributes.
+_TAXONOMY_ATTRIBUTES = {
+    "TECH_SKILL_SYNONYMS": "synonyms",
+    "RELATED_SKILLS": "related",
+    "COMMON_IGNORE_TERMS": "ignore",
+    "SYNONYM_LOOKUP": "synonym_lookup",
+    "SKILL_INDEX": "index",
 }
 
-COMMON_IGNORE_TERMS = set([
-    "experience", "team", "project", "company", "working",
-    "environment", "skills", "knowledge", "understanding"
-])
-RELATED_SKILLS = {
-    "deep learning": ["transformers", "bert", "lstm", "rnn", "neural networks", "sequence models"],
-    "transformers": ["bert", "hugging face", "sequence models"],
-    "bert": ["transformers"],
-    "lstm": ["rnn", "sequence models", "deep learning"],
-    "rnn": ["lstm", "sequence models", "deep learning"],
-    "machine learning": ["ml", "supervised learning", "unsupervised learning", "classification", "regression"],
-    "nlp": ["natural language processing", "text mining", "tokenization", "named entity recognition"],
-    "spaCy": ["nlp", "ner", "entity recognition"],
-    "tensorflow": ["deep learning", "keras"],
-    "pytorch": ["deep learning", "torch", "nn"],
-    "flask": ["fastapi", "api", "backend"],
-    "fastapi": ["flask", "api", "restful"],
-    "api": ["restful", "http", "backend"],
-    "mongodb": ["nosql", "document db", "atlas"],
-    "sql": ["mysql", "postgresql", "relational database"],
-    "mysql": ["sql", "relational database"],
-    "postgresql": ["sql", "relational database"],
-    "javascript": ["js", "node.js"],
-    "node.js": ["node", "express.js", "backend"],
-    "react": ["frontend", "javascript", "jsx"],
-    "html": ["css", "frontend", "web development"],
-    "css": ["html", "frontend"],
-    "data analysis": ["data wrangling", "data cleaning", "pandas", "numpy"],
-    "hugging face": ["transformers", "bert", "token classification"],
-    "google colab": ["jupyter", "notebooks", "cloud notebooks"],
-    "keras": ["tensorflow", "deep learning"],
-    "visualization": ["matplotlib", "seaborn", "plotly"],
-}
+# Where the words before a mention end a sentence (or nothing precedes it)
+_SENTENCE_END = re.compile(r'(?:^|[.!?:;]|\n)[\s\'"(\[*•-]*$')
 
-# ✅ Make REVERSE lookup for synonyms
-SYNONYM_LOOKUP = {}
-for canonical, synonyms in TECH_SKILL_SYNONYMS.items():
-    canonical_norm = canonical.strip().lower()
-    SYNONYM_LOOKUP[canonical_norm] = canonical
-    for syn in synonyms:
-        SYNONYM_LOOKUP[syn.strip().lower()] = canonical
 
-def normalize_skill(skill: str) -> str:
-    return re.sub(r'[^a-zA-Z0-9 ]', '', skill).strip().lower()
+def _named_in_prose(text: str, start: int, end: int) -> bool:
+    """
+    True when a ``context_only`` mention reads as a name in running text:
+    capitalised ("React", "REST"), not the first word of a sentence, and
+    longer than two letters, since "PY" or "Py" are mostly other things.
+    """
+    return (
+        end - start > 2
+        and text[start].isupper()
+        and not _SENTENCE_END.search(text, max(0, start - 40), start)
+    )
+
 
 def canonicalize(skill: str) -> str:
-    norm = normalize_skill(skill)
-    return SYNONYM_LOOKUP.get(norm, skill.strip().title())
+    return get_taxonomy().canonicalize(skill)
 
 def expand_for_compare(skill: str) -> List[str]:
-    norm = normalize_skill(skill)
-    expanded = [norm]
-    for canonical, synonyms in TECH_SKILL_SYNONYMS.items():
-        c_norm = normalize_skill(canonical)
-        if norm == c_norm or norm in [normalize_skill(s) for s in synonyms]:
-            expanded += [normalize_skill(s) for s in synonyms] + [c_norm]
-    return list(set(expanded))
-
-def extract_skills(text: str) -> List[str]:
+    return list(get_taxonomy().index.expand(skill))
+
+def skill_vector(skills: List[str]) -> SkillVector:
+    """Compact form of a skill list for repeated comparisons."""
+    return get_taxonomy().index.vector(skills)
+
+def extract_skills(
+    text: str,
+    doc: Optional[AnalyzedDocument] = None,
+    semantic: bool = False
+) -> List[str]:
+    """
+    Skills from bullet lists and "Skills:/Technologies:/Tools:" lines, plus
+    every taxonomy synonym mentioned anywhere in the text. The taxonomy's
+    ``context_only`` synonyms are also ordinary English words ("the rest
+    of", "express interest"): outside lists and skills sections they only
+    count when written as a name mid-sentence. With ``semantic``
+    the document's noun chunks are also matched to taxonomy skills by
+    embedding similarity (see ``utils.semantic_skills``), which parses
+    ``doc`` (or the text) if it is not parsed yet.
+
+    For a sectioned resume ``doc`` with a skills section, list lines are
+    read from that section only, and noun chunks come from the skills,
+    projects and experience sections.
+    """
+    taxonomy = get_taxonomy()
+    ignore = taxonomy.ignore
     skills = set()
+    listed = doc.section_text(SKILLS) if doc is not None and doc.has_section(SKILLS) else text
 
-    bullet_matches = re.findall(r'[-•]\s*([A-Za-z0-9 /+.#]+)', text)
+    bullet_matches = re.findall(r'[-•]\s*([A-Za-z0-9 /+.#]+)', listed)
     for match in bullet_matches:
         parts = re.split(r'[,/]', match)
         for p in parts:
             norm = normalize_skill(p)
-            if norm and norm not in COMMON_IGNORE_TERMS:
-                skills.add(canonicalize(norm))
+            if norm and norm not in ignore:
+                skills.add(taxonomy.canonicalize(norm))
 
-    matches = re.findall(r'(?i)(skills|technologies|tools)[:\-]?\s*([^\n]+)', text)
+    matches = re.findall(r'(?i)(skills|technologies|tools)[:\-]?\s*([^\n]+)', listed)
     for _, skill_line in matches:
         for skill in re.split(r'[,;/]', skill_line):
             norm = normalize_skill(skill)
-            if norm and norm not in COMMON_IGNORE_TERMS:
-                skills.add(canonicalize(norm))
-
-    doc = nlp(text)
-    for chunk in doc.noun_chunks:
-        norm = normalize_skill(chunk.text)
-        if norm and norm not in COMMON_IGNORE_TERMS:
-            if norm in SYNONYM_LOOKUP:
-                skills.add(canonicalize(norm))
+            if norm and norm not in ignore:
+                skills.add(taxonomy.canonicalize(norm))
+
+    if listed is not text:
+        # "Languages: Python, JS" style lines under a skills heading
+        for line in listed.split('\n'):
+            for item in re.split(r'[,;/|•·]', line.rpartition(':')[2]):
+                canonical = taxonomy.synonym_lookup.get(normalize_skill(item))
+                if canonical:
+                    skills.add(canonical)
+
+    # Offsets from the lower-cased text only line up when lowering keeps the length
+    same_offsets = len(text.lower()) == len(text)
+    for start, end, mention in taxonomy.matcher.finditer(text):
+        canonical = taxonomy.synonym_lookup.get(mention)
+        if not canonical or mention in ignore or canonical in skills:
+            continue
+        if mention in taxonomy.context_only and not (same_offsets and _named_in_prose(text, start, end)):
+            continue
+        skills.add(canonical)
+
+    if semantic:
+        if doc is None:
+            doc = AnalyzedDocument(text)
+        with span("semantic_skills"):
+            skills.update(semantic_skills.match_chunks(doc.focus(SKILLS, PROJECTS, EXPERIENCE).noun_chunks))
 
     return list(skills)
 
-def extract_all_skills(text: str, projects: List[str] = None) -> List[str]:
-    skills = set(extract_skills(text))
+def extract_all_skills(
+    text: str,
+    projects: List[str] = None,
+    doc: Optional[AnalyzedDocument] = None,
+    semantic: bool = False
+) -> List[str]:
+    skills = set(extract_skills(text, doc=doc, semantic=semantic))
     if projects:
         for p in projects:
             skills.update(extract_skills(p))
     return list(skills)
 
-def extract_jd_skills(text: str) -> List[str]:
-    return extract_skills(text)
-
-def compare_skills(resume_skills: List[str], jd_skills: List[str]) -> Dict:
-    resume_expanded = set()
-    resume_canon_map = {}
-
-    for rs in resume_skills:
-        for exp in expand_for_compare(rs):
-            resume_expanded.add(exp)
-            resume_canon_map[exp] = canonicalize(rs)
-
-    jd_expanded = set()
-    jd_canon_map = {}
-
-    for js in jd_skills:
-        for exp in expand_for_compare(js):
-            jd_expanded.add(exp)
-            jd_canon_map[exp] = canonicalize(js)
-
-    common = resume_expanded & jd_expanded
-    missing = jd_expanded - resume_expanded
-
-    # Use canonical names
-    common_skills = sorted({jd_canon_map[c] for c in common})
-    missing_skills = sorted({jd_canon_map[m] for m in missing})
-
-    # Related check
-    related = []
-    for m in missing_skills:
-        for r in resume_skills:
-            if m in RELATED_SKILLS.get(r, []):
-                related.append(m)
-    missing_skills = list(set(missing_skills) - set(related))
-
-    return {
-        "common_skills": common_skills,
-        "missing_skills": missing_skills,
-        "related_skills": related
-    }
-
+def extract_jd_skills(
+    text: str,
+    doc: Optional[AnalyzedDocument] = None,
+    semantic: bool = False
+) -> List[str]:
+    return extract_skills(text, doc=doc, semantic=semantic)
+
+def compare_skills(
+    resume_skills: List[str],
+    jd_skills: List[str],
+    jd_vector: Optional[SkillVector] = None
+) -> Dict:
+    """
+    Compare resume skills with JD skills through their skill vectors.
+    ``jd_vector`` is ``skill_vector(jd_skills)`` when the caller already has
+    it; a vector built by an older taxonomy is rebuilt before comparing.
+    """
+    index = get_taxonomy().index
+    if jd_vector is None or jd_vector.version != index.version:
+        jd_vector = index.vector(jd_skills)
+    return index.compare(index.vector(resume_skills), jd_vector)
+
+def __getattr__(name):
+    if name in _TAXONOMY_ATTRIBUTES:
+        return getattr(get_taxonomy(), _TAXONOMY_ATTRIBUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
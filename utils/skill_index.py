@@ -0,0 +1,149 @@
+from array import array
+from typing import Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+
+class SkillVector(NamedTuple):
+    """A skill set as taxonomy term IDs plus leftover terms."""
+    ids: FrozenSet[int]                 # IDs of the taxonomy terms present
+    extra: FrozenSet[str]               # normalised terms outside the taxonomy
+    names: Dict[Union[int, str], str]   # term ID / extra term -> canonical skill name
+    related: FrozenSet[str]             # RELATED_SKILLS of the source skills
+    version: str = ""                   # taxonomy version the IDs belong to
+
+
+class SkillIndex:
+    """
+    Skill expansion precomputed once per taxonomy.
+
+    Every normalised canonical name and synonym gets a small integer ID and
+    belongs to one expansion group: the IDs of every term it expands to.
+    Groups are stored as flat integer arrays so the index of a large
+    taxonomy loads quickly from a snapshot. Skill sets become
+    ``SkillVector`` values and comparisons are plain set operations whose
+    cost depends on the skills involved, not on the taxonomy size.
+    """
+
+    def __init__(
+        self,
+        terms: List[str],
+        term_group: array,
+        group_start: array,
+        group_ids: array,
+        related: Dict[str, Tuple[str, ...]],
+        normalize: Callable[[str], str],
+        canonicalize: Callable[[str], str],
+        version: str = ""
+    ):
+        self.terms = terms
+        self.term_ids: Dict[str, int] = dict(zip(terms, range(len(terms))))
+        self._term_group = term_group
+        self._group_start = group_start
+        self._group_ids = group_ids
+        self._related = related
+        self._normalize = normalize
+        self._canonicalize = canonicalize
+        self.version = version
+
+    @classmethod
+    def build(
+        cls,
+        synonyms: Dict[str, List[str]],
+        related: Dict[str, List[str]],
+        normalize: Callable[[str], str],
+        canonicalize: Callable[[str], str],
+        version: str = ""
+    ) -> "SkillIndex":
+        term_ids: Dict[str, int] = {}
+        terms: List[str] = []
+        expansion: List[set] = []
+        for canonical, syns in synonyms.items():
+            group = set()
+            for term in [canonical] + list(syns):
+                term = normalize(term)
+                if term not in term_ids:
+                    term_ids[term] = len(terms)
+                    terms.append(term)
+                    expansion.append(set())
+                group.add(term_ids[term])
+            for term_id in group:
+                expansion[term_id].update(group)
+
+        # Terms of one synonym group usually share the same expansion; store it once
+        groups: Dict[Tuple[int, ...], int] = {}
+        term_group, group_start, group_ids = array('i'), array('i', [0]), array('i')
+        for ids in expansion:
+            key = tuple(sorted(ids))
+            if key not in groups:
+                groups[key] = len(groups)
+                group_ids.extend(key)
+                group_start.append(len(group_ids))
+            term_group.append(groups[key])
+        return cls(
+            terms, term_group, group_start, group_ids,
+            {skill: tuple(others) for skill, others in related.items()},
+            normalize,
+            canonicalize,
+            version
+        )
+
+    def tables(self) -> Dict:
+        """Plain-data form of the index, for ``SkillIndex(**tables, ...)``."""
+        return {
+            "terms": self.terms,
+            "term_group": self._term_group,
+            "group_start": self._group_start,
+            "group_ids": self._group_ids,
+            "related": self._related,
+        }
+
+    def _expansion(self, norm: str) -> Optional[array]:
+        term_id = self.term_ids.get(norm)
+        if term_id is None:
+            return None
+        group = self._term_group[term_id]
+        return self._group_ids[self._group_start[group]:self._group_start[group + 1]]
+
+    def expand(self, skill: str) -> FrozenSet[str]:
+        """Normalised comparison terms for ``skill``: itself plus its synonym group."""
+        norm = self._normalize(skill)
+        ids = self._expansion(norm)
+        if ids is None:
+            return frozenset([norm])
+        return frozenset(self.terms[i] for i in ids) | {norm}
+
+    def vector(self, skills: Iterable[str]) -> SkillVector:
+        ids = set()
+        extra = set()
+        names = {}
+        related = set()
+        for skill in skills:
+            name = self._canonicalize(skill)
+            related.update(self._related.get(skill, ()))
+            norm = self._normalize(skill)
+            skill_ids = self._expansion(norm)
+            if skill_ids is None:
+                extra.add(norm)
+                names[norm] = name
+                continue
+            ids.update(skill_ids)
+            for term_id in skill_ids:
+                names[term_id] = name
+        return SkillVector(frozenset(ids), frozenset(extra), names, frozenset(related), self.version)
+
+    def vector_terms(self, vector: SkillVector) -> FrozenSet[str]:
+        """All normalised terms a vector covers, taxonomy and extra."""
+        return frozenset(self.terms[i] for i in vector.ids) | vector.extra
+
+    def compare(self, resume: SkillVector, jd: SkillVector) -> Dict:
+        """Common, missing and related JD skills, by canonical name."""
+        common = {jd.names[i] for i in resume.ids & jd.ids}
+        common.update(jd.names[t] for t in resume.extra & jd.extra)
+        missing = {jd.names[i] for i in jd.ids - resume.ids}
+        missing.update(jd.names[t] for t in jd.extra - resume.extra)
+
+        related = sorted(m for m in missing if m in resume.related)
+        return {
+            "common_skills": sorted(common),
+            "missing_skills": list(missing - set(related)),
+            "related_skills": related
+        }
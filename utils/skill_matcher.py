@@ -0,0 +1,158 @@
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+
+# Characters that join word parts, as in "node.js", "c++" or "c#"
+_JOINERS = frozenset('.+#')
+
+
+def _joined(text: str, pos: int, step: int) -> bool:
+    """True when text[pos] continues the word that ends/starts next to it."""
+    if pos < 0 or pos >= len(text):
+        return False
+    char = text[pos]
+    if char.isalnum():
+        return True
+    beyond = pos + step
+    if char not in _JOINERS or not 0 <= beyond < len(text):
+        return False
+    return text[beyond].isalnum() or text[beyond] in _JOINERS
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over lower-cased skill phrases.
+
+    All patterns are found in one left-to-right pass over the text, so the
+    cost depends on the text length rather than the number of skills. A
+    match only counts when it is not glued to a neighbouring word, so "ts"
+    does not fire inside "results", "node" not inside "nodes" and "js" not
+    inside "node.js".
+
+    The automaton is stored as flat integer arrays (each state's outgoing
+    edges are a sorted run in ``labels``/``targets``), so ``tables()`` of a
+    taxonomy with tens of thousands of skills pickles and loads in
+    milliseconds instead of rebuilding millions of dict entries.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        children: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+
+        seen = set()
+        for pattern in patterns:
+            pattern = pattern.strip().lower()
+            if pattern and pattern not in seen:
+                seen.add(pattern)
+                self._add(pattern, children, outputs)
+        fail = self._build_failure_links(children, outputs)
+
+        first, labels, targets = array('i', [0]), array('i'), array('i')
+        out_start, out_items = array('i', [0]), array('i')
+        for edges, found in zip(children, outputs):
+            for char, nxt in sorted(edges.items()):
+                labels.append(ord(char))
+                targets.append(nxt)
+            first.append(len(labels))
+            out_items.extend(found)
+            out_start.append(len(out_items))
+        self._load({
+            "patterns": self.patterns, "first": first, "labels": labels, "targets": targets,
+            "fail": array('i', fail), "out_start": out_start, "out_items": out_items,
+        })
+
+    @classmethod
+    def from_tables(cls, tables: Dict) -> "SkillMatcher":
+        """Matcher restored from ``tables()`` output, without rebuilding it."""
+        matcher = cls.__new__(cls)
+        matcher._load(tables)
+        return matcher
+
+    def _load(self, tables: Dict) -> None:
+        self.patterns = tables["patterns"]
+        self._tables = tables
+        self._first, self._labels, self._targets = tables["first"], tables["labels"], tables["targets"]
+        self._fail, self._out_start, self._out_items = tables["fail"], tables["out_start"], tables["out_items"]
+        # Most characters are read from the root state; give it a dict
+        root = range(self._first[0], self._first[1])
+        self._root = {self._labels[j]: self._targets[j] for j in root}
+
+    def tables(self) -> Dict:
+        return self._tables
+
+    def _add(self, pattern: str, children: List[Dict[str, int]], outputs: List[List[int]]) -> None:
+        state = 0
+        for char in pattern:
+            nxt = children[state].get(char)
+            if nxt is None:
+                nxt = len(children)
+                children[state][char] = nxt
+                children.append({})
+                outputs.append([])
+            state = nxt
+        outputs[state].append(len(self.patterns))
+        self.patterns.append(pattern)
+
+    @staticmethod
+    def _build_failure_links(children: List[Dict[str, int]], outputs: List[List[int]]) -> List[int]:
+        fail = [0] * len(children)
+        queue = list(children[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for char, nxt in children[state].items():
+                queue.append(nxt)
+                fallback = fail[state]
+                while fallback and char not in children[fallback]:
+                    fallback = fail[fallback]
+                target = children[fallback].get(char, 0)
+                fail[nxt] = target if target != nxt else 0
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+        return fail
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield (start, end, pattern) for every boundary-respecting match."""
+        lower = text.lower()
+        first, labels, targets, fail = self._first, self._labels, self._targets, self._fail
+        out_start, out_items, root, patterns = self._out_start, self._out_items, self._root, self.patterns
+        state = 0
+        for i, char in enumerate(lower):
+            code = ord(char)
+            while state:
+                lo, hi = first[state], first[state + 1]
+                j = bisect_left(labels, code, lo, hi)
+                if j < hi and labels[j] == code:
+                    state = targets[j]
+                    break
+                state = fail[state]
+            else:
+                state = root.get(code, 0)
+                if not state:
+                    continue
+            start_out, end_out = out_start[state], out_start[state + 1]
+            if start_out == end_out:
+                continue
+            for index in out_items[start_out:end_out]:
+                pattern = patterns[index]
+                start = i - len(pattern) + 1
+                if pattern[0].isalnum() and _joined(lower, start - 1, -1):
+                    continue
+                if pattern[-1].isalnum() and _joined(lower, i + 1, 1):
+                    continue
+                yield start, i + 1, pattern
+
+    def find_all(self, text: str) -> Set[str]:
+        """Distinct patterns mentioned anywhere in ``text``."""
+        return {pattern for _, _, pattern in self.finditer(text)}
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+
+def default_matcher() -> SkillMatcher:
+    """The matcher of the current skill taxonomy (see ``utils.taxonomy``)."""
+    from utils.taxonomy import get_taxonomy
+    return get_taxonomy().matcher
@@ -0,0 +1,296 @@
+import os
+import re
+import sys
+import json
+import time
+import pickle
+import hashlib
+import logging
+import argparse
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import cached_property
+from typing import Dict, FrozenSet, Iterator, List, Optional
+
+from utils.skill_index import SkillIndex
+from utils.skill_matcher import SkillMatcher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOURCE = os.environ.get(
+    'RESUME_SKILL_TAXONOMY',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'skill_taxonomy.json')
+)
+DEFAULT_SNAPSHOT_DIR = os.environ.get('RESUME_TAXONOMY_SNAPSHOT_DIR', os.path.join('cache', 'taxonomy'))
+# Seconds between checks of the source file for changes; 0 disables hot reload
+RELOAD_CHECK_SECONDS = float(os.environ.get('RESUME_TAXONOMY_RELOAD_SECONDS', '5'))
+
+SNAPSHOT_FORMAT = 2  # bump when the snapshot tables change shape
+
+
+def normalize_skill(skill: str) -> str:
+    return re.sub(r'[^a-zA-Z0-9 ]', '', skill).strip().lower()
+
+
+class Taxonomy:
+    """
+    One compiled version of the skill vocabulary: the source tables from
+    ``data/skill_taxonomy.json`` plus everything derived from them (synonym
+    lookup, expansion index, matcher automaton). Instances are never
+    modified; a reload builds a new one and swaps it in.
+    """
+
+    def __init__(self, raw: bytes, version: str, tables: Optional[Dict] = None):
+        self.version = version
+        self._raw = raw
+        if tables is None:
+            tables = self._compile_tables(self.source)
+        self.synonym_lookup: Dict[str, str] = tables["synonym_lookup"]
+        self.ignore: FrozenSet[str] = tables["ignore"]
+        # Synonyms that are also ordinary words or abbreviations ("rest",
+        # "express", "py"): skills only where the text lists skills
+        self.context_only: FrozenSet[str] = tables["context_only"]
+        self.known_skills: List[str] = tables["known_skills"]
+        self.known_skill_set = frozenset(self.known_skills)
+        self.project_related: Dict[str, List[str]] = tables["project_related"]
+        self.index = SkillIndex(**tables["index"], normalize=normalize_skill,
+                                canonicalize=self.canonicalize, version=version)
+        self.matcher = SkillMatcher.from_tables(tables["matcher"])
+
+    def _compile_tables(self, source: Dict) -> Dict:
+        synonyms = source.get("synonyms", {})
+        related = source.get("related", {})
+        project_related = source.get("project_related", {})
+        known_skills = source.get("known_skills", [])
+
+        synonym_lookup = {}
+        for canonical, syns in synonyms.items():
+            synonym_lookup[canonical.strip().lower()] = canonical
+            for syn in syns:
+                synonym_lookup[syn.strip().lower()] = canonical
+
+        patterns = list(synonym_lookup) + list(known_skills)
+        for table in (related, project_related):
+            for skill, others in table.items():
+                patterns.append(skill)
+                patterns.extend(others)
+
+        return {
+            "synonym_lookup": synonym_lookup,
+            "ignore": frozenset(source.get("ignore", [])),
+            "context_only": frozenset(s.strip().lower() for s in source.get("context_only", [])),
+            "known_skills": known_skills,
+            "project_related": project_related,
+            "index": SkillIndex.build(synonyms, related, normalize_skill, self.canonicalize).tables(),
+            "matcher": SkillMatcher(patterns).tables(),
+        }
+
+    @cached_property
+    def source(self) -> Dict:
+        """The parsed taxonomy file; only needed to compile or to read the raw tables."""
+        return json.loads(self._raw)
+
+    @property
+    def synonyms(self) -> Dict[str, List[str]]:
+        return self.source.get("synonyms", {})
+
+    @property
+    def related(self) -> Dict[str, List[str]]:
+        return self.source.get("related", {})
+
+    def canonicalize(self, skill: str) -> str:
+        norm = normalize_skill(skill)
+        return self.synonym_lookup.get(norm, skill.strip().title())
+
+    def snapshot(self) -> Dict:
+        """Plain-data form of this taxonomy, loadable by ``from_snapshot``."""
+        return {
+            "format": SNAPSHOT_FORMAT,
+            "version": self.version,
+            "raw": self._raw,
+            "tables": {
+                "synonym_lookup": self.synonym_lookup,
+                "ignore": self.ignore,
+                "context_only": self.context_only,
+                "known_skills": self.known_skills,
+                "project_related": self.project_related,
+                "index": self.index.tables(),
+                "matcher": self.matcher.tables(),
+            },
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: Dict) -> "Taxonomy":
+        if data.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported taxonomy snapshot format: {data.get('format')}")
+        return cls(data["raw"], data["version"], data["tables"])
+
+    def stats(self) -> Dict:
+        return {
+            "version": self.version,
+            "terms": len(self.synonym_lookup),
+            "index_terms": len(self.index.terms),
+            "patterns": len(self.matcher),
+            "known_skills": len(self.known_skills),
+        }
+
+
+def source_version(raw: bytes) -> str:
+    """Version of a taxonomy source: a hash of its bytes."""
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+def snapshot_path(version: str, snapshot_dir: str = DEFAULT_SNAPSHOT_DIR) -> str:
+    return os.path.join(snapshot_dir, f"{version}.pickle")
+
+
+def load(source: str = DEFAULT_SOURCE, snapshot_dir: Optional[str] = DEFAULT_SNAPSHOT_DIR) -> Taxonomy:
+    """
+    Load the taxonomy from ``source``, using the compiled snapshot for this
+    exact source when there is one and writing it when there is not. Pass
+    ``snapshot_dir=None`` to always compile from the JSON.
+    """
+    with open(source, 'rb') as f:
+        raw = f.read()
+    version = source_version(raw)
+
+    path = snapshot_path(version, snapshot_dir) if snapshot_dir else None
+    if path and os.path.exists(path):
+        try:
+            started = time.perf_counter()
+            with open(path, 'rb') as f:
+                taxonomy = Taxonomy.from_snapshot(pickle.load(f))
+            logger.info("Loaded taxonomy %s snapshot in %.3fs", version, time.perf_counter() - started)
+            return taxonomy
+        except Exception as e:
+            logger.warning("Ignoring unreadable taxonomy snapshot %s: %s", path, e)
+
+    started = time.perf_counter()
+    taxonomy = Taxonomy(raw, version)
+    logger.info("Compiled taxonomy %s (%d terms) in %.3fs",
+                version, len(taxonomy.synonym_lookup), time.perf_counter() - started)
+    if path:
+        write_snapshot(taxonomy, path)
+    return taxonomy
+
+
+def write_snapshot(taxonomy: Taxonomy, path: str) -> None:
+    """Write the snapshot atomically, so readers never see a partial file."""
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            pickle.dump(taxonomy.snapshot(), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning("Could not write taxonomy snapshot %s: %s", path, e)
+
+
+# The taxonomy new requests use. Replaced wholesale on reload, never mutated,
+# so a reference taken by a request stays consistent until it finishes.
+_current: Optional[Taxonomy] = None
+_source_path = DEFAULT_SOURCE
+_source_mtime: Optional[float] = None
+_next_check = 0.0
+_reload_lock = threading.Lock()
+_pinned: ContextVar[Optional[Taxonomy]] = ContextVar("taxonomy", default=None)
+
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _load_current(source: str) -> Taxonomy:
+    global _current, _source_path, _source_mtime, _next_check
+    mtime = _mtime(source)
+    taxonomy = load(source)
+    previous = _current
+    _current, _source_path, _source_mtime = taxonomy, source, mtime
+    _next_check = time.monotonic() + RELOAD_CHECK_SECONDS
+    if previous is not None and previous.version != taxonomy.version:
+        logger.info("Swapped taxonomy %s -> %s", previous.version, taxonomy.version)
+    return taxonomy
+
+
+def reload(source: Optional[str] = None) -> Taxonomy:
+    """Load ``source`` (default: the current source file) now and make it current."""
+    with _reload_lock:
+        return _load_current(source or _source_path)
+
+
+def _maybe_reload() -> None:
+    global _next_check
+    # Whoever holds the lock is already (re)loading; keep serving the current one
+    if not _reload_lock.acquire(blocking=False):
+        return
+    try:
+        if time.monotonic() < _next_check:
+            return
+        _next_check = time.monotonic() + RELOAD_CHECK_SECONDS
+        if _mtime(_source_path) != _source_mtime:
+            try:
+                _load_current(_source_path)
+            except (OSError, ValueError) as e:
+                logger.error("Taxonomy reload failed, keeping %s: %s", _current.version, e)
+    finally:
+        _reload_lock.release()
+
+
+def get_taxonomy() -> Taxonomy:
+    """
+    The taxonomy for the current request: the pinned one inside ``pinned()``,
+    otherwise the current one, which is reloaded when the source file changed.
+    """
+    taxonomy = _pinned.get()
+    if taxonomy is not None:
+        return taxonomy
+    if _current is None:
+        with _reload_lock:
+            if _current is None:
+                return _load_current(_source_path)
+    elif RELOAD_CHECK_SECONDS and time.monotonic() >= _next_check:
+        _maybe_reload()
+    return _current
+
+
+@contextmanager
+def pinned() -> Iterator[Taxonomy]:
+    """
+    Use one taxonomy for everything inside the block, even if a reload swaps
+    in a new one meanwhile. Nested blocks keep the outermost taxonomy.
+    """
+    taxonomy = _pinned.get()
+    if taxonomy is not None:
+        yield taxonomy
+        return
+    token = _pinned.set(get_taxonomy())
+    try:
+        yield _pinned.get()
+    finally:
+        _pinned.reset(token)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compile the skill taxonomy into its snapshot.")
+    parser.add_argument("--source", default=DEFAULT_SOURCE, help="Taxonomy JSON file")
+    parser.add_argument("--snapshot-dir", default=DEFAULT_SNAPSHOT_DIR, help="Where compiled snapshots are written")
+    parser.add_argument("--force", action="store_true", help="Recompile even if the snapshot exists")
+    args = parser.parse_args(argv)
+
+    with open(args.source, 'rb') as f:
+        path = snapshot_path(source_version(f.read()), args.snapshot_dir)
+    if args.force and os.path.exists(path):
+        os.remove(path)
+    taxonomy = load(args.source, args.snapshot_dir)
+    json.dump(dict(taxonomy.stats(), snapshot=path), sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
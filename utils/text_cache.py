@@ -0,0 +1,130 @@
+import os
+import hashlib
+import tempfile
+import threading
+from typing import Dict, Optional
+
+from utils.cache import LRUCache
+
+DEFAULT_CACHE_DIR = os.environ.get('RESUME_TEXT_CACHE_DIR', os.path.join('cache', 'text'))
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # on-disk budget
+DEFAULT_MEMORY_ITEMS = 256
+
+
+def content_key(data: bytes, ext: str = '') -> str:
+    """SHA-256 of the file bytes, suffixed with the extension that picks the parser."""
+    digest = hashlib.sha256(data).hexdigest()
+    ext = ext.lower().lstrip('.')
+    return f"{digest}-{ext}" if ext else digest
+
+
+class TextCache:
+    """
+    Extracted text keyed by ``content_key``.
+
+    A small in-memory LRU sits in front of a size-bounded directory of text
+    files. Disk entries are touched on every hit and the least recently
+    used ones are deleted once the directory grows past ``max_bytes``.
+    Writes go through a temp file and ``os.replace`` so concurrent workers
+    never see a partial entry.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        memory_items: int = DEFAULT_MEMORY_ITEMS
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory = LRUCache(maxsize=memory_items)
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(entry.stat().st_size for entry in self._entries())
+
+    def _entries(self):
+        return [e for e in os.scandir(self.directory) if e.is_file() and e.name.endswith('.txt')]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.txt")
+
+    def get(self, key: str) -> Optional[str]:
+        text = self.memory.get(key)
+        if text is not None:
+            return text
+
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            self.disk_misses += 1
+            return None
+
+        self.disk_hits += 1
+        self.memory.put(key, text)
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        self.memory.put(key, text)
+
+        data = text.encode('utf-8')
+        if len(data) > self.max_bytes:
+            return
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(key))
+
+        with self._lock:
+            self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def stats(self) -> Dict[str, int]:
+        memory = self.memory.stats()
+        return {
+            "size": memory["size"],
+            "hits": memory["hits"],
+            "misses": memory["misses"],
+            "disk_hits": self.disk_hits,
+            "disk_misses": self.disk_misses,
+            "disk_bytes": self._size
+        }
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda e: e.stat().st_mtime)
+        self._size = sum(e.stat().st_size for e in entries)
+        for entry in entries:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            self._size -= size
+
+
+_default_cache: Optional[TextCache] = None
+_default_lock = threading.Lock()
+
+
+def configure(directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES) -> TextCache:
+    """Replace the process-wide cache, e.g. with the app's configured directory."""
+    global _default_cache
+    with _default_lock:
+        _default_cache = TextCache(directory, max_bytes)
+    return _default_cache
+
+
+def get_cache() -> TextCache:
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = TextCache()
+        return _default_cache
@@ -1,43 +1,309 @@
+import io
 import os
-import textract
+import struct
+import time
+import logging
+import atexit
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
 from PyPDF2 import PdfReader
-from typing import Union
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from utils import text_cache, word_reader
+
+# PDF budgets: stop reading once there is enough text for scoring
+MAX_PDF_PAGES = 40
+MAX_TEXT_CHARS = 100_000
+PAGES_PER_CHUNK = 8
+# Page-parallel extraction above this many pages: at least three chunks,
+# each of which re-parses the document in its worker, within MAX_PDF_PAGES
+PARALLEL_PAGE_THRESHOLD = 2 * PAGES_PER_CHUNK
+SLOW_PAGE_SECONDS = 1.0
+
+# Legacy .doc conversion runs in a few long-lived worker processes
+DOC_WORKERS = int(os.environ.get('RESUME_DOC_WORKERS', 2))
+DOC_TIMEOUT_SECONDS = 60
+
+logger = logging.getLogger(__name__)
+
+_page_pool = None
+_page_pool_lock = threading.Lock()
+_doc_pool = None
+_doc_pool_lock = threading.Lock()
 
 class UnsupportedFileFormat(Exception):
     pass
 
 def extract_text(file_path: str) -> str:
     ext = os.path.splitext(file_path)[1].lower()
-    print(f"Attempting to extract text from file: {file_path} with extension: {ext}")  # Debugging line
-    
+    logger.debug("Extracting text from %s (%s)", file_path, ext)
+
     try:
         if ext == '.pdf':
             return extract_text_from_pdf(file_path)
-        elif ext in ('.docx', '.doc'):
-            return textract.process(file_path).decode('utf-8')
+        elif ext == '.docx':
+            return extract_docx(file_path)
+        elif ext == '.doc':
+            with open(file_path, 'rb') as f:
+                return extract_doc(f.read())
         elif ext == '.txt':
             with open(file_path, 'r', encoding='utf-8') as f:
                 return f.read()
         else:
             raise UnsupportedFileFormat(f"Unsupported file format: {ext}")
     except Exception as e:
-        print(f"Error occurred: {str(e)}")  # Debugging line
+        logger.warning("Text extraction failed for %s: %s", file_path, e)
         raise IOError(f"Error extracting text from {file_path}: {str(e)}")
 
 
-def extract_text_from_pdf(file_path: str) -> str:
+def extract_text_from_bytes(data: bytes, filename: str) -> str:
+    """
+    Extracts text from an in-memory upload. DOCX is read in-process; only
+    legacy DOC files that the native reader cannot handle fall back to
+    textract, which needs a temp file on disk.
+    """
+    ext = os.path.splitext(filename)[1].lower()
+
+    try:
+        if ext == '.pdf':
+            extraction = extract_pdf(data)
+            for page in extraction.pages:
+                if page.seconds > SLOW_PAGE_SECONDS:
+                    logger.info("Slow PDF page %d in %s: %.2fs", page.index, filename, page.seconds)
+            return extraction.text
+        elif ext == '.docx':
+            return extract_docx(data)
+        elif ext == '.doc':
+            return extract_doc(data)
+        elif ext == '.txt':
+            return data.decode('utf-8')
+        else:
+            raise UnsupportedFileFormat(f"Unsupported file format: {ext}")
+    except Exception as e:
+        logger.warning("Text extraction failed for %s: %s", filename, e)
+        raise IOError(f"Error extracting text from {filename}: {str(e)}")
+
+
+def extract_text_cached(
+    data: bytes,
+    filename: str,
+    cache: Optional[text_cache.TextCache] = None
+) -> Tuple[str, str]:
+    """
+    Like ``extract_text_from_bytes`` but served from the content-addressed
+    text cache when the same file bytes were seen before.
+
+    Returns:
+        (text, content key)
+    """
+    cache = cache or text_cache.get_cache()
+    key = text_cache.content_key(data, os.path.splitext(filename)[1])
+
+    text = cache.get(key)
+    if text is None:
+        text = extract_text_from_bytes(data, filename)
+        cache.put(key, text)
+    return text, key
+
+
+def extract_docx(source: Union[str, bytes, BinaryIO], max_chars: int = MAX_TEXT_CHARS) -> str:
+    """DOCX text streamed from the zip container, within MAX_TEXT_CHARS."""
+    return word_reader.read_docx(source, max_chars=max_chars)
+
+
+def _convert_doc(data: bytes, max_chars: int = MAX_TEXT_CHARS) -> str:
+    """Runs in a DOC worker: the native Word 97 reader, else textract."""
+    try:
+        return word_reader.read_doc(data, max_chars=max_chars)
+    except (ImportError, word_reader.UnsupportedWordDocument, struct.error, IndexError) as e:
+        logger.info("Native DOC reader failed (%s), falling back to textract", e)
+
+    import textract
+    fd, tmp_path = tempfile.mkstemp(suffix='.doc')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        return textract.process(tmp_path).decode('utf-8')[:max_chars]
+    finally:
+        os.remove(tmp_path)
+
+
+def _get_doc_pool() -> ProcessPoolExecutor:
+    global _doc_pool
+    with _doc_pool_lock:
+        if _doc_pool is None:
+            _doc_pool = ProcessPoolExecutor(max_workers=DOC_WORKERS)
+            atexit.register(_doc_pool.shutdown, wait=False)
+        return _doc_pool
+
+
+def _discard_doc_pool(pool: ProcessPoolExecutor) -> None:
+    """Stop ``pool``'s workers, even one stuck in a conversion, and let the next file start a fresh pool."""
+    global _doc_pool
+    with _doc_pool_lock:
+        if _doc_pool is pool:
+            _doc_pool = None
+    for process in list((getattr(pool, '_processes', None) or {}).values()):
+        if process.is_alive():
+            process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def extract_doc(data: bytes, max_chars: int = MAX_TEXT_CHARS) -> str:
+    """
+    Legacy DOC text, converted by the persistent DOC worker pool so a
+    malformed file cannot take down the serving process. Inside a worker
+    process (bulk scoring) the conversion runs in place.
+    """
+    if multiprocessing.parent_process() is not None:
+        return _convert_doc(data, max_chars)
+    pool = _get_doc_pool()
+    try:
+        return pool.submit(_convert_doc, data, max_chars).result(timeout=DOC_TIMEOUT_SECONDS)
+    except FutureTimeout:
+        # The worker is still busy with this file and would block the pool
+        logger.warning("DOC conversion timed out after %ss, restarting the DOC pool", DOC_TIMEOUT_SECONDS)
+        _discard_doc_pool(pool)
+        raise
+    except BrokenProcessPool:
+        # A worker died mid-conversion; start a fresh pool for the next file
+        _discard_doc_pool(pool)
+        raise
+
+
+class PageText(NamedTuple):
+    index: int
+    text: str
+    seconds: float
+
+
+class PdfExtraction(NamedTuple):
+    text: str
+    pages: List[PageText]   # per-page text and extraction time, in page order
+    total_pages: int
+    truncated: bool         # True when a page or character budget cut reading short
+
+
+def iter_pdf_pages(
+    source: Union[str, bytes, BinaryIO],
+    start: int = 0,
+    stop: Optional[int] = None
+) -> Iterator[PageText]:
+    """
+    Yields the text of each page in ``[start, stop)`` as soon as it is read.
+
+    Args:
+        source: Path to PDF file, raw PDF bytes or a binary file object
+    """
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            yield from iter_pdf_pages(f, start, stop)
+        return
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    yield from _read_pages(PdfReader(source), start, stop)
+
+
+def _read_pages(pdf: PdfReader, start: int, stop: Optional[int]) -> Iterator[PageText]:
+    pages = pdf.pages
+    stop = len(pages) if stop is None else min(stop, len(pages))
+    for index in range(start, stop):
+        started = time.perf_counter()
+        text = pages[index].extract_text() or ""
+        yield PageText(index, text, time.perf_counter() - started)
+
+
+def _extract_page_range(data: bytes, start: int, stop: int) -> List[PageText]:
+    return list(iter_pdf_pages(data, start, stop))
+
+
+def _page_pool_size() -> int:
+    """This process's share of the CPUs, at most one worker per chunk of MAX_PDF_PAGES."""
+    web_workers = max(1, int(os.environ.get('RESUME_WEB_WORKERS', 1)))
+    share = max(1, (os.cpu_count() or 1) // web_workers)
+    return min(share, -(-MAX_PDF_PAGES // PAGES_PER_CHUNK))
+
+
+def _get_page_pool() -> ProcessPoolExecutor:
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool = ProcessPoolExecutor(max_workers=_page_pool_size())
+            atexit.register(_page_pool.shutdown, wait=False)
+        return _page_pool
+
+
+def extract_pdf(
+    data: bytes,
+    max_pages: int = MAX_PDF_PAGES,
+    max_chars: int = MAX_TEXT_CHARS,
+    parallel: Optional[bool] = None
+) -> PdfExtraction:
+    """
+    Extracts PDF text page by page within page and character budgets.
+
+    Large documents are split into page ranges that run in a process pool,
+    unless ``parallel`` is False or we are already inside a worker process.
+    Results are consumed in page order and reading stops (remaining ranges
+    are cancelled) as soon as ``max_chars`` is reached.
+    """
+    pdf = PdfReader(io.BytesIO(data))
+    total_pages = len(pdf.pages)
+    page_limit = min(total_pages, max_pages)
+    if parallel is None:
+        parallel = (
+            page_limit > PARALLEL_PAGE_THRESHOLD
+            and _page_pool_size() > 1
+            and multiprocessing.parent_process() is None
+        )
+
+    if parallel:
+        pool = _get_page_pool()
+        futures = [
+            pool.submit(_extract_page_range, data, start, min(start + PAGES_PER_CHUNK, page_limit))
+            for start in range(0, page_limit, PAGES_PER_CHUNK)
+        ]
+        page_iter = (page for future in futures for page in future.result())
+    else:
+        futures = []
+        page_iter = _read_pages(pdf, 0, page_limit)
+
+    parts = []
+    pages = []
+    chars = 0
+    truncated = page_limit < total_pages
+    for page in page_iter:
+        text = page.text
+        if chars + len(text) > max_chars:
+            text = text[:max_chars - chars]
+            truncated = True
+        parts.append(text)
+        pages.append(PageText(page.index, text, page.seconds))
+        chars += len(text)
+        if chars >= max_chars:
+            truncated = True
+            break
+
+    for future in futures:
+        future.cancel()
+
+    return PdfExtraction("".join(parts), pages, total_pages, truncated)
+
+
+def extract_text_from_pdf(source: Union[str, BinaryIO]) -> str:
     """
     Extracts text from PDF files using PyPDF2
-    
+
     Args:
-        file_path: Path to PDF file
-        
+        source: Path to PDF file or a binary file object
+
     Returns:
-        Extracted text as a string
-    """
-    text = ""
-    with open(file_path, 'rb') as f:
-        pdf = PdfReader(f)
-        for page in pdf.pages:
-            text += page.extract_text() or ""
-    return text
+        Extracted text as a string, within MAX_PDF_PAGES / MAX_TEXT_CHARS
+    """
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            return extract_pdf(f.read()).text
+    return extract_pdf(source.read()).text
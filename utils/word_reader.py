@@ -0,0 +1,195 @@
+import io
+import struct
+import zipfile
+from typing import BinaryIO, Iterator, List, Union
+from xml.etree.ElementTree import iterparse
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_PARAGRAPH = _W + "p"
+_TEXT = _W + "t"
+_BODY = _W + "body"
+# Run content that stands for a character of its own
+_SPECIAL = {_W + "tab": "\t", _W + "br": "\n", _W + "cr": "\n", _W + "noBreakHyphen": "-"}
+
+# Paragraphs are joined with blank lines, like textract's output
+PARAGRAPH_SEPARATOR = "\n\n"
+
+
+class UnsupportedWordDocument(ValueError):
+    """The file is not a Word document this reader understands."""
+
+
+def _open(source: Union[str, bytes, BinaryIO]):
+    return io.BytesIO(source) if isinstance(source, bytes) else source
+
+
+def iter_docx_paragraphs(source: Union[str, bytes, BinaryIO]) -> Iterator[str]:
+    """
+    Yield the text of every paragraph of a ``.docx`` in document order,
+    including paragraphs inside tables and text boxes. ``word/document.xml``
+    is parsed as a stream straight out of the zip container and each
+    paragraph is emitted as soon as it closes; no object model is built.
+    """
+    try:
+        archive = zipfile.ZipFile(_open(source))
+        stream = archive.open("word/document.xml")
+    except (zipfile.BadZipFile, KeyError) as e:
+        raise UnsupportedWordDocument(f"Not a DOCX file: {e}")
+
+    with archive, stream:
+        body = None
+        depth = 0
+        parts: List[List[str]] = []   # one list per open paragraph (text boxes nest)
+        for event, elem in iterparse(stream, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                depth += 1
+                if tag == _PARAGRAPH:
+                    parts.append([])
+                elif tag == _BODY:
+                    body = elem
+                continue
+
+            depth -= 1
+            if tag == _TEXT:
+                if parts and elem.text:
+                    parts[-1].append(elem.text)
+            elif tag in _SPECIAL:
+                if parts:
+                    parts[-1].append(_SPECIAL[tag])
+            elif tag == _PARAGRAPH:
+                yield "".join(parts.pop())
+            # Drop finished top-level blocks so memory stays flat on long files
+            if depth == 2 and body is not None:
+                body.clear()
+
+
+def read_docx(source: Union[str, bytes, BinaryIO], max_chars: int = None) -> str:
+    """Text of a ``.docx``, stopping once ``max_chars`` characters were read."""
+    paragraphs = []
+    chars = 0
+    for paragraph in iter_docx_paragraphs(source):
+        paragraphs.append(paragraph)
+        chars += len(paragraph) + len(PARAGRAPH_SEPARATOR)
+        if max_chars is not None and chars >= max_chars:
+            break
+    text = PARAGRAPH_SEPARATOR.join(paragraphs)
+    return text[:max_chars] if max_chars is not None else text
+
+
+# Word 97 binary format ([MS-DOC]): offsets into the FIB and the Clx
+_WORD_IDENT = 0xA5EC
+_FIB_FLAGS = 0x0A
+_F_ENCRYPTED = 0x0100
+_F_WHICH_TABLE = 0x0200
+_CCP_TEXT_INDEX = 3   # in FibRgLw97
+_CLX_INDEX = 33       # fcClx/lcbClx pair in FibRgFcLcb97
+_FC_COMPRESSED = 0x40000000
+
+# Control characters in the main text stream
+_FIELD_BEGIN, _FIELD_SEPARATOR, _FIELD_END = "\x13", "\x14", "\x15"
+_DOC_CHARACTERS = str.maketrans({
+    "\r": "\n",     # paragraph mark
+    "\x07": "\n",   # table cell / row mark
+    "\x0b": "\n",   # manual line break
+    "\x0c": "\n",   # page / section break
+    "\x1e": "-",    # non-breaking hyphen
+    "\x1f": None,   # optional hyphen
+    "\x01": None,   # picture
+    "\x08": None,   # drawing object
+})
+
+
+def _doc_pieces(word: bytes, table: bytes, ccp_text: int, fc_clx: int, lcb_clx: int) -> Iterator[str]:
+    pos, end = fc_clx, fc_clx + lcb_clx
+    while pos < end:
+        clxt = table[pos]
+        if clxt == 0x01:      # Prc: property modifiers, skipped
+            (size,) = struct.unpack_from("<h", table, pos + 1)
+            pos += 3 + size
+        elif clxt == 0x02:    # Pcdt: the piece table
+            (lcb,) = struct.unpack_from("<I", table, pos + 1)
+            count = (lcb - 4) // 12
+            cps = struct.unpack_from(f"<{count + 1}I", table, pos + 5)
+            pcds = pos + 5 + 4 * (count + 1)
+            for i in range(count):
+                start, stop = cps[i], min(cps[i + 1], ccp_text)
+                if start >= stop:
+                    break
+                (fc,) = struct.unpack_from("<I", table, pcds + 8 * i + 2)
+                if fc & _FC_COMPRESSED:
+                    offset = (fc & ~_FC_COMPRESSED) // 2
+                    yield word[offset:offset + stop - start].decode("cp1252", errors="replace")
+                else:
+                    yield word[fc:fc + 2 * (stop - start)].decode("utf-16-le", errors="replace")
+            return
+        else:
+            raise UnsupportedWordDocument(f"Unexpected Clx entry type {clxt:#x}")
+    raise UnsupportedWordDocument("No piece table in document")
+
+
+def _strip_field_codes(text: str) -> str:
+    """Keep the displayed result of fields and drop their instructions."""
+    out = []
+    hiding = []   # per open field: True while inside its instruction part
+    for char in text:
+        if char == _FIELD_BEGIN:
+            hiding.append(True)
+        elif char == _FIELD_SEPARATOR:
+            if hiding:
+                hiding[-1] = False
+        elif char == _FIELD_END:
+            if hiding:
+                hiding.pop()
+        elif not any(hiding):
+            out.append(char)
+    return "".join(out)
+
+
+def iter_doc_paragraphs(source: Union[str, bytes, BinaryIO]) -> Iterator[str]:
+    """
+    Yield the paragraphs of the main text of a Word 97+ ``.doc``, read from
+    the compound file's piece table. Needs the optional ``olefile`` package.
+    """
+    import olefile
+
+    try:
+        ole = olefile.OleFileIO(_open(source))
+    except OSError as e:
+        raise UnsupportedWordDocument(f"Not a DOC file: {e}")
+    with ole:
+        if not ole.exists("WordDocument"):
+            raise UnsupportedWordDocument("No WordDocument stream")
+        word = ole.openstream("WordDocument").read()
+        ident, nfib = struct.unpack_from("<HH", word, 0)
+        (flags,) = struct.unpack_from("<H", word, _FIB_FLAGS)
+        if ident != _WORD_IDENT or nfib < 0x00C1:
+            raise UnsupportedWordDocument(f"Not a Word 97+ document (nFib {nfib:#x})")
+        if flags & _F_ENCRYPTED:
+            raise UnsupportedWordDocument("Encrypted document")
+        table_name = "1Table" if flags & _F_WHICH_TABLE else "0Table"
+        if not ole.exists(table_name):
+            raise UnsupportedWordDocument(f"No {table_name} stream")
+        table = ole.openstream(table_name).read()
+
+    # FibBase, then csw + FibRgW, cslw + FibRgLw, cbRgFcLcb + FibRgFcLcb
+    pos = 32
+    (csw,) = struct.unpack_from("<H", word, pos)
+    pos += 2 + 2 * csw
+    (cslw,) = struct.unpack_from("<H", word, pos)
+    (ccp_text,) = struct.unpack_from("<i", word, pos + 2 + 4 * _CCP_TEXT_INDEX)
+    pos += 2 + 4 * cslw
+    fc_clx, lcb_clx = struct.unpack_from("<II", word, pos + 2 + 8 * _CLX_INDEX)
+
+    text = "".join(_doc_pieces(word, table, ccp_text, fc_clx, lcb_clx))
+    if _FIELD_BEGIN in text:
+        text = _strip_field_codes(text)
+    text = text.translate(_DOC_CHARACTERS)
+    for paragraph in text.split("\n"):
+        yield paragraph.rstrip()
+
+
+def read_doc(source: Union[str, bytes, BinaryIO], max_chars: int = None) -> str:
+    """Text of a Word 97+ ``.doc``, cut at ``max_chars`` characters."""
+    text = PARAGRAPH_SEPARATOR.join(iter_doc_paragraphs(source)).strip()
+    return text[:max_chars] if max_chars is not None else text